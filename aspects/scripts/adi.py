@@ -6,19 +6,69 @@ average number of connections (degree) per aspect. This helper supports both
 classic (unweighted) and inverse-frequency weighted degrees, filters
 high-frequency “hub” tags, and can treat explicit slug mentions and shared
 sources as additional connections.
+
+``--structure`` adds fragmentation analysis on the same adjacency: union-find
+connected components, PageRank centrality and label-propagation communities,
+computed over compact array-backed (CSR) neighbour lists.
+
+``--related <slug>`` reuses the same graph to list the strongest neighbours of a
+single aspect ("what else should I read").
+
+``--approx`` skips the graph entirely and estimates average degree, weighted
+degree and the isolate fraction from a stratified node sample (see
+``adi_sample``), with confidence intervals and a target error bound; use it when
+exact runs get too slow for pre-commit.
+
+``--tag-pairs N`` lists the tag pairs that most often label the same aspects,
+from the sparse co-occurrence matrix that ``tags_manager.py sync-counts`` and
+``sync-all`` cache; near-synonymous tags double-count the same links.
+
+``--sweep`` builds the tag incidence once and prints ADI, ADIw and isolates for
+a grid of ``--idf-gamma`` x ``--ignore-tag-frac`` values (see ``adi_sweep``), to
+calibrate thresholds without one full run per combination.
+
+Built graphs are cached on disk by default (``--no-cache`` neither reads nor
+writes the cache): per option set, a JSON index of slugs, sections, row offsets
+and catalog warnings plus the CSR rows as raw arrays, reused until ASPECTS.json
+or the tags catalog changes. ``--related`` reads only the index and its target's
+row. ``--export`` writes the graph as NPZ arrays with integer ids (readable with ``numpy.load``), GraphML or
+Graphviz DOT for external analysis.
 """
 
 from __future__ import annotations
 
 import argparse
+import heapq
 import json
 import math
+import random
 import re
+import struct
 import sys
+import zipfile
+from array import array
 from collections import Counter, defaultdict
 from dataclasses import dataclass
 from itertools import combinations
 from pathlib import Path
+from typing import Iterable
+from xml.sax.saxutils import quoteattr
+
+from adi_sample import ApproxADI, ApproxStats, DegreeSampler, Estimate
+from adi_sweep import sweep
+from aspects_cache import (
+    cache_dir,
+    cache_key,
+    file_fingerprint,
+    load_json_cache,
+    store_json_cache,
+    write_atomic,
+)
+from tags_manager import compute_tag_statistics, load_cooccurrence, store_cooccurrence
+
+# Bump when the cached index changes shape so older caches are rebuilt.
+GRAPH_LAYOUT = "csr-rows-2"
+EXPORT_FORMATS = {".npz": "npz", ".graphml": "graphml", ".dot": "dot", ".gv": "dot"}
 
 
 @dataclass(frozen=True)
@@ -31,6 +81,23 @@ class Entry:
     text: str
 
 
+@dataclass(frozen=True)
+class CSRGraph:
+    """Undirected graph as compressed sparse rows over integer node ids."""
+
+    slugs: tuple[str, ...]
+    indptr: array
+    indices: array
+    weights: array | None = None
+
+    @property
+    def nodes(self) -> int:
+        return len(self.slugs)
+
+    def neighbors(self, node: int) -> array:
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+
 @dataclass(frozen=True)
 class GraphStats:
     nodes: int
@@ -146,6 +213,27 @@ def load_tag_reference_counts(path: Path | None) -> dict[str, int] | None:
     return counts or None
 
 
+def load_tag_cooccurrence(
+    aspects_path: Path,
+    use_cache: bool = True,
+) -> tuple[Counter[str], Counter[tuple[str, str]]]:
+    """Return tag counts and pair co-occurrence counts, cached by tags_manager when fresh."""
+    if use_cache:
+        cached = load_cooccurrence(aspects_path)
+        if cached is not None:
+            return cached
+    try:
+        data = json.loads(aspects_path.read_text(encoding="utf-8"))
+    except FileNotFoundError as exc:
+        raise SystemExit(f"ASPECTS file not found: {aspects_path}") from exc
+    except json.JSONDecodeError as exc:
+        raise SystemExit(f"Invalid JSON in {aspects_path}: {exc}") from exc
+    counts, pairs = compute_tag_statistics(data)
+    if use_cache:
+        store_cooccurrence(aspects_path, counts, pairs)
+    return counts, pairs
+
+
 def build_adjacency(
     entries: list[Entry],
     include_slug_links: bool,
@@ -154,7 +242,9 @@ def build_adjacency(
     weighted: bool,
     idf_gamma: float,
     tag_reference_counts: dict[str, int] | None,
+    warnings: list[str] | None = None,
 ) -> tuple[dict[str, set[str]], dict[str, dict[str, float]] | None]:
+    """Build the (weighted) adjacency; catalog warnings go to stderr and ``warnings``."""
     adjacency: dict[str, set[str]] = {entry.slug: set() for entry in entries}
     weighted_adj: dict[str, dict[str, float]] | None = (
         {entry.slug: {} for entry in entries} if weighted else None
@@ -164,6 +254,11 @@ def build_adjacency(
     missing_catalog_tags: set[str] = set()
     mismatch_catalog_tags: set[str] = set()
 
+    def warn(message: str) -> None:
+        print(message, file=sys.stderr)
+        if warnings is not None:
+            warnings.append(message)
+
     def resolved_count(tag: str, slugs: list[str]) -> int:
         if tag in tag_counts_cache:
             return tag_counts_cache[tag]
@@ -174,21 +269,19 @@ def build_adjacency(
         catalog_freq = tag_reference_counts.get(tag)
         if catalog_freq is None:
             if len(missing_catalog_tags) < 5 and tag not in missing_catalog_tags:
-                print(
+                warn(
                     f"[adi] Warning: tag '{tag}' has no cached count in catalog; "
-                    "run tags_manager.py sync-counts.",
-                    file=sys.stderr,
+                    "run tags_manager.py sync-counts."
                 )
             missing_catalog_tags.add(tag)
             tag_counts_cache[tag] = base
             return base
         if catalog_freq != base and tag not in mismatch_catalog_tags:
             if len(mismatch_catalog_tags) < 5:
-                print(
+                warn(
                     f"[adi] Warning: tag '{tag}' count mismatch "
                     f"(catalog={catalog_freq}, aspects={base}); "
-                    "run tags_manager.py sync-counts.",
-                    file=sys.stderr,
+                    "run tags_manager.py sync-counts."
                 )
             mismatch_catalog_tags.add(tag)
         value = max(base, catalog_freq)
@@ -261,16 +354,10 @@ def build_adjacency(
     if tag_reference_counts is not None:
         if len(missing_catalog_tags) > 5:
             suppressed = len(missing_catalog_tags) - 5
-            print(
-                f"[adi] Warning: {suppressed} additional tags missing catalog counts (suppressed).",
-                file=sys.stderr,
-            )
+            warn(f"[adi] Warning: {suppressed} additional tags missing catalog counts (suppressed).")
         if len(mismatch_catalog_tags) > 5:
             suppressed = len(mismatch_catalog_tags) - 5
-            print(
-                f"[adi] Warning: {suppressed} additional catalog/tag count mismatches suppressed.",
-                file=sys.stderr,
-            )
+            warn(f"[adi] Warning: {suppressed} additional catalog/tag count mismatches suppressed.")
 
     return adjacency, weighted_adj
 
@@ -328,6 +415,189 @@ def compute_stats(
     )
 
 
+def to_csr(
+    slugs: list[str],
+    adjacency: dict[str, set[str]],
+    weighted_adj: dict[str, dict[str, float]] | None = None,
+) -> CSRGraph:
+    ids = {slug: idx for idx, slug in enumerate(slugs)}
+    indptr = array("q", [0])
+    indices = array("l")
+    weights = array("d") if weighted_adj is not None else None
+    for slug in slugs:
+        neighbors = sorted(ids[neighbor] for neighbor in adjacency.get(slug, ()) if neighbor in ids)
+        indices.extend(neighbors)
+        if weights is not None and weighted_adj is not None:
+            row = weighted_adj.get(slug, {})
+            weights.extend(row.get(slugs[neighbor], 0.0) for neighbor in neighbors)
+        indptr.append(len(indices))
+    return CSRGraph(tuple(slugs), indptr, indices, weights)
+
+
+def connected_components(graph: CSRGraph) -> array:
+    """Label every node with its component root using union-find (path halving)."""
+    parent = array("l", range(graph.nodes))
+    size = array("l", [1]) * graph.nodes
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    indptr, indices = graph.indptr, graph.indices
+    for node in range(graph.nodes):
+        for pos in range(indptr[node], indptr[node + 1]):
+            other = indices[pos]
+            if other <= node:
+                continue
+            a, b = find(node), find(other)
+            if a == b:
+                continue
+            if size[a] < size[b]:
+                a, b = b, a
+            parent[b] = a
+            size[a] += size[b]
+    return array("l", (find(node) for node in range(graph.nodes)))
+
+
+def pagerank(
+    graph: CSRGraph,
+    damping: float = 0.85,
+    max_iterations: int = 100,
+    tolerance: float = 1e-9,
+) -> list[float]:
+    """Power-iteration PageRank; uses edge weights when the graph carries them."""
+    n = graph.nodes
+    if n == 0:
+        return []
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    out_weight = [0.0] * n
+    for node in range(n):
+        start, end = indptr[node], indptr[node + 1]
+        out_weight[node] = sum(weights[start:end]) if weights is not None else float(end - start)
+
+    rank = [1.0 / n] * n
+    for _ in range(max_iterations):
+        dangling = sum(rank[node] for node in range(n) if out_weight[node] == 0)
+        base = (1.0 - damping + damping * dangling) / n
+        new_rank = [base] * n
+        for node in range(n):
+            total = out_weight[node]
+            if total == 0:
+                continue
+            share = damping * rank[node] / total
+            start, end = indptr[node], indptr[node + 1]
+            if weights is None:
+                for pos in range(start, end):
+                    new_rank[indices[pos]] += share
+            else:
+                for pos in range(start, end):
+                    new_rank[indices[pos]] += share * weights[pos]
+        delta = sum(abs(a - b) for a, b in zip(new_rank, rank))
+        rank = new_rank
+        if delta < tolerance:
+            break
+    return rank
+
+
+def label_propagation(graph: CSRGraph, max_iterations: int = 20, seed: int = 0) -> array:
+    """Asynchronous label propagation; ties resolve to the smallest label for stability."""
+    labels = array("l", range(graph.nodes))
+    order = list(range(graph.nodes))
+    rng = random.Random(seed)
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    for _ in range(max_iterations):
+        rng.shuffle(order)
+        changed = 0
+        for node in order:
+            start, end = indptr[node], indptr[node + 1]
+            if start == end:
+                continue
+            scores: dict[int, float] = defaultdict(float)
+            for pos in range(start, end):
+                scores[labels[indices[pos]]] += weights[pos] if weights is not None else 1.0
+            best_score = max(scores.values())
+            best = min(label for label, score in scores.items() if score == best_score)
+            if best != labels[node]:
+                labels[node] = best
+                changed += 1
+        if not changed:
+            break
+    return labels
+
+
+def print_structure(
+    section_of: dict[str, str],
+    adjacency: dict[str, set[str]],
+    weighted_adj: dict[str, dict[str, float]] | None,
+    per_section: bool,
+    central_limit: int,
+) -> None:
+    graph = to_csr(list(section_of), adjacency, weighted_adj)
+    components = connected_components(graph)
+    communities = label_propagation(graph)
+    ranks = pagerank(graph)
+
+    component_sizes = Counter(components)
+    community_members: defaultdict[int, list[int]] = defaultdict(list)
+    for node, label in enumerate(communities):
+        community_members[label].append(node)
+    largest = max(component_sizes.values(), default=0)
+
+    print()
+    print(
+        f"Structure: components={len(component_sizes)}, "
+        f"largest_component={largest} ({largest / max(graph.nodes, 1):.1%}), "
+        f"communities={len(community_members)}"
+    )
+    if len(component_sizes) > 1:
+        sizes = sorted(component_sizes.values(), reverse=True)
+        shown = ", ".join(str(size) for size in sizes[:10])
+        more = f", ... (+{len(sizes) - 10} more)" if len(sizes) > 10 else ""
+        print(f"  Component sizes: {shown}{more}")
+
+    print("  Top PageRank (central aspects; 1.00 = average):")
+    top = heapq.nlargest(central_limit, range(graph.nodes), key=ranks.__getitem__)
+    for rank_no, node in enumerate(top, start=1):
+        slug = graph.slugs[node]
+        print(f"    {rank_no:2d}. {ranks[node] * graph.nodes:6.2f}  {slug} ({section_of[slug]})")
+
+    print("  Communities (largest first):")
+    ordered = sorted(community_members.values(), key=lambda members: (-len(members), members[0]))
+    for members in ordered[:central_limit]:
+        sections = Counter(section_of[graph.slugs[node]] for node in members)
+        dominant, dominant_count = sections.most_common(1)[0]
+        sample = ", ".join(
+            graph.slugs[node]
+            for node in heapq.nlargest(3, members, key=ranks.__getitem__)
+        )
+        print(
+            f"    - {len(members)} aspects, sections={len(sections)}, "
+            f"dominant={dominant} ({dominant_count / len(members):.0%}); e.g. {sample}"
+        )
+    if len(ordered) > central_limit:
+        print(f"    ... ({len(ordered) - central_limit} more)")
+
+    if per_section:
+        print("  Per section (global components spanned / internal components / communities):")
+        members_by_section: defaultdict[str, list[int]] = defaultdict(list)
+        for node, slug in enumerate(graph.slugs):
+            members_by_section[section_of[slug]].append(node)
+        for section_slug in sorted(members_by_section):
+            nodes = members_by_section[section_slug]
+            section_slugs = [graph.slugs[node] for node in nodes]
+            internal = to_csr(section_slugs, adjacency)
+            internal_count = len(set(connected_components(internal)))
+            spanned = len({components[node] for node in nodes})
+            spanned_communities = len({communities[node] for node in nodes})
+            marker = "  <- fragmented" if internal_count > 1 else ""
+            print(
+                f"    {section_slug}: components={spanned}, internal={internal_count}, "
+                f"communities={spanned_communities}{marker}"
+            )
+
+
 def format_float(value: float) -> str:
     if math.isinf(value):
         return "inf"
@@ -359,23 +629,28 @@ def run(
     adi_threshold: float,
     show_isolates: bool,
     isolate_limit: int | None,
-    tag_reference_counts: dict[str, int] | None,
+    tags_catalog: Path | None,
+    structure: bool = False,
+    central_limit: int = 10,
+    use_cache: bool = True,
+    export_path: Path | None = None,
+    export_format: str | None = None,
 ) -> None:
-    entries = load_entries(aspects_path)
-    if not entries:
-        raise SystemExit("No entries found in the ASPECTS file.")
-
-    adjacency, weighted_adj = build_adjacency(
-        entries,
+    section_of, adjacency, weighted_adj = load_graph(
+        aspects_path,
+        tags_catalog,
         include_slug_links=include_slug_links,
         include_source_links=include_source_links,
         ignore_tag_frac=ignore_tag_frac,
         weighted=weighted,
         idf_gamma=idf_gamma,
-        tag_reference_counts=tag_reference_counts,
+        use_cache=use_cache,
     )
+    if export_path is not None and export_format is not None:
+        nodes, edges = export_graph(export_path, export_format, section_of, adjacency, weighted_adj)
+        print(f"Exported {export_format} graph ({nodes} nodes, {edges} edges) to {export_path}")
 
-    all_slugs = {entry.slug for entry in entries}
+    all_slugs = set(section_of)
     overall = compute_stats(all_slugs, adjacency, weighted_adj)
     print_stats("Overall", overall)
     warning_triggered = False
@@ -401,8 +676,8 @@ def run(
         print()
         print("Per section:")
         sections: defaultdict[str, set[str]] = defaultdict(set)
-        for entry in entries:
-            sections[entry.section_slug].add(entry.slug)
+        for slug, section_slug in section_of.items():
+            sections[section_slug].add(slug)
 
         high_sections: list[tuple[str, GraphStats]] = []
         for section_slug in sorted(sections):
@@ -440,11 +715,501 @@ def run(
                     f"isolated={stats.isolated}"
                 )
 
+    if structure:
+        print_structure(section_of, adjacency, weighted_adj, per_section, central_limit)
+
     if not warning_triggered and not (show_isolates and overall.isolated):
         print()
         print("ADI within target thresholds; no high-risk sections detected.")
 
 
+def format_estimate(estimate: Estimate) -> str:
+    return f"{format_float(estimate.value)} [{format_float(estimate.low)}, {format_float(estimate.high)}]"
+
+
+def print_approx_stats(title: str, stats: ApproxStats) -> None:
+    sampled = "exact" if stats.exact else f"sampled={stats.sampled}"
+    message = (
+        f"{title}: aspects={stats.nodes}, {sampled}, edges~{stats.edges:.0f}, "
+        f"avg_degree={format_estimate(stats.average_degree)}, "
+        f"ADI={format_estimate(stats.adi)}, isolated~{format_estimate(stats.isolated)}"
+    )
+    if stats.weighted_average_degree is not None:
+        message += (
+            f", weighted_avg_degree={format_estimate(stats.weighted_average_degree)}, "
+            f"ADIw={format_estimate(stats.weighted_adi)}"
+        )
+    print(message)
+
+
+def run_approx(
+    aspects_path: Path,
+    per_section: bool,
+    include_slug_links: bool,
+    include_source_links: bool,
+    ignore_tag_frac: float | None,
+    weighted: bool,
+    idf_gamma: float,
+    adi_threshold: float,
+    show_isolates: bool,
+    isolate_limit: int | None,
+    tags_catalog: Path | None,
+    rel_error: float,
+    confidence: float,
+    seed: int,
+) -> None:
+    entries = load_entries(aspects_path)
+    if not entries:
+        raise SystemExit("No entries found in the ASPECTS file.")
+    sampler = DegreeSampler(
+        entries,
+        include_slug_links=include_slug_links,
+        include_source_links=include_source_links,
+        ignore_tag_frac=ignore_tag_frac,
+        weighted=weighted,
+        idf_gamma=idf_gamma,
+        tag_reference_counts=load_tag_reference_counts(tags_catalog),
+    )
+    overall, sections = ApproxADI(sampler, rel_error, confidence, seed).run(per_section)
+    print(f"Approximate ADI ({confidence:.0%} intervals, target error {rel_error:g}, seed {seed})")
+    print_approx_stats("Overall", overall)
+
+    def check(title: str, stats: ApproxStats) -> bool:
+        label = "ADIw" if stats.weighted_adi is not None else "ADI"
+        metric = stats.weighted_adi if stats.weighted_adi is not None else stats.adi
+        if metric.value >= adi_threshold:
+            print(f"!! {title} {label} {format_float(metric.value)} >= threshold {adi_threshold:.2f}")
+            return True
+        if metric.high >= adi_threshold:
+            print(f"?? {title} {label} interval reaches threshold {adi_threshold:.2f}; confirm with an exact run")
+        return False
+
+    warning_triggered = check("Overall", overall)
+    if show_isolates and overall.sampled_isolates:
+        print("  Isolated aspects found in the sample:")
+        isolates = overall.sampled_isolates
+        if isolate_limit is not None:
+            isolates = isolates[:isolate_limit]
+        for slug in isolates:
+            print(f"    - {slug}")
+
+    if per_section:
+        print()
+        print("Per section:")
+        for section_slug, stats in sections.items():
+            print_approx_stats(f"  {section_slug}", stats)
+            warning_triggered = check(f"  section {section_slug}", stats) or warning_triggered
+            if show_isolates and stats.sampled_isolates:
+                isolates = stats.sampled_isolates
+                if isolate_limit is not None:
+                    isolates = isolates[:isolate_limit]
+                for slug in isolates:
+                    print(f"    * isolated: {slug}")
+
+    if not warning_triggered:
+        print()
+        print("ADI estimate within target thresholds; no high-risk sections detected.")
+
+
+def run_sweep(
+    aspects_path: Path,
+    include_slug_links: bool,
+    include_source_links: bool,
+    gammas: list[float],
+    fracs: list[float | None],
+    adi_threshold: float,
+    tags_catalog: Path | None,
+) -> None:
+    entries = load_entries(aspects_path)
+    if not entries:
+        raise SystemExit("No entries found in the ASPECTS file.")
+    rows = sweep(
+        entries,
+        gammas,
+        fracs,
+        include_slug_links=include_slug_links,
+        include_source_links=include_source_links,
+        tag_reference_counts=load_tag_reference_counts(tags_catalog),
+    )
+    print(f"ADI sweep over {len(entries)} aspects (!! marks ADIw >= threshold {adi_threshold:.2f})")
+    header = ("ignore_frac", "gamma", "edges", "avg_degree", "ADI", "isolated", "weighted_avg_degree", "ADIw", "")
+    table = [header]
+    for row in rows:
+        table.append(
+            (
+                "none" if row.ignore_tag_frac is None else f"{row.ignore_tag_frac:g}",
+                f"{row.idf_gamma:g}",
+                str(row.edges),
+                format_float(row.average_degree),
+                format_float(row.adi),
+                str(row.isolated),
+                format_float(row.weighted_average_degree),
+                format_float(row.weighted_adi),
+                "!!" if row.weighted_adi >= adi_threshold else "",
+            )
+        )
+    widths = [max(len(line[column]) for line in table) for column in range(len(header))]
+    for line in table:
+        print("  ".join(cell.rjust(width) for cell, width in zip(line, widths)).rstrip())
+
+
+def parse_sweep_values(text: str, allow_none: bool) -> list[float | None]:
+    values: list[float | None] = []
+    for item in text.split(","):
+        item = item.strip()
+        if allow_none and item.lower() == "none":
+            values.append(None)
+        else:
+            values.append(float(item))
+    return list(dict.fromkeys(values))
+
+
+def graph_cache_paths(
+    aspects_path: Path,
+    tags_catalog: Path | None,
+    options: dict,
+) -> tuple[Path, Path, str]:
+    """Return (index path, rows path, key) of the cached graph for one option set."""
+    stem = cache_dir(aspects_path) / f"adi-graph-{cache_key(GRAPH_LAYOUT, options)[:16]}"
+    key = cache_key(GRAPH_LAYOUT, options, file_fingerprint(aspects_path), file_fingerprint(tags_catalog))
+    return stem.with_suffix(".json"), stem.with_suffix(".rows"), key
+
+
+def store_graph(
+    index_path: Path,
+    rows_path: Path,
+    key: str,
+    section_of: dict[str, str],
+    graph: CSRGraph,
+    warnings: list[str],
+) -> None:
+    """Write the CSR rows as raw arrays; slugs, sections, offsets and catalog warnings as JSON."""
+    rows = key.encode("ascii") + array("q", graph.indices).tobytes()
+    if graph.weights is not None:
+        rows += graph.weights.tobytes()
+    try:
+        write_atomic(rows_path, rows)
+    except OSError:
+        return
+    store_json_cache(
+        index_path,
+        key,
+        {
+            "slugs": list(graph.slugs),
+            "sections": [section_of[slug] for slug in graph.slugs],
+            "indptr": graph.indptr.tolist(),
+            "weighted": graph.weights is not None,
+            "warnings": warnings,
+        },
+    )
+
+
+def read_graph_rows(
+    rows_path: Path,
+    key: str,
+    index: dict,
+    start: int,
+    end: int,
+) -> tuple[array, array | None] | None:
+    """Read neighbour ids (and weights) of CSR positions [start, end) or None when stale."""
+    header = key.encode("ascii")
+    edges = index["indptr"][-1]
+    indices = array("q")
+    weights = array("d") if index["weighted"] else None
+    try:
+        with rows_path.open("rb") as stream:
+            if stream.read(len(header)) != header:
+                return None
+            stream.seek(len(header) + start * indices.itemsize)
+            indices.frombytes(stream.read((end - start) * indices.itemsize))
+            if weights is not None:
+                stream.seek(len(header) + edges * indices.itemsize + start * weights.itemsize)
+                weights.frombytes(stream.read((end - start) * weights.itemsize))
+    except (OSError, ValueError):
+        return None
+    if len(indices) != end - start or (weights is not None and len(weights) != end - start):
+        return None
+    return indices, weights
+
+
+def load_graph(
+    aspects_path: Path,
+    tags_catalog: Path | None,
+    include_slug_links: bool,
+    include_source_links: bool,
+    ignore_tag_frac: float | None,
+    weighted: bool,
+    idf_gamma: float,
+    use_cache: bool,
+) -> tuple[dict[str, str], dict[str, set[str]], dict[str, dict[str, float]] | None]:
+    """Return (slug -> section slug, adjacency, weighted adjacency), cached on disk.
+
+    The cache files are chosen by the link options, and the key also covers the
+    ASPECTS.json and tags catalog fingerprints, so an edit to either invalidates it.
+    Catalog warnings are stored with the graph and printed again on every cache hit.
+    """
+    options = {
+        "slug_links": include_slug_links,
+        "source_links": include_source_links,
+        "ignore_tag_frac": ignore_tag_frac,
+        "weighted": weighted,
+        "idf_gamma": idf_gamma if weighted else None,
+        "tags_catalog": tags_catalog is not None,
+    }
+    index_path, rows_path, key = graph_cache_paths(aspects_path, tags_catalog, options)
+    if use_cache:
+        index = load_json_cache(index_path, key)
+        if index is not None:
+            rows = read_graph_rows(rows_path, key, index, 0, index["indptr"][-1])
+            if rows is not None:
+                print_cached_warnings(index)
+                return graph_from_index(index, *rows)
+
+    entries = load_entries(aspects_path)
+    if not entries:
+        raise SystemExit("No entries found in the ASPECTS file.")
+    warnings: list[str] = []
+    adjacency, weighted_adj = build_adjacency(
+        entries,
+        include_slug_links=include_slug_links,
+        include_source_links=include_source_links,
+        ignore_tag_frac=ignore_tag_frac,
+        weighted=weighted,
+        idf_gamma=idf_gamma,
+        tag_reference_counts=load_tag_reference_counts(tags_catalog),
+        warnings=warnings,
+    )
+    section_of = {entry.slug: entry.section_slug for entry in entries}
+    if use_cache:
+        graph = to_csr(list(section_of), adjacency, weighted_adj)
+        store_graph(index_path, rows_path, key, section_of, graph, warnings)
+    return section_of, adjacency, weighted_adj
+
+
+def print_cached_warnings(index: dict) -> None:
+    for message in index["warnings"]:
+        print(message, file=sys.stderr)
+
+
+def graph_from_index(
+    index: dict,
+    indices: array,
+    weights: array | None,
+) -> tuple[dict[str, str], dict[str, set[str]], dict[str, dict[str, float]] | None]:
+    slugs: list[str] = index["slugs"]
+    indptr: list[int] = index["indptr"]
+    section_of = dict(zip(slugs, index["sections"]))
+    adjacency: dict[str, set[str]] = {}
+    weighted_adj: dict[str, dict[str, float]] | None = {} if weights is not None else None
+    for node, slug in enumerate(slugs):
+        start, end = indptr[node], indptr[node + 1]
+        neighbors = [slugs[other] for other in indices[start:end]]
+        adjacency[slug] = set(neighbors)
+        if weighted_adj is not None and weights is not None:
+            weighted_adj[slug] = dict(zip(neighbors, weights[start:end]))
+    return section_of, adjacency, weighted_adj
+
+
+def resolve_slug(slug: str, slugs: Iterable[str]) -> str:
+    """Return ``slug`` as stored, matching case-insensitively as a fallback."""
+    lowered: dict[str, str] = {}
+    for candidate in slugs:
+        if candidate == slug:
+            return candidate
+        lowered.setdefault(candidate.lower(), candidate)
+    if slug.lower() not in lowered:
+        raise SystemExit(f"Entry '{slug}' not found.")
+    return lowered[slug.lower()]
+
+
+def load_related(
+    aspects_path: Path,
+    tags_catalog: Path | None,
+    slug: str,
+    ignore_tag_frac: float | None,
+    idf_gamma: float,
+    use_cache: bool,
+) -> tuple[str, dict[str, float], dict[str, str]]:
+    """Return (slug, weighted neighbours, slug -> section) for one aspect.
+
+    Related lookups always use the widest link definition. With a valid cache only
+    the index and the target's own row are read, so a lookup costs O(V + degree)
+    instead of rebuilding all O(V + E) adjacency dicts.
+    """
+    options = {
+        "slug_links": True,
+        "source_links": True,
+        "ignore_tag_frac": ignore_tag_frac,
+        "weighted": True,
+        "idf_gamma": idf_gamma,
+        "tags_catalog": tags_catalog is not None,
+    }
+    index_path, rows_path, key = graph_cache_paths(aspects_path, tags_catalog, options)
+    if use_cache:
+        index = load_json_cache(index_path, key)
+        if index is not None:
+            slugs: list[str] = index["slugs"]
+            node = slugs.index(resolve_slug(slug, slugs))
+            rows = read_graph_rows(rows_path, key, index, index["indptr"][node], index["indptr"][node + 1])
+            if rows is not None and rows[1] is not None:
+                print_cached_warnings(index)
+                indices, weights = rows
+                neighbors = {slugs[other]: weight for other, weight in zip(indices, weights)}
+                return slugs[node], neighbors, dict(zip(slugs, index["sections"]))
+    section_of, _, weighted_adj = load_graph(
+        aspects_path,
+        tags_catalog,
+        include_slug_links=True,
+        include_source_links=True,
+        ignore_tag_frac=ignore_tag_frac,
+        weighted=True,
+        idf_gamma=idf_gamma,
+        use_cache=use_cache,
+    )
+    assert weighted_adj is not None
+    slug = resolve_slug(slug, section_of)
+    return slug, weighted_adj[slug], section_of
+
+
+def _npy_bytes(descr: str, count: int, data: bytes) -> bytes:
+    """Encode a 1-D array in the NumPy .npy v1.0 format."""
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': ({count},), }}"
+    padding = 64 - (10 + len(header) + 1) % 64
+    header_bytes = (header + " " * padding + "\n").encode("latin1")
+    return b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header_bytes)) + header_bytes + data
+
+
+def _npy_numbers(values: array) -> bytes:
+    descr = {"q": "<i8", "d": "<f8"}[values.typecode]
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return _npy_bytes(descr, len(values), values.tobytes())
+
+
+def _npy_strings(values: list[str]) -> bytes:
+    width = max((len(value) for value in values), default=1) or 1
+    data = b"".join(value.ljust(width, "\0").encode("utf-32-le") for value in values)
+    return _npy_bytes(f"<U{width}", len(values), data)
+
+
+def export_graph(
+    path: Path,
+    export_format: str,
+    section_of: dict[str, str],
+    adjacency: dict[str, set[str]],
+    weighted_adj: dict[str, dict[str, float]] | None,
+) -> tuple[int, int]:
+    """Write the graph to ``path``; returns (nodes, undirected edges)."""
+    graph = to_csr(list(section_of), adjacency, weighted_adj)
+    src, dst = array("q"), array("q")
+    edge_weights = array("d")
+    for node in range(graph.nodes):
+        for pos in range(graph.indptr[node], graph.indptr[node + 1]):
+            other = graph.indices[pos]
+            if other > node:
+                src.append(node)
+                dst.append(other)
+                edge_weights.append(graph.weights[pos] if graph.weights is not None else 1.0)
+
+    if export_format == "npz":
+        members = {
+            "slugs": _npy_strings(list(graph.slugs)),
+            "sections": _npy_strings(list(section_of.values())),
+            "src": _npy_numbers(src),
+            "dst": _npy_numbers(dst),
+            "weight": _npy_numbers(edge_weights),
+            "indptr": _npy_numbers(array("q", graph.indptr)),
+            "indices": _npy_numbers(array("q", graph.indices)),
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for name, data in members.items():
+                archive.writestr(f"{name}.npy", data)
+        return graph.nodes, len(src)
+
+    lines: list[str] = []
+    if export_format == "graphml":
+        lines.extend(
+            [
+                '<?xml version="1.0" encoding="UTF-8"?>',
+                '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">',
+                '  <key id="section" for="node" attr.name="section" attr.type="string"/>',
+                '  <key id="weight" for="edge" attr.name="weight" attr.type="double"/>',
+                '  <graph id="aspects" edgedefault="undirected">',
+            ]
+        )
+        for slug in graph.slugs:
+            lines.append(
+                f"    <node id={quoteattr(slug)}>"
+                f"<data key=\"section\">{quoteattr(section_of[slug])[1:-1]}</data></node>"
+            )
+        for a, b, weight in zip(src, dst, edge_weights):
+            lines.append(
+                f"    <edge source={quoteattr(graph.slugs[a])} target={quoteattr(graph.slugs[b])}>"
+                f"<data key=\"weight\">{weight:.6g}</data></edge>"
+            )
+        lines.extend(["  </graph>", "</graphml>"])
+    else:
+
+        def dot_id(value: str) -> str:
+            return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+        lines.append("graph aspects {")
+        for slug in graph.slugs:
+            lines.append(f"  {dot_id(slug)} [section={dot_id(section_of[slug])}];")
+        for a, b, weight in zip(src, dst, edge_weights):
+            lines.append(
+                f"  {dot_id(graph.slugs[a])} -- {dot_id(graph.slugs[b])} [weight={weight:.6g}];"
+            )
+        lines.append("}")
+    write_atomic(path, ("\n".join(lines) + "\n").encode("utf-8"))
+    return graph.nodes, len(src)
+
+
+def run_tag_pairs(
+    counts: Counter[str],
+    pairs: Counter[tuple[str, str]],
+    limit: int,
+    min_shared: int = 2,
+) -> None:
+    """Print the tag pairs with the highest Jaccard overlap of their aspects."""
+    scored = [
+        (shared / (counts[a] + counts[b] - shared), shared, a, b)
+        for (a, b), shared in pairs.items()
+        if shared >= min_shared
+    ]
+    ranked = sorted(heapq.nlargest(limit, scored), key=lambda item: (-item[0], -item[1], item[2], item[3]))
+    print(
+        f"Tag pairs by overlap: top {len(ranked)} of {len(scored)} pairs sharing >= {min_shared} aspects "
+        f"({len(counts)} tags)"
+    )
+    if not ranked:
+        print("  (no tag pair labels the same aspects twice)")
+    for rank, (jaccard, shared, a, b) in enumerate(ranked, start=1):
+        print(f"  {rank:2d}. {jaccard:4.2f}  {shared:3d} shared  {a} ({counts[a]}) + {b} ({counts[b]})")
+
+
+def run_related(
+    slug: str,
+    sections: dict[str, str],
+    neighbors: dict[str, float],
+    top_k: int,
+) -> None:
+    ranked = sorted(
+        heapq.nlargest(top_k, neighbors.items(), key=lambda item: item[1]),
+        key=lambda item: (-item[1], item[0]),
+    )
+    print(
+        f"Related to {slug} ({sections.get(slug, '?')}): "
+        f"top {len(ranked)} of {len(neighbors)} neighbors"
+    )
+    if not ranked:
+        print("  (isolated: no tag, source or slug-mention links)")
+    for rank, (neighbor, weight) in enumerate(ranked, start=1):
+        print(f"  {rank:2d}. {weight:6.2f}  {neighbor} ({sections.get(neighbor, '?')})")
+
+
 def parse_args(argv: list[str] | None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Calculate the Aspect-Density Index (ADI) for ASPECTS.json."
@@ -512,19 +1277,191 @@ def parse_args(argv: list[str] | None) -> argparse.Namespace:
         type=int,
         help="Maximum number of isolates to list per scope when --show-isolates is used.",
     )
+    parser.add_argument(
+        "--structure",
+        action="store_true",
+        help=(
+            "Report connected components, PageRank-central aspects and label-propagation "
+            "communities (with --per-section: components spanned per section)."
+        ),
+    )
+    parser.add_argument(
+        "--central-limit",
+        type=int,
+        default=10,
+        help="Number of central aspects and communities listed by --structure. Default: 10",
+    )
+    parser.add_argument(
+        "--related",
+        metavar="SLUG",
+        help=(
+            "List the aspects most strongly connected to SLUG (IDF-weighted tags plus shared "
+            "sources and slug mentions) instead of computing ADI."
+        ),
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=10,
+        help="Number of neighbors printed by --related. Default: 10",
+    )
+    parser.add_argument(
+        "--tag-pairs",
+        type=int,
+        metavar="N",
+        help=(
+            "List the N tag pairs whose aspects overlap most (Jaccard) instead of computing ADI; "
+            "candidates for merging redundant tags."
+        ),
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help=(
+            "Build the graph in memory only: do not read or write the on-disk cache "
+            "(.aspects-cache/adi-graph-*, written by default)."
+        ),
+    )
+    parser.add_argument(
+        "--export",
+        type=Path,
+        metavar="PATH",
+        help="Write the graph to PATH (.npz arrays, .graphml or .dot/.gv).",
+    )
+    parser.add_argument(
+        "--export-format",
+        choices=("npz", "graphml", "dot"),
+        help="Export format when it cannot be inferred from the --export suffix.",
+    )
+    parser.add_argument(
+        "--approx",
+        action="store_true",
+        help="Estimate ADI from a stratified node sample with confidence intervals instead of building the graph.",
+    )
+    parser.add_argument(
+        "--approx-error",
+        type=float,
+        default=0.05,
+        help=(
+            "Target half-width for --approx: relative for average (weighted) degree, absolute for the "
+            "isolate fraction. Default: 0.05."
+        ),
+    )
+    parser.add_argument(
+        "--confidence",
+        type=float,
+        default=0.95,
+        help="Confidence level of the --approx intervals. Default: 0.95.",
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Random seed for --approx sampling. Default: 0.",
+    )
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help=(
+            "Print overall ADI/ADIw/isolates for every --sweep-gammas x --sweep-fracs combination "
+            "from one pass over the tag incidence."
+        ),
+    )
+    parser.add_argument(
+        "--sweep-gammas",
+        default="0.5,0.75,1,1.25,1.5,2",
+        help="Comma-separated --idf-gamma values for --sweep. Default: 0.5,0.75,1,1.25,1.5,2.",
+    )
+    parser.add_argument(
+        "--sweep-fracs",
+        default="0.05,0.1,0.15,0.2,0.3,none",
+        help=(
+            "Comma-separated --ignore-tag-frac values for --sweep ('none' keeps every tag). "
+            "Default: 0.05,0.1,0.15,0.2,0.3,none."
+        ),
+    )
     args = parser.parse_args(argv)
     if args.ignore_tag_frac is not None and not (0.0 <= args.ignore_tag_frac <= 1.0):
         parser.error("--ignore-tag-frac must be between 0.0 and 1.0")
     if args.idf_gamma <= 0:
         parser.error("--idf-gamma must be greater than 0")
+    if args.approx and (args.structure or args.export or args.related):
+        parser.error("--approx cannot be combined with --structure, --export or --related")
+    if args.sweep:
+        if args.approx or args.structure or args.export or args.related:
+            parser.error("--sweep cannot be combined with --approx, --structure, --export or --related")
+        try:
+            args.sweep_gammas = parse_sweep_values(args.sweep_gammas, allow_none=False)
+            args.sweep_fracs = parse_sweep_values(args.sweep_fracs, allow_none=True)
+        except ValueError:
+            parser.error("--sweep-gammas and --sweep-fracs must be comma-separated numbers")
+        if any(gamma <= 0 for gamma in args.sweep_gammas):
+            parser.error("--sweep-gammas values must be greater than 0")
+        if any(frac is not None and not (0.0 <= frac <= 1.0) for frac in args.sweep_fracs):
+            parser.error("--sweep-fracs values must be between 0.0 and 1.0 or 'none'")
+    if not (0.0 < args.approx_error < 1.0) or not (0.0 < args.confidence < 1.0):
+        parser.error("--approx-error and --confidence must be between 0 and 1")
+    if args.top_k < 1:
+        parser.error("--top-k must be at least 1")
+    if args.tag_pairs is not None:
+        if args.tag_pairs < 1:
+            parser.error("--tag-pairs must be at least 1")
+        if args.approx or args.sweep or args.structure or args.export or args.related:
+            parser.error("--tag-pairs cannot be combined with --approx, --sweep, --structure, --export or --related")
+    if args.export is not None and args.export_format is None:
+        args.export_format = EXPORT_FORMATS.get(args.export.suffix.lower())
+        if args.export_format is None:
+            parser.error("cannot infer export format from suffix; use --export-format")
     return args
 
 
 def main(argv: list[str] | None = None) -> None:
     args = parse_args(argv)
-    tag_reference_counts = load_tag_reference_counts(
-        Path(args.tags_catalog) if args.tags_catalog else None
-    )
+    tags_catalog = Path(args.tags_catalog) if args.tags_catalog else None
+    if args.related:
+        slug, neighbors, section_of = load_related(
+            args.aspects_path,
+            tags_catalog,
+            args.related,
+            ignore_tag_frac=args.ignore_tag_frac,
+            idf_gamma=args.idf_gamma,
+            use_cache=not args.no_cache,
+        )
+        run_related(slug, section_of, neighbors, args.top_k)
+        return
+    if args.tag_pairs is not None:
+        counts, pairs = load_tag_cooccurrence(args.aspects_path, use_cache=not args.no_cache)
+        run_tag_pairs(counts, pairs, args.tag_pairs)
+        return
+    if args.sweep:
+        run_sweep(
+            aspects_path=args.aspects_path,
+            include_slug_links=args.include_slug_links,
+            include_source_links=args.include_source_links,
+            gammas=args.sweep_gammas,
+            fracs=args.sweep_fracs,
+            adi_threshold=args.adi_threshold,
+            tags_catalog=tags_catalog,
+        )
+        return
+    if args.approx:
+        run_approx(
+            aspects_path=args.aspects_path,
+            per_section=args.per_section,
+            include_slug_links=args.include_slug_links,
+            include_source_links=args.include_source_links,
+            ignore_tag_frac=args.ignore_tag_frac,
+            weighted=args.weighted,
+            idf_gamma=args.idf_gamma,
+            adi_threshold=args.adi_threshold,
+            show_isolates=args.show_isolates,
+            isolate_limit=args.isolate_limit,
+            tags_catalog=tags_catalog,
+            rel_error=args.approx_error,
+            confidence=args.confidence,
+            seed=args.seed,
+        )
+        return
     run(
         aspects_path=args.aspects_path,
         per_section=args.per_section,
@@ -536,7 +1473,12 @@ def main(argv: list[str] | None = None) -> None:
         adi_threshold=args.adi_threshold,
         show_isolates=args.show_isolates,
         isolate_limit=args.isolate_limit,
-        tag_reference_counts=tag_reference_counts,
+        tags_catalog=tags_catalog,
+        structure=args.structure,
+        central_limit=args.central_limit,
+        use_cache=not args.no_cache,
+        export_path=args.export,
+        export_format=args.export_format,
     )
 
 
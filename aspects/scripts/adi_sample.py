@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Sampling estimates of ADI for very large knowledge bases (``adi.py --approx``).
+
+Exact ADI builds every edge: all tag pairs plus an all-pairs slug-mention scan.
+The estimator never builds the graph. It computes the degree of a *sampled* node
+directly from inverted indexes (tag members, source members and slug-mention
+tokens), which costs the size of that node's postings, and samples nodes until
+the confidence intervals are tight enough.
+
+Sampling is stratified by section (proportional allocation, without
+replacement), so the same sample also yields per-section estimates, where degree
+counts only neighbours in the same section as in ``adi.py --per-section``.
+Sections that need more samples than the overall estimate get them without the
+global degree, from per-section postings.
+Average degree and weighted degree stop at a relative half-width of
+``rel_error``; the isolate fraction at an absolute half-width of ``rel_error``.
+Intervals use the normal approximation with finite-population correction, so a
+fully sampled scope collapses to the exact value.
+
+The link rules match ``adi.py`` (tag links with ``ignore_tag_frac`` and catalog
+counts, IDF weights, source links, slug mentions as whole ``[a-z0-9_-]`` runs).
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from statistics import NormalDist
+from typing import Iterable, Sequence
+
+TOKEN_RE = re.compile(r"[a-z0-9_-]+")
+MIN_SAMPLE = 100
+MIN_STRATUM = 5
+
+
+@dataclass(frozen=True)
+class Estimate:
+    value: float
+    low: float
+    high: float
+
+    def scaled(self, factor: float) -> "Estimate":
+        return Estimate(self.value * factor, self.low * factor, self.high * factor)
+
+    def inverse(self, numerator: float) -> "Estimate":
+        """numerator / x, with the bounds swapped (x > 0 is monotone decreasing)."""
+
+        def div(value: float) -> float:
+            return math.inf if value <= 0 else numerator / value
+
+        return Estimate(div(self.value), div(self.high), div(self.low))
+
+
+@dataclass(frozen=True)
+class ApproxStats:
+    nodes: int
+    sampled: int
+    average_degree: Estimate
+    isolated_fraction: Estimate
+    weighted_average_degree: Estimate | None
+    sampled_isolates: tuple[str, ...]
+
+    @property
+    def exact(self) -> bool:
+        return self.sampled >= self.nodes
+
+    @property
+    def adi(self) -> Estimate:
+        return self.average_degree.inverse(self.nodes)
+
+    @property
+    def weighted_adi(self) -> Estimate | None:
+        if self.weighted_average_degree is None:
+            return None
+        return self.weighted_average_degree.inverse(self.nodes)
+
+    @property
+    def isolated(self) -> Estimate:
+        return self.isolated_fraction.scaled(self.nodes)
+
+    @property
+    def edges(self) -> float:
+        return self.nodes * self.average_degree.value / 2
+
+
+def mention_links(entries: Sequence) -> list[set[int]]:
+    """Undirected slug-mention neighbours of every entry, from one tokenisation pass.
+
+    Equivalent to ``adi.py``'s pairwise boundary regex: a slug made of
+    ``[a-z0-9_-]`` only can match exactly when it is a whole token.
+    """
+    by_slug = {entry.slug_lower: node for node, entry in enumerate(entries)}
+    links: list[set[int]] = [set() for _ in entries]
+    plain = {slug for slug in by_slug if TOKEN_RE.fullmatch(slug)}
+    for node, entry in enumerate(entries):
+        for token in set(TOKEN_RE.findall(entry.text)) & plain:
+            other = by_slug[token]
+            if other != node:
+                links[node].add(other)
+                links[other].add(node)
+    # Slugs with characters outside the token class need the boundary regex.
+    for slug in by_slug.keys() - plain:
+        other = by_slug[slug]
+        pattern = re.compile(rf"(?<![a-z0-9_-]){re.escape(slug)}(?![a-z0-9_-])")
+        for node, entry in enumerate(entries):
+            if node != other and pattern.search(entry.text):
+                links[node].add(other)
+                links[other].add(node)
+    return links
+
+
+class DegreeSampler:
+    """Per-node degrees from inverted indexes, without materialising edges."""
+
+    def __init__(
+        self,
+        entries: Sequence,  # adi.Entry
+        include_slug_links: bool,
+        include_source_links: bool,
+        ignore_tag_frac: float | None,
+        weighted: bool,
+        idf_gamma: float,
+        tag_reference_counts: dict[str, int] | None,
+    ) -> None:
+        self.entries = entries
+        self.weighted = weighted
+        self.sections = [entry.section_slug for entry in entries]
+        total = len(entries)
+
+        tag_index: defaultdict[str, list[int]] = defaultdict(list)
+        for node, entry in enumerate(entries):
+            for tag in entry.tags:
+                tag_index[tag].append(node)
+        # key -> (members, weight); only keys that create links are kept.
+        self.keys: dict[str, tuple[list[int], float]] = {}
+        for tag, members in tag_index.items():
+            references = len(members)
+            if tag_reference_counts is not None and tag in tag_reference_counts:
+                references = max(references, tag_reference_counts[tag])
+            if ignore_tag_frac is not None and total and references / total >= ignore_tag_frac:
+                continue
+            if len(members) < 2:
+                continue
+            weight = 1.0 / (math.log2(1 + references) ** idf_gamma) if weighted else 1.0
+            self.keys[f"tag:{tag}"] = (members, weight)
+        if include_source_links:
+            source_index: defaultdict[str, list[int]] = defaultdict(list)
+            for node, entry in enumerate(entries):
+                for source in entry.sources:
+                    source_index[source].append(node)
+            for source, members in source_index.items():
+                if len(members) >= 2:
+                    self.keys[f"src:{source}"] = (members, 1.0)
+        self.keys_of: list[list[str]] = [[] for _ in entries]
+        # key -> section -> members, so in-section degrees only touch that section.
+        self.section_members: dict[str, dict[str, list[int]]] = {}
+        for key, (members, _) in self.keys.items():
+            grouped: defaultdict[str, list[int]] = defaultdict(list)
+            for node in members:
+                self.keys_of[node].append(key)
+                grouped[self.sections[node]].append(node)
+            self.section_members[key] = dict(grouped)
+
+        self.mentions: list[set[int]] | None = None
+        if include_slug_links:
+            self.mentions = mention_links(entries)
+
+    def node_degrees(self, node: int) -> tuple[int, float]:
+        """(degree, weighted degree) over the whole graph."""
+        neighbors: set[int] = set()
+        weighted = 0.0
+        for key in self.keys_of[node]:
+            members, weight = self.keys[key]
+            neighbors.update(members)
+            weighted += (len(members) - 1) * weight
+        if self.mentions is not None:
+            neighbors.update(self.mentions[node])
+            weighted += len(self.mentions[node])
+        neighbors.discard(node)
+        return len(neighbors), weighted
+
+    def section_degrees(self, node: int) -> tuple[int, float]:
+        """(degree, weighted degree) counting only neighbours in the node's section."""
+        section = self.sections[node]
+        neighbors: set[int] = set()
+        weighted = 0.0
+        for key in self.keys_of[node]:
+            members = self.section_members[key][section]
+            neighbors.update(members)
+            weighted += (len(members) - 1) * self.keys[key][1]
+        if self.mentions is not None:
+            mentioned = [other for other in self.mentions[node] if self.sections[other] == section]
+            neighbors.update(mentioned)
+            weighted += len(mentioned)
+        neighbors.discard(node)
+        return len(neighbors), weighted
+
+
+@dataclass
+class _Stratum:
+    order: list[int]
+    taken: int = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.order)
+
+    @property
+    def exhausted(self) -> bool:
+        return self.taken >= self.size
+
+
+def _mean_var(values: Sequence[float], population: int) -> tuple[float, float]:
+    """Sample mean and variance of that mean (with finite-population correction)."""
+    count = len(values)
+    mean = sum(values) / count
+    if count >= population or count < 2:
+        return mean, 0.0
+    variance = sum((value - mean) ** 2 for value in values) / (count - 1)
+    return mean, variance / count * (1 - count / population)
+
+
+def _proportion_var(hits: int, count: int, population: int) -> tuple[float, float]:
+    share = hits / count
+    if count >= population:
+        return share, 0.0
+    smoothed = (hits + 0.5) / (count + 1)  # keeps the interval open when no hit was sampled yet
+    return share, smoothed * (1 - smoothed) / count * (1 - count / population)
+
+
+def _combine(parts: Iterable[tuple[float, float, float]], z: float, floor: float | None = None) -> Estimate:
+    """Stratified estimate from (population share, mean, variance of the mean) triples."""
+    value = 0.0
+    variance = 0.0
+    for share, mean, var in parts:
+        value += share * mean
+        variance += share * share * var
+    half = z * math.sqrt(variance)
+    low = value - half
+    if floor is not None:
+        low = max(low, floor)
+    return Estimate(value, low, value + half)
+
+
+def _met(estimate: Estimate, rel_error: float, relative: bool) -> bool:
+    half = (estimate.high - estimate.low) / 2
+    if not relative:
+        return half <= rel_error
+    return half <= rel_error * abs(estimate.value) or half == 0
+
+
+class ApproxADI:
+    """Adaptive stratified sampling of node degrees."""
+
+    def __init__(
+        self,
+        sampler: DegreeSampler,
+        rel_error: float = 0.05,
+        confidence: float = 0.95,
+        seed: int = 0,
+    ) -> None:
+        self.sampler = sampler
+        self.rel_error = rel_error
+        self.confidence = confidence
+        self.z = NormalDist().inv_cdf((1 + confidence) / 2)
+        rng = random.Random(seed)
+        members: defaultdict[str, list[int]] = defaultdict(list)
+        for node, section in enumerate(sampler.sections):
+            members[section].append(node)
+        self.strata: dict[str, _Stratum] = {}
+        for section in sorted(members):
+            order = members[section]
+            rng.shuffle(order)
+            self.strata[section] = _Stratum(order)
+        # Per stratum: (node, degree, weighted degree) for the whole graph and within the section.
+        self.samples: dict[str, list[tuple[int, int, float]]] = {section: [] for section in self.strata}
+        self.section_samples: dict[str, list[tuple[int, int, float]]] = {section: [] for section in self.strata}
+        self.total = len(sampler.sections)
+
+    def _take(self, section: str, count: int, overall: bool) -> None:
+        """Sample more nodes of a stratum; global degrees are skipped when only the section needs them."""
+        stratum = self.strata[section]
+        stop = min(stratum.size, stratum.taken + count)
+        for node in stratum.order[stratum.taken : stop]:
+            if overall:
+                self.samples[section].append((node, *self.sampler.node_degrees(node)))
+            self.section_samples[section].append((node, *self.sampler.section_degrees(node)))
+        stratum.taken = stop
+
+    def _scope(self, parts: list[tuple[float, list[tuple[int, int, float]], int]], sampled: int) -> ApproxStats:
+        """Combine (population share, samples, population) strata into one estimate."""
+        degree_parts, weighted_parts, isolate_parts = [], [], []
+        isolates: list[str] = []
+        for share, samples, population in parts:
+            degree_parts.append((share, *_mean_var([float(degree) for _, degree, _ in samples], population)))
+            weighted_parts.append((share, *_mean_var([weighted for _, _, weighted in samples], population)))
+            hits = [node for node, degree, _ in samples if degree == 0]
+            isolate_parts.append((share, *_proportion_var(len(hits), len(samples), population)))
+            isolates.extend(self.sampler.entries[node].slug for node in hits)
+        return ApproxStats(
+            nodes=sum(population for _, _, population in parts),
+            sampled=sampled,
+            average_degree=_combine(degree_parts, self.z, 0.0),
+            isolated_fraction=_clamp(_combine(isolate_parts, self.z, 0.0)),
+            weighted_average_degree=_combine(weighted_parts, self.z, 0.0) if self.sampler.weighted else None,
+            sampled_isolates=tuple(sorted(isolates)),
+        )
+
+    def overall(self) -> ApproxStats:
+        parts = [
+            (stratum.size / self.total, self.samples[section], stratum.size)
+            for section, stratum in self.strata.items()
+        ]
+        return self._scope(parts, sum(len(samples) for samples in self.samples.values()))
+
+    def section(self, section: str) -> ApproxStats:
+        samples = self.section_samples[section]
+        return self._scope([(1.0, samples, self.strata[section].size)], len(samples))
+
+    def _stats_met(self, stats: ApproxStats) -> bool:
+        if stats.exact:
+            return True
+        checks = [_met(stats.average_degree, self.rel_error, True), _met(stats.isolated_fraction, self.rel_error, False)]
+        if stats.weighted_average_degree is not None:
+            checks.append(_met(stats.weighted_average_degree, self.rel_error, True))
+        return all(checks)
+
+    def run(self, per_section: bool = False) -> tuple[ApproxStats, dict[str, ApproxStats]]:
+        """Sample until every requested interval meets the error bound (or all nodes are sampled)."""
+        batch = min(self.total, MIN_SAMPLE)
+        for section, stratum in self.strata.items():
+            self._take(section, max(MIN_STRATUM, math.ceil(batch * stratum.size / self.total)), True)
+        # Overall first; the extra samples per-section scopes need skip the global degree.
+        for overall in (True, False):
+            if not overall and not per_section:
+                break
+            while True:
+                if overall:
+                    pending = [] if self._stats_met(self.overall()) else list(self.strata)
+                else:
+                    pending = [section for section in self.strata if not self._stats_met(self.section(section))]
+                pending = [section for section in pending if not self.strata[section].exhausted]
+                if not pending:
+                    break
+                for section in pending:
+                    stratum = self.strata[section]
+                    # Grow geometrically: each round doubles the sample of the unmet scopes.
+                    step = max(MIN_STRATUM, stratum.taken, math.ceil(batch * stratum.size / self.total))
+                    self._take(section, step, overall)
+        sections = {section: self.section(section) for section in self.strata} if per_section else {}
+        return self.overall(), sections
+
+
+def _clamp(estimate: Estimate) -> Estimate:
+    return Estimate(estimate.value, max(0.0, estimate.low), min(1.0, estimate.high))
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Incrementally maintained ADI state for edit-time feedback.
+
+``adi.py`` rebuilds the whole graph on every run. ``aspects_manager.py`` only
+changes one entry (or a small batch) at a time, so it keeps a persisted state
+instead: per-key member lists (tags and source paths), per-node degree and
+weighted degree, and per-section totals. Adding or removing an entry touches only
+the members of that entry's tags and sources.
+
+The graph matches ``adi.py --weighted --include-source-links --ignore-tag-frac F``
+without ``--include-slug-links`` and without a tags catalog: slug mentions need a
+full text scan, and tag frequencies are taken from the live membership.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable
+
+from aspects_cache import cache_dir, cache_key, file_fingerprint, load_json_cache, store_json_cache
+
+STATE_FILENAME = "adi-state.json"
+
+
+@dataclass(frozen=True)
+class ADISnapshot:
+    nodes: int
+    average_degree: float
+    adi: float
+    weighted_adi: float
+    isolated_slugs: frozenset[str]
+    sections: dict[str, tuple[float, float]]
+
+    @property
+    def isolated(self) -> int:
+        return len(self.isolated_slugs)
+
+
+def entry_keys(entry: dict[str, Any], include_source_links: bool = True) -> tuple[str, ...]:
+    keys = [f"tag:{tag}" for tag in dict.fromkeys(entry.get("tags", []))]
+    if include_source_links:
+        keys.extend(
+            f"src:{source['path']}"
+            for source in entry.get("sources", [])
+            if isinstance(source, dict) and isinstance(source.get("path"), str)
+        )
+    return tuple(dict.fromkeys(keys))
+
+
+def _ratio(nodes: int, total_degree: float) -> float:
+    if nodes == 0 or total_degree <= 0:
+        return math.inf
+    return nodes / (total_degree / nodes)
+
+
+class ADIState:
+    def __init__(
+        self,
+        ignore_tag_frac: float | None = 0.15,
+        idf_gamma: float = 1.0,
+        include_source_links: bool = True,
+    ) -> None:
+        self.ignore_tag_frac = ignore_tag_frac
+        self.idf_gamma = idf_gamma
+        self.include_source_links = include_source_links
+        self.members: dict[str, set[str]] = {}
+        self.section_of: dict[str, str] = {}
+        self.keys_of: dict[str, tuple[str, ...]] = {}
+        self.degree: dict[str, int] = {}
+        self.weighted_degree: dict[str, float] = {}
+        self.section_size: Counter[str] = Counter()
+        self.section_degree: Counter[str] = Counter()
+        self.section_weighted: dict[str, float] = {}
+        self.isolated: set[str] = set()
+        self.ignored: set[str] = set()
+        self.total_degree = 0
+        self.total_weighted = 0.0
+
+    # Key helpers -----------------------------------------------------------
+    def _compute_ignored(self) -> set[str]:
+        total = len(self.section_of)
+        if self.ignore_tag_frac is None or total == 0:
+            return set()
+        return {
+            key
+            for key, slugs in self.members.items()
+            if key.startswith("tag:") and len(slugs) / total >= self.ignore_tag_frac
+        }
+
+    def _active(self, key: str) -> bool:
+        return key not in self.ignored and len(self.members.get(key, ())) >= 2
+
+    def _weight(self, key: str) -> float:
+        if not key.startswith("tag:"):
+            return 1.0
+        denom = math.log2(1 + len(self.members[key]))
+        return 1.0 / (denom**self.idf_gamma) if denom > 0 else 0.0
+
+    def _key_contribution(self, key: str, sign: int) -> None:
+        """Add (sign=+1) or remove (sign=-1) the weighted degree a key contributes."""
+        if not self._active(key):
+            return
+        slugs = self.members[key]
+        weight = self._weight(key) * sign
+        share = (len(slugs) - 1) * weight
+        for slug in slugs:
+            self.weighted_degree[slug] += share
+        self.total_weighted += share * len(slugs)
+        for section, count in Counter(self.section_of[slug] for slug in slugs).items():
+            self.section_weighted[section] = (
+                self.section_weighted.get(section, 0.0) + count * (count - 1) * weight
+            )
+
+    def neighbors(self, slug: str) -> set[str]:
+        found: set[str] = set()
+        for key in self.keys_of.get(slug, ()):
+            if self._active(key):
+                found |= self.members[key]
+        found.discard(slug)
+        return found
+
+    def link_weight(self, a: str, b: str) -> float:
+        """Weighted edge between two tracked aspects (0.0 when they share no active key)."""
+        shared = set(self.keys_of.get(a, ())).intersection(self.keys_of.get(b, ()))
+        return sum(self._weight(key) for key in shared if self._active(key))
+
+    def _set_degree(self, slug: str, value: int) -> None:
+        self.total_degree += value - self.degree.get(slug, 0)
+        self.degree[slug] = value
+        if value == 0:
+            self.isolated.add(slug)
+        else:
+            self.isolated.discard(slug)
+
+    def _link(self, slug: str, sign: int) -> None:
+        """Add or remove all unweighted edges of ``slug`` (its degree is set separately)."""
+        section = self.section_of[slug]
+        for other in self.neighbors(slug):
+            self._set_degree(other, self.degree[other] + sign)
+            if self.section_of[other] == section:
+                self.section_degree[section] += 2 * sign
+
+    # Mutations -------------------------------------------------------------
+    def add(self, slug: str, section: str, keys: Iterable[str]) -> None:
+        if slug in self.section_of:
+            raise ValueError(f"ADI state already tracks '{slug}'.")
+        keys = tuple(dict.fromkeys(keys))
+        self.section_of[slug] = section
+        self.keys_of[slug] = keys
+        self.section_size[section] += 1
+        self.weighted_degree[slug] = 0.0
+        self.degree[slug] = 0
+        for key in keys:
+            self._key_contribution(key, -1)
+            self.members.setdefault(key, set()).add(slug)
+            self._key_contribution(key, +1)
+        self._link(slug, +1)
+        self._set_degree(slug, len(self.neighbors(slug)))
+        self._refresh_ignored()
+
+    def remove(self, slug: str) -> None:
+        if slug not in self.section_of:
+            return
+        section = self.section_of[slug]
+        self._link(slug, -1)
+        self._set_degree(slug, 0)
+        for key in self.keys_of[slug]:
+            self._key_contribution(key, -1)
+            self.members[key].discard(slug)
+            self._key_contribution(key, +1)
+            if not self.members[key]:
+                del self.members[key]
+        self.total_weighted -= self.weighted_degree.pop(slug)
+        self.isolated.discard(slug)
+        del self.degree[slug], self.section_of[slug], self.keys_of[slug]
+        self.section_size[section] -= 1
+        if not self.section_size[section]:
+            del self.section_size[section]
+            self.section_degree.pop(section, None)
+            self.section_weighted.pop(section, None)
+        self._refresh_ignored()
+
+    def add_entry(self, entry: dict[str, Any], section_slug: str) -> None:
+        self.add(entry["slug"], section_slug, entry_keys(entry, self.include_source_links))
+
+    def _refresh_ignored(self) -> None:
+        # The hub-tag cut-off depends on the total entry count, so an edit can move
+        # unrelated tags across it; that rare case falls back to a full rebuild.
+        ignored = self._compute_ignored()
+        if ignored != self.ignored:
+            self.ignored = ignored
+            self._recompute()
+
+    def _recompute(self) -> None:
+        self.degree = {slug: 0 for slug in self.section_of}
+        self.weighted_degree = {slug: 0.0 for slug in self.section_of}
+        self.section_degree = Counter()
+        self.section_weighted = {}
+        self.isolated = set()
+        self.total_degree = 0
+        self.total_weighted = 0.0
+        for key in self.members:
+            self._key_contribution(key, +1)
+        for slug, section in self.section_of.items():
+            neighbors = self.neighbors(slug)
+            self._set_degree(slug, len(neighbors))
+            self.section_degree[section] += sum(
+                1 for other in neighbors if self.section_of[other] == section
+            )
+
+    # Construction / persistence -----------------------------------------------
+    @classmethod
+    def from_data(cls, data: dict[str, Any], **params: Any) -> "ADIState":
+        state = cls(**params)
+        for section in data.get("sections", []):
+            for entry in section.get("entries", []):
+                slug = entry.get("slug")
+                if not slug or slug in state.section_of:
+                    continue
+                state.section_of[slug] = section["slug"]
+                state.keys_of[slug] = entry_keys(entry, state.include_source_links)
+                state.section_size[section["slug"]] += 1
+                for key in state.keys_of[slug]:
+                    state.members.setdefault(key, set()).add(slug)
+        state.ignored = state._compute_ignored()
+        state._recompute()
+        return state
+
+    def _params(self) -> dict[str, Any]:
+        return {
+            "ignore_tag_frac": self.ignore_tag_frac,
+            "idf_gamma": self.idf_gamma,
+            "include_source_links": self.include_source_links,
+        }
+
+    @classmethod
+    def load_or_build(cls, aspects_path: Path, data: dict[str, Any], **params: Any) -> "ADIState":
+        """Load the persisted state for the current file content or rebuild it from ``data``."""
+        state = cls(**params)
+        key = cache_key("adi-state", state._params(), file_fingerprint(aspects_path))
+        payload = load_json_cache(cache_dir(aspects_path) / STATE_FILENAME, key)
+        if payload is None:
+            return cls.from_data(data, **params)
+        state.members = {key: set(slugs) for key, slugs in payload["members"].items()}
+        for slug, (section, keys, degree, weighted) in payload["nodes"].items():
+            state.section_of[slug] = section
+            state.keys_of[slug] = tuple(keys)
+            state._set_degree(slug, degree)
+            state.weighted_degree[slug] = weighted
+            state.section_size[section] += 1
+        state.total_weighted = sum(state.weighted_degree.values())
+        state.section_degree = Counter(payload["sectionDegree"])
+        state.section_weighted = dict(payload["sectionWeighted"])
+        state.ignored = set(payload["ignored"])
+        return state
+
+    def store(self, aspects_path: Path) -> None:
+        """Persist the state against the current content of ``aspects_path``."""
+        key = cache_key("adi-state", self._params(), file_fingerprint(aspects_path))
+        payload = {
+            "members": {key: sorted(slugs) for key, slugs in self.members.items()},
+            "nodes": {
+                slug: [
+                    section,
+                    list(self.keys_of[slug]),
+                    self.degree[slug],
+                    self.weighted_degree[slug],
+                ]
+                for slug, section in self.section_of.items()
+            },
+            "sectionDegree": dict(self.section_degree),
+            "sectionWeighted": self.section_weighted,
+            "ignored": sorted(self.ignored),
+        }
+        store_json_cache(cache_dir(aspects_path) / STATE_FILENAME, key, payload)
+
+    # Reporting -------------------------------------------------------------
+    def snapshot(self) -> ADISnapshot:
+        nodes = len(self.section_of)
+        sections = {
+            section: (
+                _ratio(size, self.section_degree.get(section, 0)),
+                _ratio(size, self.section_weighted.get(section, 0.0)),
+            )
+            for section, size in self.section_size.items()
+        }
+        return ADISnapshot(
+            nodes=nodes,
+            average_degree=self.total_degree / nodes if nodes else 0.0,
+            adi=_ratio(nodes, self.total_degree),
+            weighted_adi=_ratio(nodes, self.total_weighted),
+            isolated_slugs=frozenset(self.isolated),
+            sections=sections,
+        )
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Evaluate ADI over a grid of ``--idf-gamma`` and ``--ignore-tag-frac`` values (``adi.py --sweep``).
+
+Tag incidence, source links and slug mentions are built once. The grid is then
+evaluated as reductions over per-tag statistics instead of one graph per
+setting:
+
+- ignoring tags with ``frequency / N >= f`` keeps exactly the tags below a
+  frequency cutoff, so tags are processed once in ascending frequency and every
+  ``f`` is a prefix;
+- the weighted degree total of a prefix is ``sum(pairs(t) * w_gamma(t))`` with
+  ``w_gamma(t) = 1 / log2(1 + freq(t)) ** gamma``, one prefix sum per gamma;
+- distinct edges and isolates do not depend on gamma; they are snapshotted at
+  each cutoff while the tag pairs are added to one growing edge set.
+
+Every grid point equals the corresponding ``adi.py --weighted`` run.
+"""
+
+from __future__ import annotations
+
+import math
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import combinations
+from typing import Sequence
+
+from adi_sample import mention_links
+
+
+@dataclass(frozen=True)
+class SweepRow:
+    ignore_tag_frac: float | None
+    idf_gamma: float
+    nodes: int
+    edges: int
+    isolated: int
+    weighted_edges: float
+
+    @property
+    def average_degree(self) -> float:
+        return 2 * self.edges / self.nodes if self.nodes else 0.0
+
+    @property
+    def adi(self) -> float:
+        return math.inf if self.edges == 0 else self.nodes / self.average_degree
+
+    @property
+    def weighted_average_degree(self) -> float:
+        return 2 * self.weighted_edges / self.nodes if self.nodes else 0.0
+
+    @property
+    def weighted_adi(self) -> float:
+        return math.inf if self.weighted_edges <= 0 else self.nodes / self.weighted_average_degree
+
+
+def sweep(
+    entries: Sequence,  # adi.Entry
+    gammas: Sequence[float],
+    fracs: Sequence[float | None],
+    include_slug_links: bool,
+    include_source_links: bool,
+    tag_reference_counts: dict[str, int] | None,
+) -> list[SweepRow]:
+    """Return one row per (ignore fraction, gamma), fractions outermost; None means no filter."""
+    total = len(entries)
+    edges: set[tuple[int, int]] = set()
+    covered: set[int] = set()
+    base_weighted = 0.0
+
+    def add_pairs(members: list[int]) -> None:
+        edges.update(combinations(members, 2))
+        covered.update(members)
+
+    if include_source_links:
+        source_index: defaultdict[str, list[int]] = defaultdict(list)
+        for node, entry in enumerate(entries):
+            for source in entry.sources:
+                source_index[source].append(node)
+        for members in source_index.values():
+            if len(members) >= 2:
+                add_pairs(members)
+                base_weighted += len(members) * (len(members) - 1) / 2
+    if include_slug_links:
+        for node, linked in enumerate(mention_links(entries)):
+            for other in linked:
+                if node < other:
+                    edges.add((node, other))
+                    covered.update((node, other))
+                    base_weighted += 1.0
+
+    tag_index: defaultdict[str, list[int]] = defaultdict(list)
+    for node, entry in enumerate(entries):
+        for tag in entry.tags:
+            tag_index[tag].append(node)
+    # (references, members) in ascending frequency: each fraction keeps a prefix.
+    tags = []
+    for tag, members in tag_index.items():
+        references = len(members)
+        if tag_reference_counts is not None and tag in tag_reference_counts:
+            references = max(references, tag_reference_counts[tag])
+        tags.append((references, members))
+    tags.sort(key=lambda item: item[0])
+    shares = [references / total for references, _ in tags]
+
+    # Prefix length kept by each fraction: tags with references / N < f.
+    cutoffs = {frac: len(tags) if frac is None else bisect_left(shares, frac) for frac in fracs}
+    snapshots: dict[int, tuple[int, int]] = {}
+    wanted = sorted(set(cutoffs.values()))
+    position = 0
+    for cutoff in wanted:
+        for _, members in tags[position:cutoff]:
+            if len(members) >= 2:
+                add_pairs(members)
+        position = cutoff
+        snapshots[cutoff] = (len(edges), total - len(covered))
+
+    # One prefix sum of pair-weighted tag contributions per gamma.
+    pair_counts = [len(members) * (len(members) - 1) / 2 for _, members in tags]
+    logs = [math.log2(1 + references) for references, _ in tags]
+    prefix: dict[float, list[float]] = {}
+    for gamma in gammas:
+        running = [0.0]
+        for pairs, log in zip(pair_counts, logs):
+            running.append(running[-1] + (pairs / log**gamma if pairs else 0.0))
+        prefix[gamma] = running
+
+    rows: list[SweepRow] = []
+    for frac in fracs:
+        cutoff = cutoffs[frac]
+        edge_count, isolated = snapshots[cutoff]
+        for gamma in gammas:
+            rows.append(
+                SweepRow(
+                    ignore_tag_frac=frac,
+                    idf_gamma=gamma,
+                    nodes=total,
+                    edges=edge_count,
+                    isolated=isolated,
+                    weighted_edges=base_weighted + prefix[gamma][cutoff],
+                )
+            )
+    return rows
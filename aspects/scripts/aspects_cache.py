@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Shared on-disk cache helpers for the aspects scripts.
+
+Derived data (graphs, indexes, rendered results) is stored next to the knowledge
+base in ``aspects/projects/<project>/.aspects-cache/`` and is keyed by content
+fingerprints of the inputs, so a cache entry is silently ignored as soon as
+ASPECTS.json or the tag catalog changes. Deleting the directory is always safe.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+CACHE_DIRNAME = ".aspects-cache"
+CACHE_FORMAT = 1
+
+
+def cache_dir(aspects_path: Path) -> Path:
+    return aspects_path.resolve().parent / CACHE_DIRNAME
+
+
+def file_fingerprint(path: Path | None) -> str:
+    """Return the sha256 of a file's content ("-" for no file, "missing" if absent)."""
+    if path is None:
+        return "-"
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as stream:
+            for chunk in iter(lambda: stream.read(1 << 20), b""):
+                digest.update(chunk)
+    except FileNotFoundError:
+        return "missing"
+    return digest.hexdigest()
+
+
+def cache_key(*parts: Any) -> str:
+    raw = json.dumps([CACHE_FORMAT, *parts], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Write bytes via a temporary file + rename so readers never see partial files."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as stream:
+            stream.write(data)
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+def load_json_cache(path: Path, key: str) -> Any | None:
+    """Return the cached payload stored under ``key`` or None when absent/stale."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    return data.get("payload")
+
+
+def store_json_cache(path: Path, key: str, payload: Any) -> None:
+    """Persist ``payload`` under ``key``; cache write failures are never fatal."""
+    body = json.dumps({"key": key, "payload": payload}, ensure_ascii=False, separators=(",", ":"))
+    try:
+        write_atomic(path, body.encode("utf-8"))
+    except OSError:
+        pass
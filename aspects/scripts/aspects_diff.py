@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Entry-level diff between two ASPECTS.json versions.
+
+Entries are aligned by ``id`` (falling back to the slug for entries without one).
+Each entry is hashed in canonical form (sorted keys, compact separators) together
+with its section, so unchanged entries are skipped after a single dictionary
+lookup and only the changed ones are compared field by field.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+CHANGE_ORDER = ("moved", "slug", "text", "retagged", "importance", "sources", "other")
+TEXT_FIELDS = ("name", "description")
+KNOWN_FIELDS = {"id", "sectionId", "slug", "tags", "importance", "sources", *TEXT_FIELDS}
+
+
+@dataclass
+class EntryChange:
+    kind: str  # "added", "removed" or "changed"
+    entry_id: str
+    slug: str
+    old_section: Optional[str] = None
+    new_section: Optional[str] = None
+    changes: Dict[str, Any] = field(default_factory=dict)
+
+    def to_json(self) -> Dict[str, Any]:
+        payload: Dict[str, Any] = {"kind": self.kind, "id": self.entry_id, "slug": self.slug}
+        if self.old_section is not None:
+            payload["oldSection"] = self.old_section
+        if self.new_section is not None:
+            payload["newSection"] = self.new_section
+        if self.changes:
+            payload["changes"] = self.changes
+        return payload
+
+
+def canonical_hash(value: Any) -> str:
+    raw = json.dumps(value, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def entry_key(entry: Dict[str, Any]) -> str:
+    return entry.get("id") or f"slug:{entry.get('slug', '')}"
+
+
+def iter_entries(data: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for section in data.get("sections", []):
+        for entry in section.get("entries", []):
+            yield section.get("slug", section.get("id", "")), entry
+
+
+def _index(data: Dict[str, Any]) -> Dict[str, Tuple[str, Dict[str, Any], str]]:
+    index: Dict[str, Tuple[str, Dict[str, Any], str]] = {}
+    for section, entry in iter_entries(data):
+        index[entry_key(entry)] = (section, entry, canonical_hash([section, entry]))
+    return index
+
+
+def _sources(entry: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    return {
+        source["path"]: source.get("sha256")
+        for source in entry.get("sources", [])
+        if isinstance(source, dict) and isinstance(source.get("path"), str)
+    }
+
+
+def compare_entries(old_section: str, old: Dict[str, Any], new_section: str, new: Dict[str, Any]) -> Dict[str, Any]:
+    """Return the per-category changes between two versions of one entry."""
+    changes: Dict[str, Any] = {}
+    if old_section != new_section:
+        changes["moved"] = {"from": old_section, "to": new_section}
+    if old.get("slug") != new.get("slug"):
+        changes["slug"] = {"from": old.get("slug"), "to": new.get("slug")}
+    text = [name for name in TEXT_FIELDS if old.get(name) != new.get(name)]
+    if text:
+        changes["text"] = text
+
+    old_tags, new_tags = old.get("tags", []), new.get("tags", [])
+    if old_tags != new_tags:
+        added = [tag for tag in new_tags if tag not in old_tags]
+        removed = [tag for tag in old_tags if tag not in new_tags]
+        changes["retagged"] = {"added": added, "removed": removed} if added or removed else {"reordered": True}
+
+    if old.get("importance") != new.get("importance"):
+        changes["importance"] = {"from": old.get("importance"), "to": new.get("importance")}
+
+    old_sources, new_sources = _sources(old), _sources(new)
+    if old.get("sources", []) != new.get("sources", []):
+        changes["sources"] = {
+            "added": [path for path in new_sources if path not in old_sources],
+            "removed": [path for path in old_sources if path not in new_sources],
+            "rehashed": [
+                path for path, digest in new_sources.items() if path in old_sources and old_sources[path] != digest
+            ],
+        }
+
+    other = sorted(
+        name
+        for name in set(old) | set(new)
+        if name not in KNOWN_FIELDS and old.get(name) != new.get(name)
+    )
+    if other:
+        changes["other"] = other
+    return {name: changes[name] for name in CHANGE_ORDER if name in changes}
+
+
+def diff_aspects(old_data: Dict[str, Any], new_data: Dict[str, Any]) -> List[EntryChange]:
+    """Return added, removed and changed entries in the order of the new file (removals last)."""
+    old_index = _index(old_data)
+    result: List[EntryChange] = []
+    seen: set[str] = set()
+    for key, (section, entry, digest) in _index(new_data).items():
+        seen.add(key)
+        previous = old_index.get(key)
+        if previous is None:
+            result.append(EntryChange("added", key, entry.get("slug", ""), new_section=section))
+            continue
+        old_section, old_entry, old_digest = previous
+        if old_digest == digest:
+            continue
+        changes = compare_entries(old_section, old_entry, section, entry)
+        if changes:
+            result.append(EntryChange("changed", key, entry.get("slug", ""), old_section, section, changes))
+    for key, (section, entry, _) in old_index.items():
+        if key not in seen:
+            result.append(EntryChange("removed", key, entry.get("slug", ""), old_section=section))
+    return result
+
+
+def changed_slugs(changes: List[EntryChange], *categories: str) -> set[str]:
+    """Slugs of added entries plus changed entries touching any of ``categories`` (all if none)."""
+    return {
+        change.slug
+        for change in changes
+        if change.kind == "added"
+        or (change.kind == "changed" and (not categories or any(name in change.changes for name in categories)))
+    }
+
+
+def format_change(change: EntryChange) -> str:
+    if change.kind == "added":
+        return f"+ {change.new_section}/{change.slug}"
+    if change.kind == "removed":
+        return f"- {change.old_section}/{change.slug}"
+    parts: List[str] = []
+    for name, detail in change.changes.items():
+        if name == "moved":
+            parts.append(f"moved {detail['from']} -> {detail['to']}")
+        elif name == "slug":
+            parts.append(f"slug {detail['from']} -> {detail['to']}")
+        elif name == "text":
+            parts.append(f"text ({', '.join(detail)})")
+        elif name == "retagged":
+            if detail.get("reordered"):
+                parts.append("tags reordered")
+            else:
+                tags = [f"+{tag}" for tag in detail["added"]] + [f"-{tag}" for tag in detail["removed"]]
+                parts.append(f"tags {' '.join(tags)}")
+        elif name == "importance":
+            parts.append(f"importance {detail['from']} -> {detail['to']}")
+        elif name == "sources":
+            counts = [f"{label} {len(detail[label])}" for label in ("added", "removed", "rehashed") if detail[label]]
+            parts.append(f"sources ({', '.join(counts) or 'reordered'})")
+        else:
+            parts.append(f"other ({', '.join(detail)})")
+    return f"~ {change.new_section}/{change.slug}: {'; '.join(parts)}"
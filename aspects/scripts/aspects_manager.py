@@ -4,9 +4,14 @@ Comprehensive CLI for inspecting and modifying ASPECTS.json archives.
 
 Features:
 - list sections and entries
-- show a specific aspect
+- show a specific aspect (parsing only its bytes via a cached offset index)
 - interactively add, update, or delete entries
 - import batches from a JSON payload (superset of merge_aspects_entries.py)
+- report the ADI impact of every edit from an incrementally maintained graph state
+- suggest catalog tags for draft entries (interactive prompts, import, suggest-tags)
+- suggest the closest slugs/names when show/update/delete get an unknown slug
+- diff two ASPECTS.json versions entry by entry (text or NDJSON)
+- propose subsections for overloaded sections (split-plan)
 
 All commands operate on the specified ASPECTS.json (defaults to Claude Code).
 """
@@ -16,6 +21,7 @@ from __future__ import annotations
 import argparse
 import io
 import json
+import math
 import os
 import sys
 from collections import defaultdict
@@ -23,6 +29,16 @@ from datetime import date
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+from adi_state import ADISnapshot, ADIState
+from aspects_diff import diff_aspects, format_change
+from aspects_writer import save_aspects
+from entry_offsets import read_entry
+from project_paths import source_root
+from section_split import SectionSplitter, recommend
+from slug_index import SlugIndex
+from source_ranges import has_range, line_anchor, make_range, parse_range_spec
+from tag_suggester import TagSuggester, format_suggestions
+
 
 DEFAULT_ASPECTS = Path("aspects/projects/claude-code/ASPECTS.json")
 
@@ -54,8 +70,9 @@ def load_json(path: Path) -> Dict[str, Any]:
         return json.load(fh)
 
 
-def save_json(path: Path, payload: Dict[str, Any]) -> None:
-    path.write_text(json.dumps(payload, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+def save_json(path: Path, payload: Dict[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+    """Write canonical JSON; ``changed`` (ids/slugs) lets untouched entries be copied verbatim."""
+    save_aspects(path, payload, changed)
 
 
 def prompt(message: str, default: Optional[str] = None, *, required: bool = False) -> str:
@@ -132,6 +149,17 @@ def build_entry_index(data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
     return slug_index
 
 
+def entry_not_found(message: str, args: argparse.Namespace, data: Dict[str, Any]) -> SystemExit:
+    """Build the "not found" exit, listing the closest slugs and names."""
+    candidates = SlugIndex.load(args.aspects_path, data).lookup(args.slug)
+    if not candidates:
+        return SystemExit(message)
+    lines = [message, "Did you mean:"]
+    for slug, name, distance in candidates:
+        lines.append(f"  - {slug} (distance {distance}): {name}")
+    return SystemExit("\n".join(lines))
+
+
 def choose_section(data: Dict[str, Any], current_section: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     sections = data["sections"]
     for idx, section in enumerate(sections, start=1):
@@ -149,8 +177,8 @@ def choose_section(data: Dict[str, Any], current_section: Optional[Dict[str, Any
 
 
 def repo_root(aspects_path: Path) -> Path:
-    # aspects/projects/<project>/ASPECTS.json -> repo root (two parents + aspects/)
-    return aspects_path.parent.parent.parent.parent
+    # aspects/projects/<project>/ASPECTS.json -> repo root, shared with hash_check and friends
+    return source_root(aspects_path)
 
 
 def compute_sha256(file_path: Path) -> str:
@@ -195,21 +223,28 @@ def gather_importance(default: Optional[float]) -> float:
         print("  Importance must be between 0.0 and 1.0.")
 
 
-def gather_sources(base_path: Path, defaults: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
-    sources: List[Dict[str, str]] = []
+def gather_sources(base_path: Path, defaults: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    sources: List[Dict[str, Any]] = []
     existing = {(src["path"], src["sha256"]) for src in defaults or []}
     if defaults:
         print("Existing sources:")
         for src in defaults:
-            print(f"  - {src['path']} ({src['sha256'][:8]}…)")
+            lines = f":{src['lines'][0]}-{src['lines'][1]}" if has_range(src) else ""
+            print(f"  - {src['path']}{lines} ({src['sha256'][:8]}…)")
         if prompt_yes_no("Keep existing sources by default?", default=True):
             sources.extend(defaults)
     idx = 0
     while True:
         idx += 1
-        raw_path = prompt(f"Source #{idx} (relative path, Enter to finish)", required=False)
+        raw_path = prompt(f"Source #{idx} (relative path[:START-END], Enter to finish)", required=False)
         if not raw_path:
             break
+        try:
+            raw_path, line_range = parse_range_spec(raw_path)
+        except ValueError as exc:
+            print(f"  {exc}")
+            idx -= 1
+            continue
         relative = raw_path.replace("\\", "/")
         candidate = (base_path / relative).resolve() if not Path(relative).is_absolute() else Path(relative)
         if not candidate.exists():
@@ -221,7 +256,16 @@ def gather_sources(base_path: Path, defaults: Optional[List[Dict[str, str]]] = N
             print("  Duplicate source skipped.")
             idx -= 1
             continue
-        sources.append({"path": relative, "sha256": sha})
+        source: Dict[str, Any] = {"path": relative, "sha256": sha}
+        if line_range:
+            try:
+                data = candidate.read_bytes()
+                source.update(make_range(data, *line_range, anchor=line_anchor(data, line_range[0])))
+            except ValueError as exc:
+                print(f"  {exc}")
+                idx -= 1
+                continue
+        sources.append(source)
     if not sources:
         print("  Entry requires >=1 source.")
         return gather_sources(base_path, defaults or [])
@@ -281,7 +325,18 @@ def interactive_entry(
         entry.get("description"),
         required=True,
     )
-    entry["tags"] = gather_tags(entry.get("tags"))
+    suggester = TagSuggester.load(aspects_path, data)
+    suggestions = suggester.suggest(f"{entry['name']}\n{entry['description']}")
+    if suggestions:
+        print(f"Suggested tags: {format_suggestions(suggestions)}")
+    while True:
+        entry["tags"] = gather_tags(entry.get("tags") or [tag for tag, _ in suggestions[:3]] or None)
+        unknown = suggester.unknown_tags(entry["tags"])
+        if not unknown:
+            break
+        print(f"  Tags missing from ASPECTS.tags.json: {', '.join(unknown)}")
+        if prompt_yes_no("Keep them anyway (add them to the catalog afterwards)?", default=False):
+            break
 
     entry["importance"] = gather_importance(entry.get("importance"))
     entry["lastUpdated"] = prompt(
@@ -293,45 +348,114 @@ def interactive_entry(
     return entry, section
 
 
+def load_adi_state(args: argparse.Namespace, data: Dict[str, Any]) -> Optional[ADIState]:
+    if args.no_adi:
+        return None
+    return ADIState.load_or_build(
+        args.aspects_path,
+        data,
+        ignore_tag_frac=args.ignore_tag_frac,
+        idf_gamma=args.idf_gamma,
+    )
+
+
+def format_metric(value: float) -> str:
+    return "inf" if math.isinf(value) else f"{value:.2f}"
+
+
+def report_adi_impact(
+    args: argparse.Namespace,
+    state: Optional[ADIState],
+    before: Optional[ADISnapshot],
+    touched_sections: Iterable[str],
+    *,
+    persist: bool = True,
+) -> None:
+    """Print ADI/ADIw deltas after an edit and persist the updated state."""
+    if state is None or before is None:
+        return
+    after = state.snapshot()
+    print(
+        f"ADI impact: ADI {format_metric(before.adi)} -> {format_metric(after.adi)}, "
+        f"ADIw {format_metric(before.weighted_adi)} -> {format_metric(after.weighted_adi)}, "
+        f"isolated {before.isolated} -> {after.isolated}"
+    )
+    touched_sections = sorted(set(touched_sections))
+    for section in touched_sections:
+        old = before.sections.get(section)
+        new = after.sections.get(section)
+        old_view = format_metric(old[1]) if old else "-"
+        new_view = format_metric(new[1]) if new else "-"
+        print(f"  section {section}: ADIw {old_view} -> {new_view}")
+    threshold = args.adi_threshold
+    if before.weighted_adi < threshold <= after.weighted_adi:
+        print(f"!! ADIw crossed threshold {threshold:.2f}")
+    for section in touched_sections:
+        old = before.sections.get(section)
+        new = after.sections.get(section)
+        if new and (old is None or old[1] < threshold) and new[1] >= threshold:
+            print(f"!! Section {section} ADIw crossed threshold {threshold:.2f}")
+    for slug in sorted(state.isolated - before.isolated_slugs):
+        print(f"!! Isolated aspect (no tag/source links): {slug}")
+    if persist:
+        state.store(args.aspects_path)
+
+
 def add_entry(args: argparse.Namespace) -> None:
     data = load_json(args.aspects_path)
     entries_by_slug = build_entry_index(data)
+    adi_state = load_adi_state(args, data)
     entry, section = interactive_entry(data, args.aspects_path)
     ensure_unique(entry, entries_by_slug, allow_same_slug=False)
     section.setdefault("entries", []).append(entry)
-    save_json(args.aspects_path, data)
+    save_json(args.aspects_path, data, changed=[entry["id"], entry["slug"]])
     print(f"Added entry '{entry['slug']}' to section '{section['title']}'.")
+    if adi_state is not None:
+        before = adi_state.snapshot()
+        adi_state.add_entry(entry, section["slug"])
+        report_adi_impact(args, adi_state, before, [section["slug"]])
 
 
 def update_entry(args: argparse.Namespace) -> None:
     data = load_json(args.aspects_path)
     entries_by_slug = build_entry_index(data)
     if args.slug not in entries_by_slug:
-        raise SystemExit(f"Entry with slug '{args.slug}' not found.")
+        raise entry_not_found(f"Entry with slug '{args.slug}' not found.", args, data)
     current = entries_by_slug[args.slug]
     # locate section to replace entry later
     section_map = {section["id"]: section for section in data["sections"]}
     current_section = section_map[current["sectionId"]]
+    adi_state = load_adi_state(args, data)
     entry, new_section = interactive_entry(data, args.aspects_path, existing=current)
     ensure_unique(entry, {slug: val for slug, val in entries_by_slug.items() if slug != args.slug}, allow_same_slug=True)
     # remove old entry
     current_section["entries"] = [e for e in current_section["entries"] if e["slug"] != args.slug]
     new_section.setdefault("entries", []).append(entry)
-    save_json(args.aspects_path, data)
+    save_json(args.aspects_path, data, changed=[current["id"], args.slug, entry["id"], entry["slug"]])
     print(f"Updated entry '{entry['slug']}'.")
+    if adi_state is not None:
+        before = adi_state.snapshot()
+        adi_state.remove(args.slug)
+        adi_state.add_entry(entry, new_section["slug"])
+        report_adi_impact(args, adi_state, before, [current_section["slug"], new_section["slug"]])
 
 
 def delete_entry(args: argparse.Namespace) -> None:
     data = load_json(args.aspects_path)
     entries_by_slug = build_entry_index(data)
     if args.slug not in entries_by_slug:
-        raise SystemExit(f"Entry with slug '{args.slug}' not found.")
+        raise entry_not_found(f"Entry with slug '{args.slug}' not found.", args, data)
     entry = entries_by_slug[args.slug]
     section_map = {section["id"]: section for section in data["sections"]}
     section = section_map[entry["sectionId"]]
+    adi_state = load_adi_state(args, data)
     section["entries"] = [e for e in section["entries"] if e["slug"] != args.slug]
-    save_json(args.aspects_path, data)
+    save_json(args.aspects_path, data, changed=[])
     print(f"Deleted entry '{args.slug}'.")
+    if adi_state is not None:
+        before = adi_state.snapshot()
+        adi_state.remove(args.slug)
+        report_adi_impact(args, adi_state, before, [section["slug"]])
 
 
 def list_entries(args: argparse.Namespace) -> None:
@@ -363,11 +487,10 @@ def list_entries(args: argparse.Namespace) -> None:
 
 
 def show_entry(args: argparse.Namespace) -> None:
-    data = load_json(args.aspects_path)
-    entries = build_entry_index(data)
-    entry = entries.get(args.slug)
+    # The offset sidecar parses only this entry's bytes; the full load is for the error path.
+    entry = read_entry(args.aspects_path, args.slug)
     if not entry:
-        raise SystemExit(f"Entry '{args.slug}' not found.")
+        raise entry_not_found(f"Entry '{args.slug}' not found.", args, load_json(args.aspects_path))
     print(json.dumps(entry, indent=2, ensure_ascii=False))
 
 
@@ -390,6 +513,94 @@ def stats(args: argparse.Namespace) -> None:
         print(f"{section['slug']},{section['title']},{len(entries)},{len(tags)},{marker}")
 
 
+def parse_k_values(text: str) -> List[int]:
+    values: List[int] = []
+    try:
+        for part in text.split(","):
+            low, _, high = part.strip().partition("-")
+            values.extend(range(int(low), int(high or low) + 1))
+    except ValueError:
+        values = []
+    if not values or min(values) < 2:
+        raise SystemExit("--k needs values of at least 2 (e.g. 2-6 or 2,4).")
+    return sorted(set(values))
+
+
+def split_plan(args: argparse.Namespace) -> None:
+    data = load_json(args.aspects_path)
+    k_values = parse_k_values(args.k)
+    if not 0.0 <= args.tag_weight <= 1.0 or args.restarts < 1:
+        raise SystemExit("--tag-weight must be between 0 and 1 and --restarts at least 1.")
+    if args.section:
+        section = index_sections(data).get(args.section)
+        if section is None:
+            raise SystemExit(f"Section '{args.section}' not found.")
+        targets = [section]
+    else:
+        targets = [
+            section
+            for section in data["sections"]
+            if len(section.get("entries", [])) > args.warn_count
+            or len({tag for entry in section.get("entries", []) for tag in entry.get("tags", [])})
+            > args.warn_unique_tags
+        ]
+        if not targets:
+            print(f"No section exceeds {args.warn_count} entries or {args.warn_unique_tags} unique tags.")
+            return
+    state = ADIState.load_or_build(
+        args.aspects_path,
+        data,
+        ignore_tag_frac=args.ignore_tag_frac,
+        idf_gamma=args.idf_gamma,
+    )
+    current = state.snapshot().sections
+    idf = TagSuggester.load(args.aspects_path, data).idf
+    taken = {section["slug"] for section in data["sections"]}
+
+    for section in targets:
+        splitter = SectionSplitter(section, state, idf, tag_weight=args.tag_weight, taken_slugs=taken)
+        size = len(splitter.slugs)
+        tags = len({tag for entry_tags in splitter.tags for tag in entry_tags})
+        section_adiw = current.get(section["slug"], (math.inf, math.inf))[1]
+        print(
+            f"Section {section['slug']} ({section['title']}): {size} entries, {tags} unique tags, "
+            f"ADIw {format_metric(section_adiw)}"
+        )
+        plans = [
+            splitter.plan(
+                k,
+                restarts=args.restarts,
+                seed=args.seed,
+                warn_count=args.warn_count,
+                warn_unique_tags=args.warn_unique_tags,
+                adi_threshold=args.adi_threshold,
+            )
+            for k in k_values
+            if k < size
+        ]
+        if not plans:
+            print(f"  Too few entries to split into {k_values[0]} or more subsections.\n")
+            continue
+        print("  k,sizes,cohesion,warnings,max_ADIw")
+        for plan in plans:
+            sizes = "/".join(str(len(subsection.entries)) for subsection in plan.subsections)
+            print(f"  {plan.k},{sizes},{plan.cohesion:.3f},{plan.warnings},{format_metric(plan.max_weighted_adi)}")
+        chosen = recommend(plans)
+        if args.show_k is not None:
+            chosen = next((plan for plan in plans if plan.k == args.show_k), chosen)
+        print(f"  Proposed split (k={chosen.k}):")
+        for subsection in chosen.subsections:
+            marker = ";".join(subsection.warnings) if subsection.warnings else "-"
+            print(
+                f"  - {subsection.slug} \"{subsection.title}\": {len(subsection.entries)} entries, "
+                f"{subsection.unique_tags} unique tags, ADI {format_metric(subsection.adi)}, "
+                f"ADIw {format_metric(subsection.weighted_adi)}, isolated {subsection.isolated}, {marker}"
+            )
+            print(f"      tags: {', '.join(subsection.tags)}")
+            print(f"      entries: {', '.join(subsection.entries)}")
+        print()
+
+
 def import_entries(args: argparse.Namespace) -> None:
     payload_path = Path(args.payload)
     data = load_json(args.aspects_path)
@@ -434,6 +645,23 @@ def import_entries(args: argparse.Namespace) -> None:
             raise SystemExit(f"Entry with slug '{entry['slug']}' already exists. Use --replace to overwrite.")
         staged[target["id"]].append(entry)
 
+    suggester = TagSuggester.load(args.aspects_path, data)
+    for entries in staged.values():
+        for entry in entries:
+            tags = entry.get("tags") or []
+            unknown = suggester.unknown_tags(tags)
+            if tags and not unknown:
+                continue
+            suggestions = suggester.suggest(
+                f"{entry.get('name', '')}\n{entry.get('description', '')}",
+                exclude=set(tags),
+            )
+            problem = f"tags missing from catalog: {', '.join(unknown)}" if unknown else "no tags"
+            hint = f"; suggested: {format_suggestions(suggestions)}" if suggestions else ""
+            print(f"  ! {entry['slug']}: {problem}{hint}", file=sys.stderr)
+
+    adi_state = load_adi_state(args, data)
+    adi_before = adi_state.snapshot() if adi_state is not None else None
     logs: List[str] = []
     if args.dry_run:
         print("Dry run:")
@@ -450,16 +678,55 @@ def import_entries(args: argparse.Namespace) -> None:
                 logs.append(f"{section['slug']}: replaced {replaced} entries.")
         section["entries"].extend(entries)
         logs.append(f"{section['slug']}: appended {len(entries)} entries.")
+        if adi_state is not None:
+            for entry in entries:
+                adi_state.remove(entry["slug"])
+                adi_state.add_entry(entry, section["slug"])
 
+    touched = [section["slug"] for section in data["sections"] if section["id"] in staged]
     if args.dry_run:
         for log in logs:
             print("  -", log)
+        report_adi_impact(args, adi_state, adi_before, touched, persist=False)
         print("No changes written.")
     else:
-        save_json(args.aspects_path, data)
+        save_json(
+            args.aspects_path,
+            data,
+            changed=[key for entries in staged.values() for entry in entries for key in (entry["id"], entry["slug"])],
+        )
         for log in logs:
             print("  -", log)
         print("Entries merged.")
+        report_adi_impact(args, adi_state, adi_before, touched)
+
+
+def suggest_tags(args: argparse.Namespace) -> None:
+    suggester = TagSuggester.load(args.aspects_path)
+    suggestions = suggester.suggest(args.text, top_k=args.top_k)
+    if not suggestions:
+        print("No suggestions (no known terms in the text).")
+        return
+    for tag, score in suggestions:
+        print(f"{score:.3f}  {tag}")
+
+
+def diff_files(args: argparse.Namespace) -> None:
+    new_path = args.new or args.aspects_path
+    changes = diff_aspects(load_json(args.old), load_json(new_path))
+    if args.ndjson:
+        for change in changes:
+            print(json.dumps(change.to_json(), ensure_ascii=False))
+        return
+    for change in changes:
+        print(format_change(change))
+    counts = defaultdict(int)
+    for change in changes:
+        counts[change.kind] += 1
+    print(
+        f"Entries: {counts['added']} added, {counts['removed']} removed, {counts['changed']} changed "
+        f"({args.old} -> {new_path})"
+    )
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -473,6 +740,29 @@ def build_parser() -> argparse.ArgumentParser:
         default=DEFAULT_ASPECTS,
         help=f"Path to ASPECTS.json (default: {DEFAULT_ASPECTS}).",
     )
+    parser.add_argument(
+        "--adi-threshold",
+        type=float,
+        default=5.0,
+        help="Warn when an edit pushes overall or section ADIw to this value or above (default: 5.0).",
+    )
+    parser.add_argument(
+        "--ignore-tag-frac",
+        type=float,
+        default=0.15,
+        help="Ignore hub tags used by at least this fraction of entries in the ADI impact report (default: 0.15).",
+    )
+    parser.add_argument(
+        "--idf-gamma",
+        type=float,
+        default=1.0,
+        help="Exponent for tag weights 1/log2(1+freq)^gamma in the ADI impact report (default: 1.0).",
+    )
+    parser.add_argument(
+        "--no-adi",
+        action="store_true",
+        help="Skip the ADI impact report after edits.",
+    )
     subparsers = parser.add_subparsers(dest="command")
     subparsers.required = True  # type: ignore[attr-defined]
 
@@ -491,6 +781,19 @@ def build_parser() -> argparse.ArgumentParser:
     stats_parser.add_argument("--warn-count", type=int, default=25, help="Warn if entries in section exceed this number (default: 25).")
     stats_parser.add_argument("--warn-unique-tags", type=int, default=10, help="Warn if unique tags in section exceed this number (default: 10).")
 
+    split_parser = subparsers.add_parser(
+        "split-plan",
+        help="Propose subsections for an overloaded section (k-means over tags and text).",
+    )
+    split_parser.add_argument("section", nargs="?", help="Section slug or id (default: every section over the warning thresholds).")
+    split_parser.add_argument("--k", default="2-5", help="Subsection counts to evaluate, e.g. 3, 2-6 or 2,4 (default: 2-5).")
+    split_parser.add_argument("--tag-weight", type=float, default=0.6, help="Share of tag similarity vs name/description TF-IDF (default: 0.6).")
+    split_parser.add_argument("--restarts", type=int, default=10, help="k-means restarts per k; the most cohesive run wins (default: 10).")
+    split_parser.add_argument("--seed", type=int, default=0, help="Random seed for k-means (default: 0).")
+    split_parser.add_argument("--show-k", type=int, help="Print the subsections for this k instead of the recommended one.")
+    split_parser.add_argument("--warn-count", type=int, default=25, help="Warn if a subsection exceeds this many entries (default: 25).")
+    split_parser.add_argument("--warn-unique-tags", type=int, default=10, help="Warn if a subsection exceeds this many unique tags (default: 10).")
+
     subparsers.add_parser("add", help="Interactively add a new entry.")
 
     update_parser = subparsers.add_parser("update", help="Interactively update an existing entry.")
@@ -499,12 +802,21 @@ def build_parser() -> argparse.ArgumentParser:
     delete_parser = subparsers.add_parser("delete", help="Delete an entry by slug.")
     delete_parser.add_argument("slug")
 
+    suggest_parser = subparsers.add_parser("suggest-tags", help="Rank catalog tags for a draft name/description.")
+    suggest_parser.add_argument("text", help="Draft name and/or description text (quote it).")
+    suggest_parser.add_argument("--top-k", type=int, default=8, help="Number of tags to print (default: 8).")
+
     import_parser = subparsers.add_parser("import", help="Import entries from a JSON payload.")
     import_parser.add_argument("payload", help="Path to JSON payload (array or {\"entries\": [...]})")
     import_parser.add_argument("--replace", action="store_true", help="Overwrite entries with matching slug/id.")
     import_parser.add_argument("--dry-run", action="store_true", help="Print actions without writing to disk.")
     import_parser.add_argument("--set-last-updated", type=str, help="Override lastUpdated for entries missing the field.")
 
+    diff_parser = subparsers.add_parser("diff", help="Compare two ASPECTS.json versions entry by entry.")
+    diff_parser.add_argument("old", type=Path, help="Older ASPECTS.json (e.g. from `git show HEAD:<path>`).")
+    diff_parser.add_argument("new", type=Path, nargs="?", help="Newer ASPECTS.json (default: --aspects-path).")
+    diff_parser.add_argument("--ndjson", action="store_true", help="Print one JSON object per changed entry.")
+
     return parser
 
 
@@ -518,6 +830,9 @@ def main() -> None:
         else:
             parser.error(f"Unexpected extra arguments: {' '.join(remainder)}")
 
+    if args.command == "diff" and args.new is not None:
+        diff_files(args)
+        return
     if not args.aspects_path.exists():
         raise SystemExit(f"ASPECTS file not found: {args.aspects_path}")
 
@@ -530,6 +845,8 @@ def main() -> None:
         show_entry(args)
     elif command == "stats":
         stats(args)
+    elif command == "split-plan":
+        split_plan(args)
     elif command == "add":
         add_entry(args)
     elif command == "update":
@@ -538,6 +855,10 @@ def main() -> None:
         delete_entry(args)
     elif command == "import":
         import_entries(args)
+    elif command == "suggest-tags":
+        suggest_tags(args)
+    elif command == "diff":
+        diff_files(args)
     else:
         parser.print_help()
 
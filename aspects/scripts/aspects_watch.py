@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""Watch a project and revalidate it incrementally while it is being edited.
+
+The watcher polls ``os.stat`` signatures (mtime, size, inode) of ASPECTS.json,
+ASPECTS.tags.json and every cited source file; nothing is hashed while polling.
+A change only reruns the checks that depend on the changed file:
+
+- ASPECTS.json: structural audit, tag catalog check (plus ``sync-counts`` when
+  enabled), and the ADI state, which is updated entry by entry from
+  ``aspects_diff``;
+- ASPECTS.tags.json: tag catalog check only;
+- a source file: re-hash of that file against the entries that cite it.
+
+Issues are kept as a set of ``(level, message)`` pairs and only the difference
+to the previous run is printed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from adi_state import ADIState
+from aspects_diff import diff_aspects, iter_entries
+from audit import collect_issues
+from project_paths import source_root as project_source_root
+from tags_manager import count_tags, sync_catalog
+
+Issue = Tuple[str, str]
+Signature = Optional[Tuple[int, int, int]]
+# Entry changes that move ADI edges; text-only edits leave the state untouched.
+ADI_CHANGES = {"moved", "slug", "retagged", "sources"}
+
+
+def stat_signature(path: Path) -> Signature:
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    return info.st_mtime_ns, info.st_size, info.st_ino
+
+
+def sha256_file(path: Path) -> Optional[str]:
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as stream:
+            for chunk in iter(lambda: stream.read(131072), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class WatchModel:
+    """Warm in-memory copy of a project and the issues derived from it."""
+
+    def __init__(
+        self,
+        aspects_path: Path,
+        adi_threshold: float = 5.0,
+        ignore_tag_frac: float = 0.15,
+        sync_counts: bool = False,
+        source_root: Optional[Path] = None,
+    ) -> None:
+        self.aspects_path = aspects_path.resolve()
+        self.tags_path = self.aspects_path.with_name("ASPECTS.tags.json")
+        self.source_root = (source_root or project_source_root(self.aspects_path)).resolve()
+        self.adi_threshold = adi_threshold
+        self.sync_counts = sync_counts
+        self.data: Dict[str, Any] = json.loads(self.aspects_path.read_text(encoding="utf-8"))
+        self.adi = ADIState.from_data(self.data, ignore_tag_frac=ignore_tag_frac)
+        self.citations: Dict[str, Dict[str, Optional[str]]] = {}
+        self.actual_hash: Dict[str, Optional[str]] = {}
+        self.structure: Set[Issue] = set()
+        self.catalog: Set[Issue] = set()
+        self.parse: Set[Issue] = set()
+        self.signatures: Dict[Path, Signature] = {}
+        self._reindex_sources()
+        self._check_structure()
+        self._check_catalog()
+        self.signatures = {path: stat_signature(path) for path in self.watched_paths()}
+
+    # Checks ------------------------------------------------------------------
+    def _reindex_sources(self) -> None:
+        citations: Dict[str, Dict[str, Optional[str]]] = defaultdict(dict)
+        for section in self.data.get("sections", []):
+            for entry in section.get("entries", []):
+                for source in entry.get("sources", []):
+                    if isinstance(source, dict) and isinstance(source.get("path"), str):
+                        citations[source["path"]][entry.get("slug", "?")] = source.get("sha256")
+        for path in set(self.actual_hash) - set(citations):
+            del self.actual_hash[path]
+        self.citations = dict(citations)
+
+    def _check_structure(self) -> None:
+        try:
+            errors, warnings = collect_issues(self.data)
+        except (KeyError, TypeError, AttributeError) as exc:
+            errors, warnings = [f"malformed ASPECTS.json: {exc!r}"], []
+        self.structure = {("error", item) for item in errors} | {("warning", item) for item in warnings}
+
+    def _check_catalog(self) -> None:
+        self.catalog = set()
+        if not self.tags_path.exists():
+            return
+        counts = count_tags(self.data)
+        if self.sync_counts:
+            sync_catalog(self.tags_path, self.aspects_path, counts, dry_run=False, quiet=True)
+        try:
+            catalog = json.loads(self.tags_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            self.catalog = {("error", f"unreadable tag catalog: {exc}")}
+            return
+        known = {item.get("tag") for item in catalog.get("tags", []) if isinstance(item, dict)}
+        self.catalog = {("warning", f"tag missing from catalog: {tag}") for tag in counts if tag not in known}
+
+    def source_issues(self) -> Set[Issue]:
+        issues: Set[Issue] = set()
+        for path, cited_by in self.citations.items():
+            if self.signatures.get(self.source_root / path, 0) is None:
+                issues.add(("warning", f"missing source {path}"))
+                continue
+            actual = self.actual_hash.get(path)
+            if actual is None:
+                continue
+            stale = sorted(slug for slug, expected in cited_by.items() if expected and expected != actual)
+            if stale:
+                issues.add(("error", f"sha256 mismatch {path} ({', '.join(stale)})"))
+        return issues
+
+    def adi_issues(self) -> Set[Issue]:
+        snapshot = self.adi.snapshot()
+        issues: Set[Issue] = {("warning", f"isolated aspect {slug}") for slug in snapshot.isolated_slugs}
+        if snapshot.weighted_adi >= self.adi_threshold:
+            issues.add(("warning", f"ADIw >= {self.adi_threshold:g}"))
+        for section, (_, weighted) in snapshot.sections.items():
+            if weighted >= self.adi_threshold:
+                issues.add(("warning", f"section {section} ADIw >= {self.adi_threshold:g}"))
+        return issues
+
+    def issues(self) -> Set[Issue]:
+        return self.parse | self.structure | self.catalog | self.adi_issues() | self.source_issues()
+
+    def status(self) -> str:
+        snapshot = self.adi.snapshot()
+        return (
+            f"entries={snapshot.nodes} adi={snapshot.adi:.2f} adiw={snapshot.weighted_adi:.2f} "
+            f"isolated={snapshot.isolated} sources={len(self.citations)}"
+        )
+
+    # Change handling ---------------------------------------------------------
+    def watched_paths(self) -> List[Path]:
+        return [self.aspects_path, self.tags_path, *(self.source_root / path for path in self.citations)]
+
+    def _update_adi(self, new_data: Dict[str, Any]) -> None:
+        changes = [
+            change
+            for change in diff_aspects(self.data, new_data)
+            if change.kind != "changed" or ADI_CHANGES.intersection(change.changes)
+        ]
+        if not changes:
+            return
+        entries = {entry.get("slug"): entry for _, entry in iter_entries(new_data)}
+        for change in changes:
+            if change.kind != "added":
+                self.adi.remove(change.changes.get("slug", {}).get("from", change.slug))
+        for change in changes:
+            if change.kind != "removed":
+                self.adi.add_entry(entries[change.slug], change.new_section or "")
+
+    def reload_aspects(self) -> None:
+        try:
+            new_data = json.loads(self.aspects_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            # Usually a half-written file; keep the last good model until the next change.
+            self.parse = {("error", f"ASPECTS.json unreadable: {exc}")}
+            return
+        self.parse = set()
+        try:
+            self._update_adi(new_data)
+        except (KeyError, ValueError):
+            self.adi = ADIState.from_data(new_data, ignore_tag_frac=self.adi.ignore_tag_frac)
+        old_expected = self.citations
+        self.data = new_data
+        self._reindex_sources()
+        for path, cited_by in self.citations.items():
+            if path in self.actual_hash and cited_by != old_expected.get(path):
+                self.actual_hash[path] = sha256_file(self.source_root / path)
+        self._check_structure()
+        self._check_catalog()
+
+    def poll(self) -> List[Path]:
+        """Return changed paths and apply their checks; signatures are refreshed afterwards."""
+        changed = [path for path in self.watched_paths() if stat_signature(path) != self.signatures.get(path)]
+        if not changed:
+            return []
+        if self.aspects_path in changed:
+            self.reload_aspects()
+        elif self.tags_path in changed:
+            self._check_catalog()
+        for path in changed:
+            if path in (self.aspects_path, self.tags_path):
+                continue
+            relative = path.relative_to(self.source_root).as_posix()
+            if relative in self.citations:
+                self.actual_hash[relative] = sha256_file(path)
+        # sync-counts may have rewritten the catalog; take its signature now.
+        self.signatures = {path: stat_signature(path) for path in self.watched_paths()}
+        return changed
+
+
+def format_delta(added: Iterable[Issue], resolved: Iterable[Issue]) -> List[str]:
+    lines = [f"  + {level}: {message}" for level, message in sorted(added)]
+    lines.extend(f"  - {level}: {message}" for level, message in sorted(resolved))
+    return lines
+
+
+def watch(model: WatchModel, interval: float = 1.0, stream: Any = None) -> None:
+    """Poll until interrupted, printing new (+) and resolved (-) issues after each change."""
+    stream = stream or sys.stdout
+    current = model.issues()
+    errors = sum(1 for level, _ in current if level == "error")
+    print(
+        f"\nWatching {len(model.signatures)} files every {interval:g}s "
+        f"({errors} errors, {len(current) - errors} warnings; {model.status()}). Ctrl+C to stop.",
+        file=stream,
+        flush=True,
+    )
+    while True:
+        time.sleep(interval)
+        changed = model.poll()
+        if not changed:
+            continue
+        updated = model.issues()
+        added, resolved = updated - current, current - updated
+        current = updated
+        names = ", ".join(sorted({path.name for path in changed})[:3])
+        if len(changed) > 3:
+            names += f" (+{len(changed) - 3} more)"
+        print(
+            f"[{time.strftime('%H:%M:%S')}] {names}: +{len(added)} / -{len(resolved)} issues; {model.status()}",
+            file=stream,
+        )
+        for line in format_delta(added, resolved):
+            print(line, file=stream)
+        stream.flush()
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Canonical ASPECTS.json writer that re-encodes only changed entries.
+
+The output is byte-for-byte what ``json.dumps(payload, indent=2,
+ensure_ascii=False) + "\\n"`` produces in text mode (see
+``entry_offsets.canonical_bytes``), but the document is emitted piece by piece:
+section fields are encoded directly, and every entry whose parsed original span
+has the same keys, key order, types and values is copied verbatim from the
+current file instead of being re-encoded. Callers that know what they touched
+pass ``changed`` (ids/slugs); every other entry is then copied without even being
+parsed. Reuse requires an up-to-date offset sidecar for a file that is already
+canonical; otherwise every entry is encoded.
+
+Because the writer knows where each piece lands, it also stores the offset
+sidecar for the new file, so the next ``show`` or save starts warm.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from aspects_cache import write_atomic
+from entry_offsets import EntryOffsets, canonical_bytes
+
+NEWLINE = os.linesep.encode("ascii")
+
+
+def same_layout(left: Any, right: Any) -> bool:
+    """True when both values encode to identical JSON text (order- and type-sensitive)."""
+    if type(left) is not type(right):
+        return False
+    if isinstance(left, dict):
+        return list(left) == list(right) and all(same_layout(left[key], right[key]) for key in left)
+    if isinstance(left, list):
+        return len(left) == len(right) and all(map(same_layout, left, right))
+    return left == right
+
+
+def _encode(value: Any, level: int) -> bytes:
+    text = json.dumps(value, indent=2, ensure_ascii=False).encode("utf-8")
+    return text.replace(b"\n", NEWLINE + b"  " * level)
+
+
+class _Reuse:
+    """Original entry spans of a canonical file, looked up by id or slug."""
+
+    def __init__(self, raw: bytes, index: EntryOffsets, changed: Optional[Set[str]]) -> None:
+        self.raw = raw
+        self.index = index
+        self.changed = changed
+        self.used: Set[int] = set()
+
+    def bytes_for(self, entry: Dict[str, Any]) -> Optional[bytes]:
+        keys = [entry[name] for name in ("id", "slug") if isinstance(entry.get(name), str)]
+        if not keys:
+            return None
+        span = self.index.entries.get(keys[0])
+        if span is None or span[1] in self.used:
+            return None
+        chunk = self.raw[span[1] : span[2]]
+        if self.changed is not None:
+            if self.changed.intersection(keys):
+                return None
+        else:
+            try:
+                original = json.loads(chunk)
+            except ValueError:
+                return None
+            if original != entry or not same_layout(entry, original):
+                return None
+        self.used.add(span[1])
+        return chunk
+
+
+def render_aspects(
+    payload: Dict[str, Any],
+    raw: Optional[bytes] = None,
+    index: Optional[EntryOffsets] = None,
+    changed: Optional[Set[str]] = None,
+) -> Tuple[bytes, Optional[Tuple[List[List[Any]], Dict[str, List[int]]]], int]:
+    """Return (canonical bytes, (sections, entries) spans or None, reused entry count).
+
+    ``changed`` lists the ids/slugs of entries edited since ``raw`` was written;
+    None means unknown, in which case every reused entry is verified first.
+    """
+    sections = payload.get("sections") if isinstance(payload, dict) else None
+    if (
+        not isinstance(sections, list)
+        or list(payload) != ["sections"]
+        or not sections
+        or not all(isinstance(section, dict) and section for section in sections)
+    ):
+        return canonical_bytes(payload), None, 0
+
+    reuse = _Reuse(raw, index, changed) if raw is not None and index is not None and index.canonical else None
+    reused = 0
+    section_spans: List[List[Any]] = []
+    entry_spans: Dict[str, List[int]] = {}
+    out = bytearray(b"{" + NEWLINE + b'  "sections": [' + NEWLINE)
+    for section_idx, section in enumerate(sections):
+        if section_idx:
+            out += b"," + NEWLINE
+        out += b"    "
+        section_start = len(out)
+        out += b"{" + NEWLINE
+        for key_idx, (key, value) in enumerate(section.items()):
+            if key_idx:
+                out += b"," + NEWLINE
+            out += b"      " + json.dumps(key, ensure_ascii=False).encode("utf-8") + b": "
+            if key != "entries" or not isinstance(value, list) or not value:
+                out += _encode(value, 3)
+                continue
+            out += b"[" + NEWLINE
+            for entry_idx, entry in enumerate(value):
+                if entry_idx:
+                    out += b"," + NEWLINE
+                out += b"        "
+                start = len(out)
+                chunk = reuse.bytes_for(entry) if reuse is not None and isinstance(entry, dict) else None
+                if chunk is None:
+                    chunk = _encode(entry, 4)
+                else:
+                    reused += 1
+                out += chunk
+                if isinstance(entry, dict):
+                    for name in ("id", "slug"):
+                        if isinstance(entry.get(name), str):
+                            entry_spans.setdefault(entry[name], [section_idx, start, len(out)])
+            out += NEWLINE + b"      ]"
+        out += NEWLINE + b"    }"
+        section_spans.append([section.get("id"), section.get("slug"), section_start, len(out)])
+    out += NEWLINE + b"  ]" + NEWLINE + b"}" + NEWLINE
+    return bytes(out), (section_spans, entry_spans), reused
+
+
+def save_aspects(path: Path, payload: Dict[str, Any], changed: Optional[Iterable[str]] = None) -> None:
+    """Atomically write ``payload`` in canonical layout and refresh the offset sidecar.
+
+    Pass ``changed`` only when ``payload`` was loaded from ``path`` and every other
+    entry is untouched.
+    """
+    index = EntryOffsets.load_cached(path)
+    raw: Optional[bytes] = None
+    if index is not None and index.canonical:
+        try:
+            raw = path.read_bytes()
+        except OSError:
+            raw = None
+    rendered, spans, _ = render_aspects(payload, raw, index, set(changed) if changed is not None else None)
+    if rendered != raw:
+        write_atomic(path, rendered)
+    if spans is not None:
+        EntryOffsets(path, spans[0], spans[1], canonical=True).store()
@@ -3,16 +3,44 @@
 
 This script validates entry identifiers, slugs, section links, duplicated sources and
 reports sections that look under-populated or overloaded so that the curator can
-plan restructuring work ahead of time.
+plan restructuring work ahead of time. With ``--near-duplicates`` it also reports
+entries whose names and descriptions are likely redundant (MinHash + LSH), within
+the audited project and optionally across other projects. ``--watch`` keeps running
+and revalidates incrementally whenever ASPECTS.json, the tag catalog or a cited
+source file changes (see ``aspects_watch.py``).
 """
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
+import math
+import re
 import sys
-from collections import Counter
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from itertools import combinations
 from pathlib import Path
 
+from source_ranges import has_range
+
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+MINHASH_MAX_SIZE = 256
+MINHASH_MAX_ROWS = 8
+MINHASH_RECALL = 0.99
+_HASH_SPACE = 1 << 64
+
+
+@dataclass(frozen=True)
+class ShingledEntry:
+    project: str
+    slug: str
+    shingles: frozenset[int]
+
+    @property
+    def label(self) -> str:
+        return f"{self.project}:{self.slug}"
+
 
 def load_aspects(aspects_path: Path) -> dict:
     try:
@@ -22,6 +50,129 @@ def load_aspects(aspects_path: Path) -> dict:
         raise SystemExit(f"ASPECTS file not found: {aspects_path}") from exc
 
 
+def shingle_hashes(text: str, size: int) -> frozenset[int]:
+    tokens = TOKEN_RE.findall(text.lower())
+    if not tokens:
+        return frozenset()
+    if len(tokens) < size:
+        grams = [tuple(tokens)]
+    else:
+        grams = [tuple(tokens[i : i + size]) for i in range(len(tokens) - size + 1)]
+    return frozenset(
+        int.from_bytes(
+            hashlib.blake2b(" ".join(gram).encode("utf-8"), digest_size=8).digest(),
+            "big",
+        )
+        for gram in grams
+    )
+
+
+def shingle_entries(data: dict, project: str, size: int) -> list[ShingledEntry]:
+    shingled: list[ShingledEntry] = []
+    for section in data.get("sections", []):
+        for entry in section.get("entries", []):
+            text = f"{entry.get('name', '')}\n{entry.get('description', '')}"
+            shingles = shingle_hashes(text, size)
+            if shingles:
+                shingled.append(
+                    ShingledEntry(project=project, slug=entry.get("slug", "?"), shingles=shingles)
+                )
+    return shingled
+
+
+def lsh_parameters(threshold: float) -> tuple[int, int] | None:
+    """Return (bands, rows) for the LSH S-curve that fits ``threshold``, or None.
+
+    A pair with Jaccard similarity ``s`` shares at least one band with probability
+    ``1 - (1 - s**rows)**bands``. The most selective setting (most rows) that still
+    catches pairs at the threshold with probability ``MINHASH_RECALL`` within
+    ``MINHASH_MAX_SIZE`` hashes is used; None means no setting fits (very low
+    thresholds) and candidates must be enumerated exactly.
+    """
+    for rows in range(MINHASH_MAX_ROWS, 0, -1):
+        probability = threshold**rows
+        if probability >= 1.0:
+            return 1, rows
+        bands = math.ceil(math.log(1.0 - MINHASH_RECALL) / math.log(1.0 - probability))
+        if bands * rows <= MINHASH_MAX_SIZE:
+            return bands, rows
+    return None
+
+
+def minhash_signature(shingles: frozenset[int], size: int) -> tuple[int, ...]:
+    """One-permutation MinHash: bin every shingle hash once, keep the minimum per bin.
+
+    Empty bins borrow the value of the next non-empty bin (rotation densification),
+    which keeps the collision probability equal to the Jaccard similarity while
+    hashing each shingle only once instead of once per permutation.
+    """
+    bin_width = _HASH_SPACE // size
+    bins: list[int | None] = [None] * size
+    for value in shingles:
+        index, offset = divmod(value, bin_width)
+        if index >= size:
+            index, offset = size - 1, offset + bin_width
+        current = bins[index]
+        if current is None or offset < current:
+            bins[index] = offset
+    signature: list[int] = []
+    for index in range(size):
+        step = 0
+        value = bins[index]
+        while value is None:
+            step += 1
+            value = bins[(index + step) % size]
+        signature.append(value + step * bin_width)
+    return tuple(signature)
+
+
+def find_near_duplicates(
+    entries: list[ShingledEntry],
+    threshold: float,
+) -> list[tuple[float, ShingledEntry, ShingledEntry]]:
+    """Return entry pairs whose shingle Jaccard similarity is >= threshold.
+
+    Candidate pairs come from LSH buckets over MinHash bands sized for the
+    threshold (see ``lsh_parameters``), so only entries that agree on at least one
+    band are compared; candidates are then confirmed with the exact Jaccard
+    similarity of their shingle sets. Below the reach of the LSH curve every pair
+    sharing a shingle is a candidate, which is exact.
+    """
+    buckets: defaultdict[tuple[int, tuple[int, ...]], list[int]] = defaultdict(list)
+    parameters = lsh_parameters(threshold)
+    if parameters is None:
+        for idx, item in enumerate(entries):
+            for value in item.shingles:
+                buckets[(0, (value,))].append(idx)
+    else:
+        bands, rows = parameters
+        for idx, item in enumerate(entries):
+            signature = minhash_signature(item.shingles, bands * rows)
+            for band in range(bands):
+                start = band * rows
+                buckets[(band, signature[start : start + rows])].append(idx)
+
+    candidates: set[tuple[int, int]] = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        candidates.update(combinations(members, 2))
+
+    pairs: list[tuple[float, ShingledEntry, ShingledEntry]] = []
+    for a, b in candidates:
+        left, right = entries[a], entries[b]
+        union = len(left.shingles | right.shingles)
+        similarity = len(left.shingles & right.shingles) / union if union else 0.0
+        if similarity >= threshold:
+            pairs.append((similarity, left, right))
+    pairs.sort(key=lambda item: (-item[0], item[1].label, item[2].label))
+    return pairs
+
+
+def project_label(aspects_path: Path) -> str:
+    return aspects_path.parent.name or aspects_path.stem
+
+
 def parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Validate structural consistency of an ASPECTS.json knowledge base.",
@@ -31,29 +182,93 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         type=Path,
         help="Path to the ASPECTS.json file to audit.",
     )
-    return parser.parse_args(argv)
-
-
-def main(argv: list[str]) -> int:
-    args = parse_args(argv)
-    aspects_path = args.aspects_path
-    if not aspects_path.is_absolute():
-        aspects_path = aspects_path.resolve()
+    parser.add_argument(
+        "--near-duplicates",
+        action="store_true",
+        help="Report entries with near-identical names/descriptions (MinHash + LSH).",
+    )
+    parser.add_argument(
+        "--compare-with",
+        action="append",
+        type=Path,
+        default=[],
+        metavar="ASPECTS_JSON",
+        help="Additional ASPECTS.json to include in --near-duplicates (repeatable).",
+    )
+    parser.add_argument(
+        "--similarity-threshold",
+        type=float,
+        default=0.5,
+        help="Minimum Jaccard similarity reported by --near-duplicates. Default: 0.5",
+    )
+    parser.add_argument(
+        "--shingle-size",
+        type=int,
+        default=3,
+        help="Number of consecutive words per shingle for --near-duplicates. Default: 3",
+    )
+    parser.add_argument(
+        "--duplicate-limit",
+        type=int,
+        default=50,
+        help="Maximum number of near-duplicate pairs to print. Default: 50",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and print new/resolved issues whenever the project or its sources change.",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between stat polls in --watch mode. Default: 1.0",
+    )
+    parser.add_argument(
+        "--adi-threshold",
+        type=float,
+        default=5.0,
+        help="ADIw warning threshold used by --watch. Default: 5.0",
+    )
+    parser.add_argument(
+        "--ignore-tag-frac",
+        type=float,
+        default=0.15,
+        help="Hub-tag cut-off for the ADI check in --watch mode. Default: 0.15",
+    )
+    parser.add_argument(
+        "--sync-counts",
+        action="store_true",
+        help="In --watch mode, also rewrite catalog reference counts (ASPECTS.tags.json) after ASPECTS.json changes.",
+    )
+    parser.add_argument(
+        "--source-root",
+        type=Path,
+        help="Directory cited source paths are relative to in --watch mode. Default: the repository root.",
+    )
+    args = parser.parse_args(argv)
+    if args.poll_interval <= 0:
+        parser.error("--poll-interval must be positive")
+    if not 0.0 < args.similarity_threshold <= 1.0:
+        parser.error("--similarity-threshold must be in (0.0, 1.0]")
+    if args.shingle_size < 1:
+        parser.error("--shingle-size must be at least 1")
+    if args.compare_with and not args.near_duplicates:
+        parser.error("--compare-with requires --near-duplicates")
+    return args
 
-    data = load_aspects(aspects_path)
 
-    sections = data.get("sections", [])
+def collect_issues(data: dict) -> tuple[list[str], list[str]]:
+    """Return the (errors, warnings) of the structural checks."""
     errors: list[str] = []
     warnings: list[str] = []
 
     entry_ids: dict[str, str] = {}
     entry_slugs: dict[str, str] = {}
 
-    total_entries = 0
-    for section in sections:
+    for section in data.get("sections", []):
         section_id = section["id"]
         entries = section.get("entries", [])
-        total_entries += len(entries)
 
         if len(entries) <= 6:
             warnings.append(
@@ -104,6 +319,13 @@ def main(argv: list[str]) -> int:
                         f"duplicate source path {path} in entry: {entry_id}"
                     )
                 seen_sources.add(path)
+                if "lines" in source or "linesSha256" in source:
+                    lines = source.get("lines")
+                    if not has_range(source) or not 1 <= lines[0] <= lines[1]:
+                        errors.append(
+                            f"invalid line range for {path} in entry: {entry_id} "
+                            "(expected lines [start, end] with 1 <= start <= end and linesSha256)"
+                        )
 
             importance = entry.get("importance")
             if importance is None:
@@ -126,6 +348,21 @@ def main(argv: list[str]) -> int:
                 f"section {section_id} uses {len(tags_counter)} unique tags (>10)"
             )
 
+    return errors, warnings
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    aspects_path = args.aspects_path
+    if not aspects_path.is_absolute():
+        aspects_path = aspects_path.resolve()
+
+    data = load_aspects(aspects_path)
+
+    sections = data.get("sections", [])
+    total_entries = sum(len(section.get("entries", [])) for section in sections)
+    errors, warnings = collect_issues(data)
+
     print(f"Sections: {len(sections)} | Entries: {total_entries}")
 
     if errors:
@@ -138,9 +375,48 @@ def main(argv: list[str]) -> int:
         for item in warnings:
             print(f"  - {item}")
 
-    if not errors and not warnings:
+    near_duplicates: list[tuple[float, ShingledEntry, ShingledEntry]] = []
+    if args.near_duplicates:
+        shingled = shingle_entries(data, project_label(aspects_path), args.shingle_size)
+        for other_path in args.compare_with:
+            other_path = other_path.resolve()
+            if other_path == aspects_path:
+                continue
+            shingled.extend(
+                shingle_entries(load_aspects(other_path), project_label(other_path), args.shingle_size)
+            )
+        near_duplicates = find_near_duplicates(shingled, args.similarity_threshold)
+        print(
+            f"\nNear duplicates (jaccard>={args.similarity_threshold:.2f}, "
+            f"{args.shingle_size}-word shingles): {len(near_duplicates)}"
+        )
+        shown = near_duplicates
+        if args.duplicate_limit >= 0:
+            shown = near_duplicates[: args.duplicate_limit]
+        for similarity, left, right in shown:
+            print(f"  - {similarity:.2f} {left.label} <-> {right.label}")
+        if len(shown) < len(near_duplicates):
+            print(f"  ... ({len(near_duplicates) - len(shown)} more)")
+
+    if not errors and not warnings and not near_duplicates:
         print("No issues detected.")
 
+    if args.watch:
+        from aspects_watch import WatchModel, watch
+
+        model = WatchModel(
+            aspects_path,
+            adi_threshold=args.adi_threshold,
+            ignore_tag_frac=args.ignore_tag_frac,
+            sync_counts=args.sync_counts,
+            source_root=args.source_root,
+        )
+        try:
+            watch(model, args.poll_interval)
+        except KeyboardInterrupt:
+            pass
+        return 0
+
     return 1 if errors else 0
 
 
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""Report which parts of a project's source tree no aspect cites.
+
+The project tree (``projects/<name>/`` next to ``aspects/``) is walked with
+``os.scandir`` on a thread pool, one directory per task, honouring ``.gitignore``
+files (plus ``.git/info/exclude``) the way git does: patterns apply to their
+directory's subtree, later and deeper patterns win, and an ignored directory is
+never entered. Files are joined against the cited source paths of ASPECTS.json.
+
+The report lists coverage per top-level directory, then the largest uncited
+subtrees and the largest uncited files inside partially cited directories,
+ranked by size or by churn (files modified within ``--churn-days``). When
+``hash_check.py`` has saved a source manifest, the top-level table also shows
+how many cited files still matched their citation at that run, without hashing
+anything again.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from aspects_cache import cache_dir
+from project_paths import source_root
+from source_manifest import MANIFEST_FILENAME, leaves, load_manifest
+
+# (compiled pattern, negated, directory only, anchored)
+Rule = Tuple["re.Pattern[str]", bool, bool, bool]
+# (base directory relative to the root, rules defined there)
+RuleSet = Tuple[str, List[Rule]]
+
+
+def _glob_to_regex(pattern: str) -> str:
+    out: List[str] = []
+    i = 0
+    while i < len(pattern):
+        char = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("/**", i) and i + 3 == len(pattern):
+            out.append("/.*")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if char == "*":
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(char))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        elif char == "\\" and i + 1 < len(pattern):
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(char))
+        i += 1
+    return "".join(out)
+
+
+def parse_ignore(text: str) -> List[Rule]:
+    rules: List[Rule] = []
+    for line in text.splitlines():
+        line = line.rstrip("\r")
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+        if not line or line.startswith("#"):
+            continue
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith(("\\!", "\\#")):
+            line = line[1:]
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        anchored = "/" in line
+        line = line.lstrip("/")
+        if line:
+            rules.append((re.compile(_glob_to_regex(line)), negated, dir_only, anchored))
+    return rules
+
+
+def is_ignored(rules: List[RuleSet], rel_path: str, name: str, is_dir: bool) -> bool:
+    """Last matching rule wins; rules of deeper .gitignore files come later."""
+    ignored = False
+    for base, base_rules in rules:
+        local = rel_path[len(base) + 1 :] if base else rel_path
+        for pattern, negated, dir_only, anchored in base_rules:
+            if dir_only and not is_dir:
+                continue
+            if pattern.fullmatch(local if anchored else name):
+                ignored = not negated
+    return ignored
+
+
+@dataclass
+class Tree:
+    files: Dict[str, Tuple[int, float]] = field(default_factory=dict)  # rel path -> (size, mtime)
+    ignored: int = 0
+
+
+ScanResult = Tuple[List[Tuple[str, int, float]], List[Tuple[str, List[RuleSet]]], int]
+
+
+def _scan(root: Path, rel_dir: str, rules: List[RuleSet], use_gitignore: bool) -> ScanResult:
+    """Scan one directory: (files with size/mtime, subdirectories with their rules, ignored count)."""
+    directory = root / rel_dir if rel_dir else root
+    local: List[Rule] = []
+    if use_gitignore:
+        try:
+            local = parse_ignore((directory / ".gitignore").read_text(encoding="utf-8", errors="replace"))
+        except OSError:
+            pass
+    if local:
+        rules = [*rules, (rel_dir, local)]
+    files: List[Tuple[str, int, float]] = []
+    subdirs: List[Tuple[str, List[RuleSet]]] = []
+    ignored = 0
+    try:
+        entries = list(os.scandir(directory))
+    except OSError:
+        return files, subdirs, ignored
+    for entry in entries:
+        if entry.name == ".git":
+            continue
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            is_dir = entry.is_dir(follow_symlinks=False)
+        except OSError:
+            continue
+        if is_ignored(rules, rel_path, entry.name, is_dir):
+            ignored += 1
+            continue
+        if is_dir:
+            subdirs.append((rel_path, rules))
+            continue
+        try:
+            info = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        files.append((rel_path, info.st_size, info.st_mtime))
+    return files, subdirs, ignored
+
+
+def walk(root: Path, workers: int = 16, use_gitignore: bool = True) -> Tree:
+    """List every non-ignored file under ``root`` with a parallel scandir walk."""
+    rules: List[RuleSet] = []
+    if use_gitignore:
+        try:
+            exclude = parse_ignore((root / ".git" / "info" / "exclude").read_text(encoding="utf-8", errors="replace"))
+        except OSError:
+            exclude = []
+        if exclude:
+            rules.append(("", exclude))
+    tree = Tree()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending: Set[Future] = {pool.submit(_scan, root, "", rules, use_gitignore)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs, ignored = future.result()
+                tree.ignored += ignored
+                for rel_path, size, mtime in files:
+                    tree.files[rel_path] = (size, mtime)
+                for rel_dir, dir_rules in subdirs:
+                    pending.add(pool.submit(_scan, root, rel_dir, dir_rules, use_gitignore))
+    return tree
+
+
+def cited_sources(data: Dict[str, Any]) -> Dict[str, Set[str]]:
+    cited: Dict[str, Set[str]] = {}
+    for section in data.get("sections", []):
+        for entry in section.get("entries", []):
+            for source in entry.get("sources", []):
+                if isinstance(source, dict) and isinstance(source.get("path"), str):
+                    shas = cited.setdefault(source["path"], set())
+                    if source.get("sha256"):
+                        shas.add(source["sha256"])
+    return cited
+
+
+def _parents(rel_path: str) -> List[str]:
+    parts = rel_path.split("/")[:-1]
+    return ["/".join(parts[: depth + 1]) for depth in range(len(parts))]
+
+
+def build_coverage(
+    tree: Tree,
+    cited: Set[str],
+    verified: Optional[Set[str]],
+    churn_since: float,
+    sort_by: str,
+    limit: int,
+) -> Dict[str, Any]:
+    # directory -> [files, bytes, recent files, cited files]
+    dirs: Dict[str, List[int]] = {}
+    top: Dict[str, Dict[str, int]] = {}
+    for rel_path, (size, mtime) in tree.files.items():
+        is_cited = rel_path in cited
+        recent = mtime >= churn_since
+        for directory in _parents(rel_path):
+            stats = dirs.setdefault(directory, [0, 0, 0, 0])
+            stats[0] += 1
+            stats[1] += size
+            stats[2] += recent
+            stats[3] += is_cited
+        name = rel_path.split("/", 1)[0] if "/" in rel_path else "."
+        group = top.setdefault(name, dict.fromkeys(("files", "bytes", "citedFiles", "citedBytes", "verifiedFiles"), 0))
+        group["files"] += 1
+        group["bytes"] += size
+        if is_cited:
+            group["citedFiles"] += 1
+            group["citedBytes"] += size
+            group["verifiedFiles"] += bool(verified and rel_path in verified)
+
+    def rank(item: Tuple[str, int, int]) -> Tuple[int, int]:
+        _, size, recent = item
+        return (recent, size) if sort_by == "churn" else (size, recent)
+
+    uncited_dirs = [
+        (directory, stats[1], stats[2])
+        for directory, stats in dirs.items()
+        if not stats[3] and ("/" not in directory or dirs[directory.rsplit("/", 1)[0]][3])
+    ]
+    uncited_files = [
+        (rel_path, size, int(mtime >= churn_since))
+        for rel_path, (size, mtime) in tree.files.items()
+        if rel_path not in cited and ("/" not in rel_path or dirs[rel_path.rsplit("/", 1)[0]][3])
+    ]
+    uncited_dirs.sort(key=rank, reverse=True)
+    uncited_files.sort(key=rank, reverse=True)
+
+    total_files = len(tree.files)
+    total_bytes = sum(size for size, _ in tree.files.values())
+    cited_files = [path for path in cited if path in tree.files]
+    return {
+        "summary": {
+            "files": total_files,
+            "bytes": total_bytes,
+            "ignored": tree.ignored,
+            "citedFiles": len(cited_files),
+            "citedBytes": sum(tree.files[path][0] for path in cited_files),
+            "citedMissing": len(cited) - len(cited_files),
+            "uncitedDirectories": len(uncited_dirs),
+        },
+        "topLevel": {name: top[name] for name in sorted(top)},
+        "uncitedDirectories": [
+            {"path": path, "files": dirs[path][0], "bytes": size, "recentFiles": recent}
+            for path, size, recent in uncited_dirs[:limit]
+        ],
+        "uncitedFiles": [
+            {"path": path, "bytes": size, "recent": bool(recent)} for path, size, recent in uncited_files[:limit]
+        ],
+        "verifiedFromManifest": verified is not None,
+    }
+
+
+def _percent(part: int, whole: int) -> str:
+    return f"{100.0 * part / whole:5.1f}%" if whole else "    -"
+
+
+def _size(value: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if value < 1024 or unit == "GiB":
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return str(value)
+
+
+def print_coverage(report: Dict[str, Any], root: Path, elapsed: float, churn_days: int) -> None:
+    summary = report["summary"]
+    print(
+        f"{root}: {summary['files']} files ({_size(summary['bytes'])}), {summary['ignored']} ignored paths, "
+        f"scanned in {elapsed:.2f}s"
+    )
+    print(
+        f"Cited: {summary['citedFiles']} files ({_percent(summary['citedFiles'], summary['files']).strip()}), "
+        f"{_size(summary['citedBytes'])} ({_percent(summary['citedBytes'], summary['bytes']).strip()}); "
+        f"{summary['citedMissing']} cited paths not found"
+    )
+    verified = report["verifiedFromManifest"]
+    print("\nCoverage by top-level directory:")
+    header = f"  {'directory':<32} {'files':>7} {'cited':>6} {'files%':>7} {'bytes%':>7}"
+    print(header + (f" {'valid%':>7}" if verified else ""))
+    for name, group in report["topLevel"].items():
+        line = (
+            f"  {name:<32} {group['files']:>7} {group['citedFiles']:>6} "
+            f"{_percent(group['citedFiles'], group['files']):>7} {_percent(group['citedBytes'], group['bytes']):>7}"
+        )
+        if verified:
+            line += f" {_percent(group['verifiedFiles'], group['citedFiles']):>7}"
+        print(line)
+    if verified:
+        print("  (valid% = cited files that matched their sha256 at the last hash_check run)")
+    if report["uncitedDirectories"]:
+        print(f"\nLargest uncited directories (recent = modified in the last {churn_days} days):")
+        for item in report["uncitedDirectories"]:
+            print(f"  {item['path']}/  {item['files']} files, {_size(item['bytes'])}, {item['recentFiles']} recent")
+    if report["uncitedFiles"]:
+        print("\nLargest uncited files in cited directories:")
+        for item in report["uncitedFiles"]:
+            print(f"  {item['path']}  {_size(item['bytes'])}{' (recent)' if item['recent'] else ''}")
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Report uncited files and directories of a project's source tree.")
+    parser.add_argument("aspects_path", type=Path, help="Path to ASPECTS.json.")
+    parser.add_argument(
+        "--root",
+        type=Path,
+        default=None,
+        help="Project source tree (default: projects/<project> next to aspects/).",
+    )
+    parser.add_argument(
+        "--sort-by",
+        choices=("size", "churn"),
+        default="size",
+        help="Rank uncited paths by bytes or by recently modified files. Default: size.",
+    )
+    parser.add_argument(
+        "--churn-days",
+        type=int,
+        default=90,
+        help="Files modified within this many days count as churn. Default: 90.",
+    )
+    parser.add_argument("--limit", type=int, default=20, help="Uncited directories/files to list. Default: 20.")
+    parser.add_argument("--workers", type=int, default=16, help="Parallel directory scans. Default: 16.")
+    parser.add_argument("--no-gitignore", action="store_true", help="Include files ignored by .gitignore.")
+    parser.add_argument("--json", action="store_true", help="Output the report as JSON.")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    aspects_path = args.aspects_path.resolve()
+    try:
+        data = json.loads(aspects_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        print(f"error: unable to read {aspects_path}: {exc}", file=sys.stderr)
+        return 1
+    # Same root as hash_check, so the manifest's paths line up with the walk.
+    repo_root = source_root(aspects_path)
+    root = (args.root or repo_root / "projects" / aspects_path.parent.name).resolve()
+    if not root.is_dir():
+        print(f"error: project tree not found at {root} (use --root)", file=sys.stderr)
+        return 1
+    try:
+        prefix = root.relative_to(repo_root).as_posix() + "/"
+    except ValueError:
+        prefix = ""
+
+    citations = cited_sources(data)
+    cited = {path[len(prefix) :] for path in citations if path.startswith(prefix)}
+    verified: Optional[Set[str]] = None
+    manifest_path = cache_dir(aspects_path) / MANIFEST_FILENAME
+    if manifest_path.exists():
+        try:
+            on_disk = leaves(load_manifest(manifest_path))
+        except (OSError, ValueError):
+            on_disk = {}
+        verified = {
+            path[len(prefix) :]
+            for path, sha in on_disk.items()
+            if path.startswith(prefix) and sha is not None and citations.get(path) == {sha}
+        }
+
+    started = time.perf_counter()
+    tree = walk(root, workers=args.workers, use_gitignore=not args.no_gitignore)
+    elapsed = time.perf_counter() - started
+    churn_since = time.time() - args.churn_days * 86400
+    report = build_coverage(tree, cited, verified, churn_since, args.sort_by, args.limit)
+    if args.json:
+        report["root"] = str(root)
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+    else:
+        print_coverage(report, root, elapsed, args.churn_days)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
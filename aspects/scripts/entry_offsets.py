@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""Byte-offset sidecar index for single-entry reads of ASPECTS.json.
+
+The index records the byte span of every section object and every entry object
+inside ASPECTS.json. Readers that need one entry (``aspects_manager.py show``)
+mmap the file and ``json.loads`` only that span instead of parsing the whole
+document. The sidecar lives in ``.aspects-cache/entry-offsets.json`` and is keyed
+by the file's size and mtime, so validating it costs one ``stat``; a stale index
+is rebuilt transparently.
+
+Files in canonical layout (``json.dumps(indent=2, ensure_ascii=False)``, as
+written by ``aspects_writer``) are indexed with a line scan and flagged
+``canonical``, which lets the writer reuse their entry bytes verbatim. Any other
+layout falls back to a token scan over strings and structural characters, and a
+document neither scan can map is read with a full ``json.loads`` instead.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aspects_cache import cache_dir, cache_key, load_json_cache, store_json_cache
+
+INDEX_FILENAME = "entry-offsets.json"
+INDEX_FORMAT = 2
+TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]:]')
+# In canonical layout sections open/close at 4 spaces and entries at 8 spaces;
+# strings never contain raw newlines, so these lines are unambiguous.
+CANONICAL_SECTION_RE = re.compile(rb"^    \{\r?$|^    \}", re.MULTILINE)
+CANONICAL_ENTRY_RE = re.compile(rb"^        \{\r?$|^        \}", re.MULTILINE)
+SECTIONS_KEY = b'"sections"'
+ENTRIES_KEY = b'"entries"'
+
+Span = Tuple[int, int]
+
+
+def scan_spans(raw: bytes) -> Tuple[List[Span], List[Tuple[int, int, int]]]:
+    """Return section spans and (section index, start, end) entry spans of a document.
+
+    Ends are exclusive. Only objects directly inside ``sections[*].entries`` count
+    as entries.
+    """
+    sections: List[Span] = []
+    entries: List[Tuple[int, int, int]] = []
+    stack: List[Tuple[int, Optional[bytes], int]] = []
+    last_string: Optional[bytes] = None
+    pending_key: Optional[bytes] = None
+    for match in TOKEN_RE.finditer(raw):
+        token = match.group()
+        char = token[0]
+        if char == 0x22:  # '"'
+            last_string, pending_key = token, None
+        elif char == 0x3A:  # ':'
+            pending_key = last_string
+        elif char in (0x7B, 0x5B):  # '{' '['
+            stack.append((char, pending_key, match.start()))
+            pending_key = None
+        else:
+            kind, _, start = stack.pop()
+            if kind != 0x7B:
+                continue
+            depth = len(stack)
+            if depth == 2 and stack[1][1] == SECTIONS_KEY:
+                sections.append((start, match.end()))
+            elif depth == 4 and stack[3][1] == ENTRIES_KEY and stack[1][1] == SECTIONS_KEY:
+                entries.append((len(sections), start, match.end()))
+    return sections, entries
+
+
+def scan_canonical_spans(raw: bytes) -> Tuple[List[Span], List[Tuple[int, int, int]]]:
+    """``scan_spans`` for canonical layout, using line matches instead of tokens."""
+
+    def pairs(pattern: "re.Pattern[bytes]", indent: int) -> List[Span]:
+        braces = [match.start() + indent for match in pattern.finditer(raw)]
+        return [(braces[i], braces[i + 1] + 1) for i in range(0, len(braces) - 1, 2)]
+
+    sections = pairs(CANONICAL_SECTION_RE, 4)
+    entries: List[Tuple[int, int, int]] = []
+    section_idx = 0
+    for start, end in pairs(CANONICAL_ENTRY_RE, 8):
+        while sections[section_idx][1] < start:
+            section_idx += 1
+        entries.append((section_idx, start, end))
+    return sections, entries
+
+
+def canonical_bytes(data: Any) -> bytes:
+    """What ``aspects_manager.save_json`` has always written (text mode, so os.linesep)."""
+    text = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    return text.replace("\n", os.linesep).encode("utf-8")
+
+
+def _stat_key(aspects_path: Path) -> Optional[str]:
+    try:
+        info = os.stat(aspects_path)
+    except OSError:
+        return None
+    return cache_key("entry-offsets", INDEX_FORMAT, info.st_size, info.st_mtime_ns)
+
+
+class EntryOffsets:
+    def __init__(
+        self,
+        aspects_path: Path,
+        sections: List[List[Any]],
+        entries: Dict[str, List[int]],
+        canonical: bool = False,
+    ) -> None:
+        self.aspects_path = aspects_path
+        self.sections = sections  # [id, slug, start, end]
+        self.entries = entries  # slug or id -> [section index, start, end]
+        self.canonical = canonical  # file bytes equal canonical_bytes(data)
+
+    @classmethod
+    def build(cls, aspects_path: Path, raw: bytes) -> "EntryOffsets":
+        # One full parse names the spans: both follow document order.
+        data = json.loads(raw)
+        canonical = canonical_bytes(data) == raw
+        parsed_sections = data.get("sections", [])
+        parsed_entries = [entry for section in parsed_sections for entry in section.get("entries", [])]
+
+        def matches(spans: Tuple[List[Span], List[Tuple[int, int, int]]]) -> bool:
+            return len(spans[0]) == len(parsed_sections) and len(spans[1]) == len(parsed_entries)
+
+        spans = None
+        if canonical:
+            # Other arrays of objects inside sections also put braces at 8 spaces.
+            try:
+                spans = scan_canonical_spans(raw)
+            except IndexError:
+                spans = None
+        if spans is None or not matches(spans):
+            spans = scan_spans(raw)
+        if not matches(spans):
+            raise ValueError(f"cannot index {aspects_path}: unexpected document layout")
+        section_spans, entry_spans = spans
+        sections = [
+            [section.get("id"), section.get("slug"), start, end]
+            for section, (start, end) in zip(parsed_sections, section_spans)
+        ]
+        entries: Dict[str, List[int]] = {}
+        for entry, (section_idx, start, end) in zip(parsed_entries, entry_spans):
+            for name in ("id", "slug"):
+                if isinstance(entry.get(name), str):
+                    entries.setdefault(entry[name], [section_idx, start, end])
+        return cls(aspects_path, sections, entries, canonical)
+
+    @classmethod
+    def load_cached(cls, aspects_path: Path) -> Optional["EntryOffsets"]:
+        """Return the sidecar if it matches the file's current size and mtime."""
+        key = _stat_key(aspects_path)
+        cached = load_json_cache(cache_dir(aspects_path) / INDEX_FILENAME, key) if key else None
+        if cached is None:
+            return None
+        return cls(aspects_path, cached["sections"], cached["entries"], cached["canonical"])
+
+    @classmethod
+    def load(cls, aspects_path: Path) -> "EntryOffsets":
+        """Return the sidecar for the current file, rebuilding it when size or mtime changed."""
+        cached = cls.load_cached(aspects_path)
+        if cached is not None:
+            return cached
+        key = _stat_key(aspects_path)
+        index = cls.build(aspects_path, aspects_path.read_bytes())
+        if key:
+            index.store(key)
+        return index
+
+    def store(self, key: Optional[str] = None) -> None:
+        key = key or _stat_key(self.aspects_path)
+        if key:
+            store_json_cache(
+                cache_dir(self.aspects_path) / INDEX_FILENAME,
+                key,
+                {"sections": self.sections, "entries": self.entries, "canonical": self.canonical},
+            )
+
+    def read_entry(self, key: str) -> Optional[Dict[str, Any]]:
+        """Parse just the entry with this slug or id; None when it is not indexed."""
+        span = self.entries.get(key)
+        if span is None:
+            return None
+        _, start, end = span
+        try:
+            with self.aspects_path.open("rb") as stream:
+                with mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                    entry = json.loads(view[start:end])
+        except (OSError, ValueError):
+            return None
+        # Guard against an edit that kept both size and mtime.
+        if key not in (entry.get("slug"), entry.get("id")):
+            return None
+        return entry
+
+
+def find_entry(data: Dict[str, Any], key: str) -> Optional[Dict[str, Any]]:
+    """First entry in document order whose id or slug is ``key`` (what the index records)."""
+    for section in data.get("sections", []):
+        for entry in section.get("entries", []):
+            if key in (entry.get("id"), entry.get("slug")):
+                return entry
+    return None
+
+
+def read_entry(aspects_path: Path, key: str) -> Optional[Dict[str, Any]]:
+    """Read one entry by slug or id, rebuilding the sidecar once if its span looks stale.
+
+    A document the sidecar cannot index is parsed in full instead; None when the
+    entry does not exist or the file cannot be read as JSON.
+    """
+    try:
+        index = EntryOffsets.load(aspects_path)
+        if key not in index.entries:
+            return None
+        entry = index.read_entry(key)
+        if entry is None:
+            index = EntryOffsets.build(aspects_path, aspects_path.read_bytes())
+            index.store()
+            entry = index.read_entry(key)
+        return entry
+    except (OSError, ValueError):
+        pass
+    try:
+        return find_entry(json.loads(aspects_path.read_bytes()), key)
+    except (OSError, ValueError):
+        return None
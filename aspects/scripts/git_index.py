@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Skip hashing sources that git already knows are unchanged.
+
+When a cited file lives in a git checkout, ``.git/index`` stores its stat data
+and blob id. If the file's stat still matches the index entry (and the entry is
+not "racily clean"), its content is exactly that blob, so a sha256 computed for
+the same blob id earlier can be reused without reading the file. The blob id ->
+sha256 map is kept in ``.aspects-cache/git-blob-sha256.json``.
+
+The index is parsed directly (versions 2-4, SHA-1 or SHA-256 object ids); no git
+subprocess is started. Split indexes are not supported and simply disable the
+shortcut for that checkout.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from aspects_cache import cache_dir, cache_key, load_json_cache, store_json_cache
+
+BLOBS_FILENAME = "git-blob-sha256.json"
+BLOBS_KEY = cache_key("git-blob-sha256")
+ENTRY_HEADER = struct.Struct(">10I")
+OBJECT_FORMAT_RE = re.compile(r"^\s*objectformat\s*=\s*sha256\s*$", re.IGNORECASE | re.MULTILINE)
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    ctime: tuple[int, int]
+    mtime: tuple[int, int]
+    ino: int
+    size: int
+    oid: str
+
+
+def _read_varint(data: bytes, pos: int) -> tuple[int, int]:
+    """Decode git's offset varint (used for v4 path prefix lengths)."""
+    byte = data[pos]
+    pos += 1
+    value = byte & 0x7F
+    while byte & 0x80:
+        value += 1
+        byte = data[pos]
+        pos += 1
+        value = (value << 7) + (byte & 0x7F)
+    return value, pos
+
+
+def parse_index(data: bytes, oid_size: int = 20) -> Optional[Dict[str, IndexEntry]]:
+    """Return stage-0 entries by path, or None for unsupported indexes."""
+    if len(data) < 12 or data[:4] != b"DIRC":
+        return None
+    version, count = struct.unpack_from(">II", data, 4)
+    if version not in (2, 3, 4):
+        return None
+    entries: Dict[str, IndexEntry] = {}
+    pos = 12
+    previous = b""
+    for _ in range(count):
+        start = pos
+        fields = ENTRY_HEADER.unpack_from(data, pos)
+        ctime_s, ctime_ns, mtime_s, mtime_ns, _dev, ino, _mode, _uid, _gid, size = fields
+        pos += ENTRY_HEADER.size
+        oid = data[pos : pos + oid_size].hex()
+        pos += oid_size
+        (flags,) = struct.unpack_from(">H", data, pos)
+        pos += 2
+        if version >= 3 and flags & 0x4000:
+            pos += 2
+        if version == 4:
+            strip, pos = _read_varint(data, pos)
+            end = data.index(b"\0", pos)
+            name = previous[: len(previous) - strip] + data[pos:end]
+            pos = end + 1
+            previous = name
+        else:
+            end = data.index(b"\0", pos)
+            name = data[pos:end]
+            pos = start + ((pos - start + len(name) + 8) & ~7)
+        if (flags >> 12) & 0x3:
+            continue  # merge conflict stages are never clean
+        entries[name.decode("utf-8", "surrogateescape")] = IndexEntry(
+            (ctime_s, ctime_ns), (mtime_s, mtime_ns), ino, size, oid
+        )
+    # Extensions follow the entries; a split index keeps entries elsewhere.
+    while pos + 8 <= len(data) - oid_size:
+        signature = data[pos : pos + 4]
+        (length,) = struct.unpack_from(">I", data, pos + 4)
+        if signature == b"link":
+            return None
+        pos += 8 + length
+    return entries
+
+
+def _git_dir(worktree: Path) -> Optional[Path]:
+    dot_git = worktree / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        text = dot_git.read_text(encoding="utf-8", errors="replace").strip()
+        if text.startswith("gitdir:"):
+            target = Path(text[len("gitdir:") :].strip())
+            return target if target.is_absolute() else (worktree / target).resolve()
+    return None
+
+
+class _Checkout:
+    def __init__(self, worktree: Path, git_dir: Path) -> None:
+        self.worktree = worktree
+        self.entries: Optional[Dict[str, IndexEntry]] = None
+        self.index_mtime = (0, 0)
+        index_path = git_dir / "index"
+        config = git_dir / "config"
+        if (git_dir / "commondir").is_file():
+            common = (git_dir / (git_dir / "commondir").read_text(encoding="utf-8").strip()).resolve()
+            config = common / "config"
+        try:
+            oid_size = 32 if OBJECT_FORMAT_RE.search(config.read_text(encoding="utf-8", errors="replace")) else 20
+        except OSError:
+            oid_size = 20
+        try:
+            info = os.stat(index_path)
+            self.entries = parse_index(index_path.read_bytes(), oid_size)
+        except (OSError, ValueError, struct.error):
+            return
+        self.index_mtime = divmod(info.st_mtime_ns, 1_000_000_000)
+
+    def clean_oid(self, path: Path) -> Optional[str]:
+        """Blob id of ``path`` if its stat matches the index and it is not racily clean."""
+        if self.entries is None:
+            return None
+        entry = self.entries.get(path.relative_to(self.worktree).as_posix())
+        if entry is None:
+            return None
+        try:
+            info = os.stat(path)
+        except OSError:
+            return None
+        mtime = divmod(info.st_mtime_ns, 1_000_000_000)
+        ctime = divmod(info.st_ctime_ns, 1_000_000_000)
+        if (
+            entry.mtime != mtime
+            or entry.ctime != ctime
+            or entry.size != info.st_size & 0xFFFFFFFF
+            or (entry.ino and entry.ino != info.st_ino & 0xFFFFFFFF)
+            or entry.mtime >= self.index_mtime
+        ):
+            return None
+        return entry.oid
+
+
+class GitBlobHashes:
+    """sha256 lookups for clean files in git checkouts, backed by a blob-id cache."""
+
+    def __init__(self, aspects_path: Path) -> None:
+        self.cache_path = cache_dir(aspects_path) / BLOBS_FILENAME
+        self.known: Dict[str, str] = load_json_cache(self.cache_path, BLOBS_KEY) or {}
+        self.checkouts: Dict[Path, Optional[_Checkout]] = {}
+        self.dirty = False
+        self.hits = 0
+
+    def _checkout_for(self, directory: Path) -> Optional[_Checkout]:
+        if directory in self.checkouts:
+            return self.checkouts[directory]
+        git_dir = _git_dir(directory)
+        if git_dir is not None:
+            checkout: Optional[_Checkout] = _Checkout(directory, git_dir)
+        elif directory.parent == directory:
+            checkout = None
+        else:
+            checkout = self._checkout_for(directory.parent)
+        self.checkouts[directory] = checkout
+        return checkout
+
+    def clean_oid(self, path: Path) -> Optional[str]:
+        checkout = self._checkout_for(path.parent)
+        return checkout.clean_oid(path) if checkout is not None else None
+
+    def lookup(self, oid: Optional[str]) -> Optional[str]:
+        sha = self.known.get(oid) if oid else None
+        if sha is not None:
+            self.hits += 1
+        return sha
+
+    def record(self, oid: Optional[str], sha: str) -> None:
+        if oid and self.known.get(oid) != sha:
+            self.known[oid] = sha
+            self.dirty = True
+
+    def store(self) -> None:
+        if self.dirty:
+            store_json_cache(self.cache_path, BLOBS_KEY, self.known)
+            self.dirty = False
@@ -3,11 +3,33 @@ from __future__ import annotations
 
 import argparse
 import datetime as dt
+import difflib
+import fnmatch
 import hashlib
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from aspects_cache import cache_dir
+from aspects_diff import changed_slugs, diff_aspects
+from aspects_writer import save_aspects
+from entry_offsets import canonical_bytes
+from git_index import GitBlobHashes
+from project_paths import source_root
+from source_history import record_run
+from source_manifest import (
+    MANIFEST_FILENAME,
+    build_tree,
+    changed_directories,
+    diff_trees,
+    leaves,
+    load_manifest,
+    save_manifest,
+)
+from source_ranges import has_range, locate_range, range_rolling, range_sha256
 
 
 def parse_args() -> argparse.Namespace:
@@ -30,7 +52,73 @@ def parse_args() -> argparse.Namespace:
         default="hash_check",
         help="Filename prefix for the generated report (default: hash_check).",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--since",
+        type=Path,
+        default=None,
+        help="Older ASPECTS.json; only check entries added or with changed sources since that version.",
+    )
+    parser.add_argument(
+        "--queue",
+        type=Path,
+        default=None,
+        metavar="NDJSON",
+        help="Only check the entries listed in a revalidation_queue.py queue.",
+    )
+    parser.add_argument(
+        "--only-paths",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only check sources whose path matches this glob (repeatable).",
+    )
+    parser.add_argument(
+        "--only-sections",
+        action="append",
+        default=[],
+        metavar="SECTION",
+        help="Only check entries in this section id or slug (repeatable).",
+    )
+    parser.add_argument(
+        "--fix",
+        action="store_true",
+        help="Rewrite mismatched sha256 values in ASPECTS.json (one atomic write).",
+    )
+    parser.add_argument(
+        "--bump-last-updated",
+        nargs="?",
+        const=dt.date.today().isoformat(),
+        default=None,
+        metavar="YYYY-MM-DD",
+        help="With --fix, set lastUpdated on fixed entries (default: today).",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --fix, print a unified diff instead of writing ASPECTS.json.",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="Also write the Merkle manifest of the checked sources to this path.",
+    )
+    parser.add_argument(
+        "--compare-manifest",
+        type=Path,
+        default=None,
+        metavar="MANIFEST",
+        help="Compare this run's source manifest with another one (e.g. from another machine).",
+    )
+    parser.add_argument(
+        "--git-index",
+        action="store_true",
+        help="Skip hashing files whose stat matches .git/index and whose blob id was hashed before.",
+    )
+    args = parser.parse_args()
+    if (args.dry_run or args.bump_last_updated) and not args.fix:
+        parser.error("--dry-run and --bump-last-updated require --fix")
+    return args
 
 
 def load_aspects(aspects_path: Path) -> Dict[str, Any]:
@@ -58,80 +146,243 @@ def compute_hash(path: Path) -> str:
     return digest.hexdigest()
 
 
-def build_report(data: Dict[str, Any], root_dir: Path) -> Dict[str, Any]:
-    verified = 0
-    missing: List[Dict[str, Any]] = []
-    mismatches: List[Dict[str, Any]] = []
-
+def select_sources(
+    data: Dict[str, Any],
+    only_slugs: Optional[set[str]] = None,
+    only_paths: Optional[List[str]] = None,
+    only_sections: Optional[List[str]] = None,
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """Yield (entry, source) pairs that pass the --since/--only-* filters."""
     for section in data.get("sections", []):
+        if only_sections and section.get("id") not in only_sections and section.get("slug") not in only_sections:
+            continue
         for entry in section.get("entries", []):
-            entry_id = entry.get("id")
-            section_id = entry.get("sectionId")
-            slug = entry.get("slug")
-
+            if only_slugs is not None and entry.get("slug") not in only_slugs:
+                continue
             for source in entry.get("sources", []):
-                rel_path = Path(source.get("path", ""))
-                expected = source.get("sha256")
-
-                if not rel_path or not expected:
-                    continue
-
-                source_path = root_dir / rel_path
-                if not source_path.exists():
-                    missing.append(
-                        {
-                            "entryId": entry_id,
-                            "sectionId": section_id,
-                            "slug": slug,
-                            "path": str(rel_path),
-                        }
-                    )
-                    continue
-
-                try:
-                    actual = compute_hash(source_path)
-                except OSError as exc:
-                    missing.append(
-                        {
-                            "entryId": entry_id,
-                            "sectionId": section_id,
-                            "slug": slug,
-                            "path": str(rel_path),
-                            "error": str(exc),
-                        }
-                    )
+                path = source.get("path", "")
+                if only_paths and not any(fnmatch.fnmatch(path, pattern) for pattern in only_paths):
                     continue
-
-                if actual != expected:
-                    mismatches.append(
-                        {
-                            "entryId": entry_id,
-                            "sectionId": section_id,
-                            "slug": slug,
-                            "path": str(rel_path),
-                            "expected": expected,
-                            "actual": actual,
-                        }
-                    )
-                else:
-                    verified += 1
-
-    total_sources = verified + len(missing) + len(mismatches)
+                yield entry, source
+
+
+def hash_sources(paths: List[Path], git_blobs: Optional[GitBlobHashes] = None) -> Dict[Path, Any]:
+    """Hash each distinct path once, in parallel (hashlib releases the GIL).
+
+    With ``git_blobs``, files that git reports clean reuse the sha256 recorded for
+    their blob id; files hashed while clean record it for the next run.
+    """
+
+    def safe_hash(path: Path) -> Any:
+        try:
+            return compute_hash(path)
+        except OSError as exc:
+            return exc
+
+    existing = [path for path in dict.fromkeys(paths) if path.exists()]
+    results: Dict[Path, Any] = {}
+    oids: Dict[Path, Optional[str]] = {}
+    pending = existing
+    if git_blobs is not None:
+        oids = {path: git_blobs.clean_oid(path) for path in existing}
+        pending = []
+        for path in existing:
+            known = git_blobs.lookup(oids[path])
+            if known is not None:
+                results[path] = known
+            else:
+                pending.append(path)
+    with ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as pool:
+        results.update(zip(pending, pool.map(safe_hash, pending)))
+    if git_blobs is not None:
+        for path in pending:
+            # Only trust the blob id if the file was still clean after it was read.
+            if isinstance(results[path], str) and oids[path] and git_blobs.clean_oid(path) == oids[path]:
+                git_blobs.record(oids[path], results[path])
+        git_blobs.store()
+    return results
+
+
+def build_report(
+    data: Dict[str, Any],
+    root_dir: Path,
+    only_slugs: Optional[set[str]] = None,
+    only_paths: Optional[List[str]] = None,
+    only_sections: Optional[List[str]] = None,
+    git_blobs: Optional[GitBlobHashes] = None,
+) -> Dict[str, Any]:
+    verified = 0
+    missing: List[Dict[str, Any]] = []
+    mismatches: List[Dict[str, Any]] = []
+    # Whole-file mismatches whose cited line range is unchanged (in place or moved).
+    range_verified: List[Dict[str, Any]] = []
+
+    selected = [
+        (entry, source)
+        for entry, source in select_sources(data, only_slugs, only_paths, only_sections)
+        if source.get("path") and source.get("sha256")
+    ]
+    hashes = hash_sources([root_dir / source["path"] for _, source in selected], git_blobs)
+    cited: Dict[str, set[str]] = {}
+    on_disk: Dict[str, Optional[str]] = {}
+
+    for entry, source in selected:
+        entry_id = entry.get("id")
+        section_id = entry.get("sectionId")
+        slug = entry.get("slug")
+        rel_path = Path(source["path"])
+        expected = source["sha256"]
+
+        source_path = root_dir / rel_path
+        actual = hashes.get(source_path)
+        cited.setdefault(rel_path.as_posix(), set()).add(expected)
+        on_disk[rel_path.as_posix()] = actual if isinstance(actual, str) else None
+        if source_path not in hashes:
+            missing.append(
+                {
+                    "entryId": entry_id,
+                    "sectionId": section_id,
+                    "slug": slug,
+                    "path": str(rel_path),
+                }
+            )
+            continue
+
+        if isinstance(actual, OSError):
+            missing.append(
+                {
+                    "entryId": entry_id,
+                    "sectionId": section_id,
+                    "slug": slug,
+                    "path": str(rel_path),
+                    "error": str(actual),
+                }
+            )
+            continue
+
+        if actual == expected:
+            verified += 1
+            continue
+
+        item = {
+            "entryId": entry_id,
+            "sectionId": section_id,
+            "slug": slug,
+            "path": str(rel_path),
+            "expected": expected,
+            "actual": actual,
+        }
+        if has_range(source):
+            content = source_path.read_bytes()
+            located = locate_range(content, source)
+            if located is not None:
+                item["lines"] = source["lines"]
+                item["newLines"] = list(located)
+                item["linesRolling"] = range_rolling(content, *located)
+                range_verified.append(item)
+                continue
+            item["lines"] = source["lines"]
+            item["actualLinesSha256"] = range_sha256(content, *source["lines"])
+            item["linesRolling"] = range_rolling(content, *source["lines"])
+        mismatches.append(item)
+
+    total_sources = verified + len(missing) + len(mismatches) + len(range_verified)
     now = dt.datetime.now().astimezone()
+    summary = {
+        "totalSources": total_sources,
+        "verified": verified,
+        "missing": len(missing),
+        "mismatches": len(mismatches),
+        "rangeVerified": len(range_verified),
+        "relocated": sum(1 for item in range_verified if item["newLines"] != item["lines"]),
+    }
+    if git_blobs is not None:
+        summary["gitIndexHits"] = git_blobs.hits
+    # A path cited with different hashes never matches the single on-disk hash.
+    expected_tree = build_tree({path: ",".join(sorted(shas)) for path, shas in cited.items()})
+    actual_tree = build_tree(on_disk)
 
     return {
         "generatedAt": now.isoformat(timespec="seconds"),
-        "summary": {
-            "totalSources": total_sources,
-            "verified": verified,
-            "missing": len(missing),
-            "mismatches": len(mismatches),
-        },
+        "summary": summary,
         "missingSources": missing,
         "hashMismatches": mismatches,
+        "rangeVerified": range_verified,
+        "merkle": {
+            "root": actual_tree["hash"],
+            "expectedRoot": expected_tree["hash"],
+            "changedDirectories": changed_directories(diff_trees(expected_tree, actual_tree)),
+        },
+        # Popped by main() and saved as the manifest instead of going into the report.
+        "sourceTree": actual_tree,
     }
 
 
+def apply_fixes(
+    data: Dict[str, Any], mismatches: List[Dict[str, Any]], last_updated: Optional[str]
+) -> List[Dict[str, Any]]:
+    """Write the verified hashes (and moved/changed line ranges) into ``data``; returns the entries touched."""
+    fixes = {(item["entryId"], item["path"]): item for item in mismatches}
+    touched: List[Dict[str, Any]] = []
+    for section in data.get("sections", []):
+        for entry in section.get("entries", []):
+            changed = False
+            for source in entry.get("sources", []):
+                item = fixes.get((entry.get("id"), source.get("path")))
+                if item is None:
+                    continue
+                if source.get("sha256") != item["actual"]:
+                    source["sha256"] = item["actual"]
+                    changed = True
+                if "newLines" in item and source.get("lines") != item["newLines"]:
+                    source["lines"] = item["newLines"]
+                    changed = True
+                if item.get("actualLinesSha256") and source.get("linesSha256") != item["actualLinesSha256"]:
+                    source["linesSha256"] = item["actualLinesSha256"]
+                    changed = True
+                # Backfills the relocation prefilter on citations made before it existed.
+                if item.get("linesRolling") and source.get("linesRolling") != item["linesRolling"]:
+                    source["linesRolling"] = item["linesRolling"]
+                    changed = True
+            if changed:
+                touched.append(entry)
+                if last_updated:
+                    entry["lastUpdated"] = last_updated
+    return touched
+
+
+def fix_aspects(args: argparse.Namespace, aspects_path: Path, data: Dict[str, Any], report: Dict[str, Any]) -> None:
+    original = aspects_path.read_text(encoding="utf-8")
+    # Range-verified sources keep their cited code, so refreshing their whole-file
+    # hash (and moved lines) does not stamp lastUpdated.
+    refreshed = apply_fixes(data, report["rangeVerified"], None)
+    fixed = apply_fixes(data, report["hashMismatches"], args.bump_last_updated)
+    if not refreshed and not fixed:
+        print("Nothing to fix.")
+        return
+    counts = (
+        f"{len(report['hashMismatches'])} hashes in {len(fixed)} entries, "
+        f"{len(report['rangeVerified'])} range-verified sources in {len(refreshed)} entries"
+    )
+    if args.dry_run:
+        # Same layout as aspects_manager.save_json so fixes do not reformat the file.
+        rendered = canonical_bytes(data).decode("utf-8")
+        sys.stdout.writelines(
+            difflib.unified_diff(
+                original.splitlines(keepends=True),
+                rendered.splitlines(keepends=True),
+                fromfile=str(aspects_path),
+                tofile=f"{aspects_path} (fixed)",
+                n=2,
+            )
+        )
+        print(f"Dry run: would update {counts}.")
+        return
+    changed = [entry.get(name) for entry in refreshed + fixed for name in ("id", "slug")]
+    save_aspects(aspects_path, data, changed=changed)
+    print(f"Updated {counts}: {aspects_path}")
+
+
 def ensure_output_dir(path: Path) -> Path:
     path.mkdir(parents=True, exist_ok=True)
     return path
@@ -157,6 +408,31 @@ def next_report_path(output_dir: Path, prefix: str) -> Path:
     return candidate
 
 
+def load_queue(path: Path) -> set[str]:
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+        return {json.loads(line)["slug"] for line in lines if line.strip()}
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        print(f"error: cannot read queue {path}: {exc}", file=sys.stderr)
+        sys.exit(1)
+
+
+def compare_manifest(tree: Dict[str, Any], other_path: Path) -> Dict[str, Any]:
+    """Drill down from the roots to the leaves that differ from another manifest."""
+    try:
+        other = load_manifest(other_path)
+    except (OSError, ValueError) as exc:
+        print(f"error: cannot read manifest {other_path}: {exc}", file=sys.stderr)
+        sys.exit(1)
+    changes = diff_trees(other, tree)
+    return {
+        "manifest": str(other_path),
+        "root": other["hash"],
+        "changedDirectories": changed_directories(changes),
+        "changes": [{"path": path, "theirs": theirs, "ours": ours} for path, theirs, ours in changes],
+    }
+
+
 def write_report(report: Dict[str, Any], path: Path) -> None:
     path.write_text(json.dumps(report, indent=2, ensure_ascii=True))
 
@@ -164,10 +440,26 @@ def write_report(report: Dict[str, Any], path: Path) -> None:
 def main() -> None:
     args = parse_args()
     aspects_path = args.aspects_path.resolve()
-    report_root = aspects_path.parent
+    report_root = source_root(aspects_path)
 
     data = load_aspects(aspects_path)
-    report = build_report(data, report_root)
+    only_slugs = None
+    if args.since is not None:
+        only_slugs = changed_slugs(diff_aspects(load_aspects(args.since), data), "sources")
+    if args.queue is not None:
+        queued = load_queue(args.queue)
+        only_slugs = queued if only_slugs is None else only_slugs & queued
+    git_blobs = GitBlobHashes(aspects_path) if args.git_index else None
+    report = build_report(data, report_root, only_slugs, args.only_paths, args.only_sections, git_blobs)
+    tree = report.pop("sourceTree")
+    failed = {Path(item["path"]).as_posix() for item in report["missingSources"] + report["hashMismatches"]}
+    record_run(aspects_path, leaves(tree), failed)
+    if only_slugs is None and not args.only_paths and not args.only_sections:
+        save_manifest(cache_dir(aspects_path) / MANIFEST_FILENAME, tree)
+    if args.manifest:
+        save_manifest(args.manifest, tree)
+    if args.compare_manifest:
+        report["manifestComparison"] = compare_manifest(tree, args.compare_manifest)
 
     output_dir = resolve_output_dir(args)
     report_path = next_report_path(output_dir, args.report_prefix)
@@ -182,8 +474,32 @@ def main() -> None:
         f"total={summary['totalSources']},",
         f"verified={summary['verified']},",
         f"missing={summary['missing']},",
-        f"mismatches={summary['mismatches']}",
+        f"mismatches={summary['mismatches']},",
+        f"range-verified={summary['rangeVerified']} (relocated={summary['relocated']})",
     )
+    if "gitIndexHits" in summary:
+        print(f"Reused {summary['gitIndexHits']} hashes of files clean in .git/index")
+    merkle = report["merkle"]
+    if merkle["root"] == merkle["expectedRoot"]:
+        print(f"Merkle root {merkle['root'][:12]} matches ASPECTS.json")
+    else:
+        print(
+            f"Merkle root {merkle['root'][:12]} differs from ASPECTS.json "
+            f"({merkle['expectedRoot'][:12]}) in {len(merkle['changedDirectories'])} directories"
+        )
+    comparison = report.get("manifestComparison")
+    if comparison is not None:
+        if not comparison["changes"]:
+            print(f"Sources identical to {comparison['manifest']}")
+        else:
+            print(f"{len(comparison['changes'])} sources differ from {comparison['manifest']}:")
+            for change in comparison["changes"][:20]:
+                marker = "+" if change["theirs"] is None else "-" if change["ours"] is None else "~"
+                print(f"  {marker} {change['path']}")
+            if len(comparison["changes"]) > 20:
+                print(f"  ... {len(comparison['changes']) - 20} more in the report")
+    if args.fix:
+        fix_aspects(args, aspects_path, data, report)
 
 
 if __name__ == "__main__":
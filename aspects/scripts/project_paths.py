@@ -0,0 +1,27 @@
+#!/usr/bin/env python3
+"""Where the files cited by an ASPECTS.json live.
+
+Source paths are stored relative to the repository root (``projects/<name>/...``)
+while the knowledge base sits in ``aspects/projects/<name>/ASPECTS.json``. Every
+tool that opens cited files (hash_check, coverage, the revalidation queue, audit
+--watch, aspects_manager) resolves them through ``source_root`` so that the
+hashes they record and compare refer to the same files.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+
+def source_root(aspects_path: Path) -> Path:
+    """Return the directory cited source paths are relative to.
+
+    For the standard ``aspects/projects/<name>/ASPECTS.json`` layout this is the
+    repository root. An ASPECTS.json stored anywhere else resolves its sources
+    against its own directory.
+    """
+    path = aspects_path.resolve()
+    parents = path.parents
+    if len(parents) > 3 and parents[1].name == "projects" and parents[2].name == "aspects":
+        return parents[3]
+    return path.parent
@@ -3,17 +3,89 @@
 
 Allows filtering entries by importance, tags and text search so agents can quickly
 refresh critical knowledge before starting work.
+
+``--similar TEXT`` / ``--similar-to SLUG`` rank entries by cosine similarity of
+local TF-IDF vectors (word tokens, optionally character n-grams). Each project's
+L2-normalized term matrix is cached on disk as an inverted index, so a query is a
+sparse matrix-vector product over the postings of the query terms. Several
+ASPECTS.json paths can be queried at once.
+
+``--where`` accepts a small boolean query language, e.g.
+``tag:rust AND (section:architecture OR importance>=0.8) AND NOT tag:deprecated``.
+The expression is parsed once and evaluated over per-tag and per-section bitsets
+(Python ints), so each operator costs a few word-sized bitwise operations per 64
+entries instead of per-entry Python branching. The ``--tag``, ``--any-tag``,
+``--section`` and importance filters are evaluated on the same bitsets, which are
+cached per content fingerprint, and only the rows whose bits survive are visited.
+
+Rendered output is kept in a small LRU disk cache keyed by the content
+fingerprint of every queried ASPECTS.json plus the normalized arguments, so a
+repeated call (such as the mandatory critical-aspects read) is answered without
+parsing the JSON. ``--no-cache`` bypasses it.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import math
+import operator
+import os
+import re
 import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from contextlib import redirect_stdout
+from fnmatch import fnmatchcase
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Callable, Iterable, Iterator
 import io
 
+from aspects_cache import (
+    cache_dir,
+    cache_key,
+    file_fingerprint,
+    load_json_cache,
+    store_json_cache,
+    write_atomic,
+)
+
+TOKEN_RE = re.compile(r"\w+")
+CHAR_NGRAM = 4
+WHERE_TOKEN_RE = re.compile(
+    r"""\s*(?:
+        (?P<paren>[()])
+      | (?P<field>[A-Za-z_]+)\s*(?P<op>>=|<=|!=|=|:|>|<)\s*(?P<value>"(?:[^"\\]|\\.)*"|[^\s()]+)
+      | (?P<word>[A-Za-z]+)
+    )""",
+    re.VERBOSE,
+)
+COMPARISONS: dict[str, Callable[[object, object], bool]] = {
+    ">=": operator.ge,
+    "<=": operator.le,
+    ">": operator.gt,
+    "<": operator.lt,
+    "=": operator.eq,
+    ":": operator.eq,
+    "!=": operator.ne,
+}
+WHERE_FIELDS = ("tag", "section", "slug", "importance", "updated", "text", "source")
+BITSETS_FILENAME = "query-bitsets.json"
+RESULT_CACHE_DIRNAME = "query-results"
+# Part of every result cache key: bump whenever the rendered output changes.
+RESULT_CACHE_VERSION = 1
+RESULT_CACHE_MAX_ENTRIES = 128
+RESULT_CACHE_MAX_BYTES = 16 * 1024 * 1024
+FACETS = ("tags", "section", "importance-bucket", "project")
+# Bands from the importance scale in AGENTS.aspects.md (section 2.3).
+IMPORTANCE_BUCKETS = (
+    (0.80, "critical (0.80-1.00)"),
+    (0.60, "core (0.60-0.79)"),
+    (0.30, "context (0.30-0.59)"),
+    (0.00, "reference (0.00-0.29)"),
+)
+
 if isinstance(sys.stdout, io.TextIOWrapper):
     try:
         sys.stdout.reconfigure(encoding="utf-8")
@@ -35,6 +107,95 @@ def iter_entries(data: dict) -> Iterable[tuple[dict, dict]]:
             yield section, entry
 
 
+def entry_text(entry: dict) -> str:
+    return f"{entry.get('name', '')}\n{entry.get('description', '')}"
+
+
+def text_features(text: str, char_ngrams: bool) -> Counter[str]:
+    tokens = [token for token in TOKEN_RE.findall(text.lower()) if len(token) > 1]
+    features: Counter[str] = Counter(tokens)
+    if char_ngrams:
+        for token in tokens:
+            padded = f"#{token}#"
+            for start in range(max(len(padded) - CHAR_NGRAM + 1, 1)):
+                features["#" + padded[start : start + CHAR_NGRAM]] += 1
+    return features
+
+
+def tfidf_vector(features: Counter[str], idf: dict[str, float]) -> dict[str, float]:
+    vector = {
+        term: (1.0 + math.log(count)) * idf[term]
+        for term, count in features.items()
+        if term in idf
+    }
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {term: value / norm for term, value in vector.items()} if norm else {}
+
+
+def load_similarity_index(aspects_path: Path, data: dict, char_ngrams: bool) -> dict:
+    """Return {"slugs", "idf", "postings"} for the file, building it when the cache is stale.
+
+    ``postings`` maps each term to [[row, weight], ...] of the L2-normalized TF-IDF
+    matrix, i.e. the matrix stored column-wise for sparse matrix-vector products.
+    """
+    key = cache_key("tfidf", char_ngrams, file_fingerprint(aspects_path))
+    suffix = "-char" if char_ngrams else ""
+    cache_path = cache_dir(aspects_path) / f"tfidf{suffix}.json"
+    cached = load_json_cache(cache_path, key)
+    if cached is not None:
+        return cached
+
+    slugs: list[str] = []
+    rows: list[Counter[str]] = []
+    document_frequency: Counter[str] = Counter()
+    for _, entry in iter_entries(data):
+        features = text_features(entry_text(entry), char_ngrams)
+        slugs.append(entry.get("slug", ""))
+        rows.append(features)
+        document_frequency.update(features.keys())
+    total = len(rows)
+    idf = {term: math.log((1 + total) / (1 + df)) + 1.0 for term, df in document_frequency.items()}
+    postings: defaultdict[str, list[list[float]]] = defaultdict(list)
+    for row, features in enumerate(rows):
+        for term, weight in tfidf_vector(features, idf).items():
+            postings[term].append([row, round(weight, 6)])
+    index = {"slugs": slugs, "idf": idf, "postings": dict(postings)}
+    store_json_cache(cache_path, key, index)
+    return index
+
+
+def similarity_scores(index: dict, text: str, char_ngrams: bool) -> dict[str, float]:
+    query = tfidf_vector(text_features(text, char_ngrams), index["idf"])
+    scores: defaultdict[int, float] = defaultdict(float)
+    postings = index["postings"]
+    for term, value in query.items():
+        for row, weight in postings.get(term, ()):
+            scores[row] += value * weight
+    slugs = index["slugs"]
+    return {slugs[row]: score for row, score in scores.items()}
+
+
+def resolve_similar_to(
+    loaded: list[tuple[Path, dict]], spec: str, multi_project: bool
+) -> tuple[tuple[str, str], dict]:
+    """Find the ``--similar-to`` target as ``SLUG`` or ``PROJECT:SLUG``; returns its (project, slug) key."""
+    project_filter, _, slug = spec.rpartition(":")
+    matches = [
+        (aspects_path.parent.name, entry)
+        for aspects_path, data in loaded
+        if not project_filter or aspects_path.parent.name == project_filter
+        for _, entry in iter_entries(data)
+        if entry.get("slug") == slug
+    ]
+    if not matches:
+        raise SystemExit(f"Entry '{spec}' not found.")
+    if len(matches) > 1:
+        options = ", ".join(f"{project}:{slug}" for project, _ in matches)
+        raise SystemExit(f"Entry '{spec}' exists in several projects; use one of: {options}")
+    project, entry = matches[0]
+    return (project if multi_project else "", slug), entry
+
+
 def format_entry(section: dict, entry: dict) -> str:
     importance = float(entry.get("importance", 0.0))
     title = section.get("title", section.get("id"))
@@ -111,56 +272,436 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Output results as JSON array.",
     )
+    parser.add_argument(
+        "--where",
+        metavar="EXPR",
+        help=(
+            "Boolean filter over fields tag, section, slug, importance, updated, text and source, "
+            "e.g. 'tag:rust AND (section:architecture OR importance>=0.8) AND NOT tag:deprecated'. "
+            "Values accept * wildcards for tag/section/slug; quote values with spaces."
+        ),
+    )
+    parser.add_argument(
+        "--facets",
+        metavar="LIST",
+        help=(
+            f"Comma-separated facets to count over all matches before --limit: {', '.join(FACETS)}. "
+            "With --json the output becomes {\"results\": [...], \"facets\": {...}}."
+        ),
+    )
+    parser.add_argument(
+        "--facet-limit",
+        type=int,
+        default=15,
+        help="Maximum values printed per facet in text mode. Default: 15",
+    )
+    parser.add_argument(
+        "--similar",
+        metavar="TEXT",
+        help="Rank entries by TF-IDF cosine similarity to TEXT (default limit: 10).",
+    )
+    parser.add_argument(
+        "--similar-to",
+        metavar="SLUG",
+        help=(
+            "Rank entries by TF-IDF cosine similarity to the entry SLUG (excluding itself). "
+            "Use PROJECT:SLUG when several queried projects have that slug."
+        ),
+    )
+    parser.add_argument(
+        "--char-ngrams",
+        action="store_true",
+        help=f"Add character {CHAR_NGRAM}-grams to similarity features (matches word variants).",
+    )
+    parser.add_argument(
+        "--min-similarity",
+        type=float,
+        default=0.0,
+        help="Drop similarity results scoring below this value. Default: 0.0",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk result cache.",
+    )
     parser.add_argument(
         "aspects_path",
         type=Path,
-        help="Path to the ASPECTS.json file to query.",
-    )
-    return parser.parse_args(argv)
-
-
-def matches_filters(
-    section: dict,
-    entry: dict,
-    *,
-    min_importance: float,
-    max_importance: float,
-    tags: list[str] | None,
-    any_tags: list[str] | None,
-    contains: Sequence[str] | None,
-    section_slug: str | None,
-) -> bool:
-    importance = entry.get("importance")
-    if importance is None:
-        return False
+        nargs="+",
+        help="Path to the ASPECTS.json file to query (several paths query all of them).",
+    )
+    args = parser.parse_args(argv)
+    if args.similar and args.similar_to:
+        parser.error("--similar and --similar-to are mutually exclusive")
+    args.facet_names = []
+    if args.facets:
+        args.facet_names = [name.strip() for name in args.facets.split(",") if name.strip()]
+        unknown = sorted(set(args.facet_names) - set(FACETS))
+        if unknown:
+            parser.error(f"unknown facet(s): {', '.join(unknown)} (expected: {', '.join(FACETS)})")
+    args.where_node = None
+    if args.where:
+        try:
+            args.where_node = compile_where(args.where)
+        except ValueError as exc:
+            parser.error(f"invalid --where expression: {exc}")
+    return args
+
+
+def bits_from_indices(indices: Iterable[int], size: int) -> int:
+    bitmap = bytearray((size + 7) // 8)
+    for index in indices:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return int.from_bytes(bitmap, "little")
+
+
+def iter_bits(bits: int) -> Iterator[int]:
+    """Yield the positions of the set bits in ascending order, one 64-bit word at a time."""
+    words = array("Q")
+    words.frombytes(bits.to_bytes((bits.bit_length() + 63) // 64 * 8, "little"))
+    for index, word in enumerate(words):
+        base = index * 64
+        while word:
+            low = word & -word
+            yield base + low.bit_length() - 1
+            word ^= low
+
+
+def importance_value(entry: dict) -> float | None:
     try:
-        importance_value = float(importance)
+        value = float(entry.get("importance"))
     except (TypeError, ValueError):
-        return False
-
-    if not (min_importance <= importance_value <= max_importance):
-        return False
-
-    if section_slug and section.get("slug") != section_slug:
-        return False
-
-    if tags:
-        entry_tags = set(entry.get("tags", []))
-        if not all(tag in entry_tags for tag in tags):
-            return False
-    if any_tags:
-        entry_tags = set(entry.get("tags", []))
-        if not any(tag in entry_tags for tag in any_tags):
-            return False
+        return None
+    return None if math.isnan(value) else value
+
+
+class EntryBitsets:
+    """Per-tag and per-section bitsets over the entries of one ASPECTS.json.
+
+    Bit ``i`` stands for the i-th entry in document order (see ``iter_entries``).
+    Importance is kept as rows sorted by value, so a range is two bisections.
+    ``load`` caches the tables by content fingerprint (bitsets as hex strings).
+    """
+
+    def __init__(self, data: dict, payload: dict | None = None) -> None:
+        self.pairs = list(iter_entries(data))
+        self.size = len(self.pairs)
+        self.all = (1 << self.size) - 1
+        if payload is not None and payload.get("size") == self.size:
+            self.tags = {key: int(value, 16) for key, value in payload["tags"].items()}
+            self.sections = {key: int(value, 16) for key, value in payload["sections"].items()}
+            self.section_ids = {key: int(value, 16) for key, value in payload["sectionIds"].items()}
+            self.importance_rows: list[int] = payload["importanceRows"]
+            self.importance_values: list[float] = payload["importanceValues"]
+            return
+        tag_rows: defaultdict[str, list[int]] = defaultdict(list)
+        section_rows: defaultdict[str, list[int]] = defaultdict(list)
+        section_id_rows: defaultdict[str, list[int]] = defaultdict(list)
+        importance: list[tuple[float, int]] = []
+        for row, (section, entry) in enumerate(self.pairs):
+            for tag in set(entry.get("tags", [])):
+                tag_rows[tag].append(row)
+            if section.get("slug"):
+                section_rows[section["slug"]].append(row)
+            if section.get("id"):
+                section_id_rows[section["id"]].append(row)
+            value = importance_value(entry)
+            if value is not None:
+                importance.append((value, row))
+        importance.sort()
+        self.tags = {tag: bits_from_indices(rows, self.size) for tag, rows in tag_rows.items()}
+        self.sections = {key: bits_from_indices(rows, self.size) for key, rows in section_rows.items()}
+        self.section_ids = {key: bits_from_indices(rows, self.size) for key, rows in section_id_rows.items()}
+        self.importance_rows = [row for _, row in importance]
+        self.importance_values = [value for value, _ in importance]
+
+    @classmethod
+    def load(cls, aspects_path: Path, data: dict) -> "EntryBitsets":
+        key = cache_key("query-bitsets", file_fingerprint(aspects_path))
+        cache_path = cache_dir(aspects_path) / BITSETS_FILENAME
+        payload = load_json_cache(cache_path, key)
+        index = cls(data, payload)
+        if payload is None or payload.get("size") != index.size:
+            store_json_cache(cache_path, key, index.payload())
+        return index
+
+    def payload(self) -> dict:
+        def encode(table: dict[str, int]) -> dict[str, str]:
+            return {key: format(bits, "x") for key, bits in table.items()}
+
+        return {
+            "size": self.size,
+            "tags": encode(self.tags),
+            "sections": encode(self.sections),
+            "sectionIds": encode(self.section_ids),
+            "importanceRows": self.importance_rows,
+            "importanceValues": self.importance_values,
+        }
+
+    def _scan(self, predicate: Callable[[dict, dict], bool], within: int | None = None) -> int:
+        rows = range(self.size) if within is None else iter_bits(within)
+        pairs = self.pairs
+        return bits_from_indices((row for row in rows if predicate(*pairs[row])), self.size)
+
+    def lookup(self, table: dict[str, int], pattern: str) -> int:
+        if not any(char in pattern for char in "*?["):
+            return table.get(pattern, 0)
+        bits = 0
+        for key, value in table.items():
+            if fnmatchcase(key, pattern):
+                bits |= value
+        return bits
+
+    def importance_range(self, low: float, high: float) -> int:
+        """Bits of the entries whose importance lies in [low, high]."""
+        values = self.importance_values
+        start, end = bisect_left(values, low), bisect_right(values, high)
+        return bits_from_indices(self.importance_rows[start:end], self.size)
+
+    def importance_compare(self, op: str, threshold: float) -> int:
+        values = self.importance_values
+        count = len(values)
+        low, high = bisect_left(values, threshold), bisect_right(values, threshold)
+        if op == "!=":
+            return self.importance_range(-math.inf, math.inf) & ~self.importance_range(threshold, threshold)
+        start, end = {
+            ">=": (low, count),
+            ">": (high, count),
+            "<=": (0, high),
+            "<": (0, low),
+            "=": (low, high),
+            ":": (low, high),
+        }[op]
+        return bits_from_indices(self.importance_rows[start:end], self.size)
+
+    def contains(self, needle: str, within: int | None = None) -> int:
+        needle = needle.lower()
+        return self._scan(lambda _, entry: needle in entry_text(entry).lower(), within)
+
+    def atom(self, field: str, op: str, value: str) -> int:
+        equality = op in {":", "=", "!="}
+        if field in {"tag", "section"}:
+            if not equality:
+                raise ValueError(f"'{field}' supports only ':', '=' or '!='")
+            if field == "tag":
+                bits = self.lookup(self.tags, value)
+            else:
+                bits = self.lookup(self.sections, value) | self.lookup(self.section_ids, value)
+        elif field == "slug":
+            if not equality:
+                raise ValueError("'slug' supports only ':', '=' or '!='")
+            bits = self._scan(lambda _, entry: fnmatchcase(entry.get("slug", ""), value))
+        elif field in {"text", "source"}:
+            if not equality:
+                raise ValueError(f"'{field}' supports only ':', '=' or '!='")
+            if field == "text":
+                bits = self.contains(value)
+            else:
+                needle = value.lower()
+                bits = self._scan(
+                    lambda _, entry: any(
+                        needle in str(source.get("path", "")).lower()
+                        for source in entry.get("sources", [])
+                        if isinstance(source, dict)
+                    )
+                )
+        elif field == "importance":
+            try:
+                threshold = float(value)
+            except ValueError as exc:
+                raise ValueError(f"importance needs a number, got {value!r}") from exc
+            return self.importance_compare(op, threshold)
+        elif field == "updated":
+            compare = COMPARISONS[op]
+            return self._scan(lambda _, entry: compare(str(entry.get("lastUpdated", "")), value))
+        else:
+            raise ValueError(f"unknown field '{field}' (expected one of: {', '.join(WHERE_FIELDS)})")
+        return self.all & ~bits if op == "!=" else bits
+
+    def filter(self, args: argparse.Namespace) -> int:
+        """Bits of the entries passing --min/--max-importance, --section, --tag, --any-tag, --contains."""
+        bits = self.importance_range(args.min_importance, args.max_importance)
+        if args.section:
+            bits &= self.sections.get(args.section, 0)
+        for tag in args.tags or []:
+            bits &= self.tags.get(tag, 0)
+        if args.any_tags:
+            any_bits = 0
+            for tag in args.any_tags:
+                any_bits |= self.tags.get(tag, 0)
+            bits &= any_bits
+        for needle in args.contains or []:
+            if not bits:
+                break
+            bits = self.contains(needle, within=bits)
+        return bits
+
+
+WhereNode = Callable[[EntryBitsets], int]
+WhereToken = tuple[str, tuple[str, ...]]
+
+
+def tokenize_where(expression: str) -> list[WhereToken]:
+    """Split a --where expression into (kind, payload) tokens.
+
+    Keywords are upper-cased, field names lower-cased and quoted values unescaped,
+    so equivalent spellings give equal token lists while values keep their exact text.
+    """
+    tokens: list[WhereToken] = []
+    position = 0
+    while position < len(expression):
+        if expression[position:].isspace():
+            break
+        match = WHERE_TOKEN_RE.match(expression, position)
+        if not match or match.end() == position:
+            raise ValueError(f"unexpected input at position {position}: {expression[position:]!r}")
+        position = match.end()
+        if match.group("paren"):
+            tokens.append((match.group("paren"), ()))
+        elif match.group("field"):
+            value = match.group("value")
+            if value.startswith('"'):
+                value = re.sub(r"\\(.)", r"\1", value[1:-1])
+            tokens.append(("atom", (match.group("field").lower(), match.group("op"), value)))
+        else:
+            word = match.group("word").upper()
+            if word not in {"AND", "OR", "NOT"}:
+                raise ValueError(f"unknown keyword '{match.group('word')}' (use field:value)")
+            tokens.append((word, ()))
+    return tokens
+
+
+def compile_where(expression: str) -> WhereNode:
+    """Parse a --where expression into a function mapping EntryBitsets to a bitset.
+
+    Grammar (keywords are case-insensitive, adjacent terms are ANDed):
+        expr := and_expr ("OR" and_expr)*
+        and_expr := not_expr (["AND"] not_expr)*
+        not_expr := "NOT" not_expr | "(" expr ")" | field op value
+    """
+    tokens = tokenize_where(expression)
+    cursor = 0
+
+    def peek() -> str | None:
+        return tokens[cursor][0] if cursor < len(tokens) else None
+
+    def take() -> WhereToken:
+        nonlocal cursor
+        if cursor >= len(tokens):
+            raise ValueError("unexpected end of expression")
+        token = tokens[cursor]
+        cursor += 1
+        return token
+
+    def parse_or() -> WhereNode:
+        nodes = [parse_and()]
+        while peek() == "OR":
+            take()
+            nodes.append(parse_and())
+        if len(nodes) == 1:
+            return nodes[0]
+
+        def evaluate(index: EntryBitsets) -> int:
+            bits = 0
+            for node in nodes:
+                bits |= node(index)
+            return bits
+
+        return evaluate
+
+    def parse_and() -> WhereNode:
+        nodes = [parse_not()]
+        while peek() in {"AND", "NOT", "(", "atom"}:
+            if peek() == "AND":
+                take()
+            nodes.append(parse_not())
+        if len(nodes) == 1:
+            return nodes[0]
+
+        def evaluate(index: EntryBitsets) -> int:
+            bits = index.all
+            for node in nodes:
+                bits &= node(index)
+                if not bits:
+                    break
+            return bits
+
+        return evaluate
+
+    def parse_not() -> WhereNode:
+        kind, payload = take()
+        if kind == "NOT":
+            inner = parse_not()
+            return lambda index: index.all & ~inner(index)
+        if kind == "(":
+            node = parse_or()
+            if take()[0] != ")":
+                raise ValueError("missing ')'")
+            return node
+        if kind == "atom":
+            field, op, value = payload
+            if field not in WHERE_FIELDS:
+                raise ValueError(f"unknown field '{field}' (expected one of: {', '.join(WHERE_FIELDS)})")
+            if field not in {"importance", "updated"} and op not in {":", "=", "!="}:
+                raise ValueError(f"'{field}' supports only ':', '=' or '!='")
+            if field == "importance":
+                try:
+                    float(value)
+                except ValueError as exc:
+                    raise ValueError(f"importance needs a number, got {value!r}") from exc
+            return lambda index: index.atom(field, op, value)
+        raise ValueError(f"unexpected '{kind}'")
+
+    if not tokens:
+        raise ValueError("empty expression")
+    root = parse_or()
+    if cursor != len(tokens):
+        raise ValueError(f"unexpected '{tokens[cursor][0]}' after expression")
+    return root
+
+
+def importance_bucket(entry: dict) -> str:
+    try:
+        value = float(entry.get("importance"))
+    except (TypeError, ValueError):
+        return "invalid"
+    for lower, label in IMPORTANCE_BUCKETS:
+        if value >= lower:
+            return label
+    return "invalid"
+
+
+def update_facets(counters: dict[str, Counter[str]], item: dict) -> None:
+    for facet, counter in counters.items():
+        if facet == "tags":
+            counter.update(set(item["entry"].get("tags", [])))
+        elif facet == "section":
+            counter[item["section"].get("slug", "")] += 1
+        elif facet == "importance-bucket":
+            counter[importance_bucket(item["entry"])] += 1
+        elif facet == "project":
+            counter[item.get("project", "")] += 1
+
+
+def facets_payload(counters: dict[str, Counter[str]]) -> dict[str, dict[str, int]]:
+    payload: dict[str, dict[str, int]] = {}
+    for facet, counter in counters.items():
+        if facet == "importance-bucket":
+            order = [label for _, label in IMPORTANCE_BUCKETS] + ["invalid"]
+            items = [(label, counter[label]) for label in order if counter[label]]
+        else:
+            items = sorted(counter.items(), key=lambda pair: (-pair[1], pair[0]))
+        payload[facet] = dict(items)
+    return payload
 
-    if contains:
-        haystack = f"{entry.get('name', '')}\n{entry.get('description', '')}".lower()
-        for needle in contains:
-            lowered = needle.lower()
-            if lowered not in haystack:
-                return False
 
-    return True
+def print_facets(facets: dict[str, dict[str, int]], total: int, limit: int) -> None:
+    print(f"Facets ({total} matching entries):")
+    for facet, values in facets.items():
+        shown = list(values.items())
+        rendered = ", ".join(f"{value}={count}" for value, count in shown[:limit])
+        more = f", ... (+{len(shown) - limit} more)" if len(shown) > limit else ""
+        print(f"  {facet}: {rendered or '-'}{more}")
 
 
 def sort_results(results: list[dict], sort_by: str, ascending: bool) -> None:
@@ -180,7 +721,12 @@ def sort_results(results: list[dict], sort_by: str, ascending: bool) -> None:
 def print_entry(item: dict, *, show_sources: bool) -> None:
     section = item["section"]
     entry = item["entry"]
-    print(format_entry(section, entry))
+    prefix = ""
+    if "similarity" in item:
+        prefix += f"~{item['similarity']:.2f} "
+    if item.get("project"):
+        prefix += f"{item['project']}: "
+    print(prefix + format_entry(section, entry))
 
     tags = entry.get("tags") or []
     if tags:
@@ -197,36 +743,144 @@ def print_entry(item: dict, *, show_sources: bool) -> None:
     print()
 
 
+def result_cache_path(args: argparse.Namespace, paths: list[Path]) -> Path:
+    """Return the cache file for this invocation (content fingerprints + normalized args)."""
+    normalized = {
+        name: value
+        for name, value in vars(args).items()
+        if name not in {"aspects_path", "no_cache", "where_node", "facet_names"}
+    }
+    for name in ("tags", "any_tags", "contains"):
+        if normalized.get(name):
+            normalized[name] = sorted(set(normalized[name]))
+    if normalized.get("where"):
+        # Tokens, not the raw string: spacing between terms is irrelevant, but
+        # spacing inside quoted text:/source: values is part of the match.
+        normalized["where"] = [[kind, list(payload)] for kind, payload in tokenize_where(normalized["where"])]
+    if normalized.get("facets"):
+        normalized["facets"] = args.facet_names
+    key = cache_key(
+        "query",
+        RESULT_CACHE_VERSION,
+        normalized,
+        [[str(path), file_fingerprint(path)] for path in paths],
+    )
+    return cache_dir(paths[0]) / RESULT_CACHE_DIRNAME / f"{key}.out"
+
+
+def read_result_cache(path: Path) -> bytes | None:
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # refresh recency for LRU eviction
+    except OSError:
+        return None
+    return data
+
+
+def store_result_cache(path: Path, data: bytes) -> None:
+    """Store rendered output and evict least recently used entries beyond the caps."""
+    try:
+        write_atomic(path, data)
+        entries = sorted(
+            (entry.stat().st_mtime_ns, entry.stat().st_size, entry.path)
+            for entry in os.scandir(path.parent)
+            if entry.is_file() and entry.name.endswith(".out")
+        )
+    except OSError:
+        return
+    total = sum(size for _, size, _ in entries)
+    while entries and (len(entries) > RESULT_CACHE_MAX_ENTRIES or total > RESULT_CACHE_MAX_BYTES):
+        _, size, victim = entries.pop(0)
+        total -= size
+        try:
+            os.unlink(victim)
+        except OSError:
+            pass
+
+
 def main(argv: list[str]) -> int:
     args = parse_args(argv)
-
-    aspects_path = args.aspects_path
-    if not aspects_path.is_absolute():
-        aspects_path = aspects_path.resolve()
-    data = load_aspects(aspects_path)
+    paths = [path if path.is_absolute() else path.resolve() for path in args.aspects_path]
+
+    cache_path = None if args.no_cache else result_cache_path(args, paths)
+    if cache_path is not None:
+        cached = read_result_cache(cache_path)
+        if cached is not None:
+            sys.stdout.flush()
+            sys.stdout.buffer.write(cached)
+            sys.stdout.buffer.flush()
+            return 0
+
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        status = run_query(args, paths)
+    output = buffer.getvalue()
+    sys.stdout.write(output)
+    if cache_path is not None and status == 0:
+        store_result_cache(cache_path, output.encode("utf-8"))
+    return status
+
+
+def run_query(args: argparse.Namespace, paths: list[Path]) -> int:
+    loaded: list[tuple[Path, dict]] = [(path, load_aspects(path)) for path in paths]
+    multi_project = len(loaded) > 1
+    similarity_mode = bool(args.similar or args.similar_to)
+    facet_counters: dict[str, Counter[str]] = {name: Counter() for name in args.facet_names}
 
     results: list[dict] = []
-    for section, entry in iter_entries(data):
-        if matches_filters(
-            section,
-            entry,
-            min_importance=args.min_importance,
-            max_importance=args.max_importance,
-            tags=args.tags,
-            any_tags=args.any_tags,
-            contains=args.contains or [],
-            section_slug=args.section,
-        ):
-            results.append({"section": section, "entry": entry})
-
-    sort_results(results, args.sort_by, args.ascending)
-
-    if args.limit is not None and args.limit >= 0:
-        results = results[: args.limit]
+    for aspects_path, data in loaded:
+        index = EntryBitsets.load(aspects_path, data)
+        selected = index.filter(args)
+        if args.where_node is not None and selected:
+            try:
+                selected &= args.where_node(index)
+            except ValueError as exc:
+                raise SystemExit(f"invalid --where expression: {exc}") from exc
+        for row in iter_bits(selected):
+            section, entry = index.pairs[row]
+            item = {"section": section, "entry": entry}
+            if multi_project:
+                item["project"] = aspects_path.parent.name
+            results.append(item)
+            if not similarity_mode:
+                update_facets(facet_counters, item)
+    matched = len(results)
+
+    if similarity_mode:
+        query_text = args.similar
+        target_key = None
+        if args.similar_to:
+            target_key, target = resolve_similar_to(loaded, args.similar_to, multi_project)
+            query_text = entry_text(target)
+        scores: dict[tuple[str, str], float] = {}
+        for aspects_path, data in loaded:
+            index = load_similarity_index(aspects_path, data, args.char_ngrams)
+            project = aspects_path.parent.name if multi_project else ""
+            for slug, score in similarity_scores(index, query_text, args.char_ngrams).items():
+                scores[(project, slug)] = score
+        ranked: list[dict] = []
+        for item in results:
+            key = (item.get("project", ""), item["entry"].get("slug"))
+            if key == target_key:
+                continue
+            score = scores.get(key, 0.0)
+            if score > 0 and score >= args.min_similarity:
+                item["similarity"] = score
+                ranked.append(item)
+                update_facets(facet_counters, item)
+        matched = len(ranked)
+        ranked.sort(key=lambda item: -item["similarity"])
+        results = ranked[: args.limit if args.limit is not None and args.limit >= 0 else 10]
+    else:
+        sort_results(results, args.sort_by, args.ascending)
+
+        if args.limit is not None and args.limit >= 0:
+            results = results[: args.limit]
 
     if args.json:
-        payload = [
-            {
+        payload = []
+        for item in results:
+            record = {
                 "section": item["section"]["slug"],
                 "importance": item["entry"].get("importance"),
                 "id": item["entry"]["id"],
@@ -236,9 +890,20 @@ def main(argv: list[str]) -> int:
                 "tags": item["entry"].get("tags", []),
                 "sources": item["entry"].get("sources", []),
             }
-            for item in results
-        ]
-        json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
+            if "project" in item:
+                record["project"] = item["project"]
+            if "similarity" in item:
+                record["similarity"] = round(item["similarity"], 4)
+            payload.append(record)
+        if args.facet_names:
+            json.dump(
+                {"results": payload, "total": matched, "facets": facets_payload(facet_counters)},
+                sys.stdout,
+                ensure_ascii=False,
+                indent=2,
+            )
+        else:
+            json.dump(payload, sys.stdout, ensure_ascii=False, indent=2)
         sys.stdout.write("\n")
     else:
         if not results:
@@ -246,6 +911,8 @@ def main(argv: list[str]) -> int:
         else:
             for item in results:
                 print_entry(item, show_sources=args.print_sources)
+        if args.facet_names:
+            print_facets(facets_payload(facet_counters), matched, args.facet_limit)
 
     return 0
 
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""Rank entries by how likely their citations went stale and emit a bounded queue.
+
+Each entry gets a risk score from four signals:
+
+- age: days since ``lastUpdated`` (``age / (age + --age-scale)``; undated entries count as maximally old);
+- churn: how often a cited file changed between hash_check runs;
+- failures: how often a cited file failed verification (mismatch or missing);
+- importance: impact weight ``0.5 + 0.5 * importance``.
+
+Churn and failure rates come from ``.aspects-cache/source-history.json`` (written
+by ``hash_check.py``) with a Laplace prior, so never-checked sources rank as
+uncertain (0.5) rather than safe. ``score = (1 - (1-age)(1-churn)(1-failures)) *
+impact``, using the riskiest source of the entry.
+
+The queue is written as NDJSON, highest risk first, bounded by ``--limit`` and
+by ``--budget`` seconds of estimated hashing time (source sizes over
+``--hash-rate``). ``hash_check.py --queue <file>`` verifies exactly the queued
+entries.
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from project_paths import source_root
+from source_history import History, load_history
+
+PER_FILE_SECONDS = 0.001
+
+
+def age_days(entry: Dict[str, Any], today: dt.date) -> Optional[int]:
+    try:
+        updated = dt.date.fromisoformat(str(entry.get("lastUpdated", ""))[:10])
+    except ValueError:
+        return None
+    return max((today - updated).days, 0)
+
+
+def rate(record: Optional[Dict[str, Any]], field: str) -> float:
+    if not record:
+        return 0.5
+    return (record.get(field, 0) + 1) / (record.get("checks", 0) + 2)
+
+
+def score_entry(
+    entry: Dict[str, Any],
+    history: History,
+    sizes: Dict[str, int],
+    today: dt.date,
+    age_scale: float,
+    hash_rate: float,
+) -> Dict[str, Any]:
+    paths = [
+        source["path"]
+        for source in entry.get("sources", [])
+        if isinstance(source, dict) and isinstance(source.get("path"), str)
+    ]
+    age = age_days(entry, today)
+    age_risk = 1.0 if age is None else age / (age + age_scale)
+    churn = max((rate(history.get(path), "changes") for path in paths), default=0.0)
+    failures = max((rate(history.get(path), "failures") for path in paths), default=0.0)
+    importance = float(entry.get("importance", 0.0) or 0.0)
+    stale = 1.0 - (1.0 - age_risk) * (1.0 - churn) * (1.0 - failures)
+    seconds = sum(sizes.get(path, 0) for path in dict.fromkeys(paths)) / hash_rate + PER_FILE_SECONDS * len(paths)
+    return {
+        "slug": entry.get("slug"),
+        "id": entry.get("id"),
+        "sectionId": entry.get("sectionId"),
+        "score": round(stale * (0.5 + 0.5 * importance), 4),
+        "ageDays": age,
+        "importance": importance,
+        "churn": round(churn, 4),
+        "failureRate": round(failures, 4),
+        "estimatedSeconds": round(seconds, 4),
+        "sources": paths,
+    }
+
+
+def build_queue(
+    data: Dict[str, Any],
+    history: History,
+    source_root: Path,
+    today: dt.date,
+    limit: Optional[int] = None,
+    budget: Optional[float] = None,
+    age_scale: float = 180.0,
+    hash_rate: float = 300e6,
+) -> List[Dict[str, Any]]:
+    """Return scored entries, riskiest first, that fit ``limit`` and ``budget``."""
+    sizes: Dict[str, int] = {}
+    entries = [entry for section in data.get("sections", []) for entry in section.get("entries", [])]
+    for entry in entries:
+        for source in entry.get("sources", []):
+            path = source.get("path") if isinstance(source, dict) else None
+            if isinstance(path, str) and path not in sizes:
+                try:
+                    sizes[path] = os.stat(source_root / path).st_size
+                except OSError:
+                    sizes[path] = 0
+    scored = [score_entry(entry, history, sizes, today, age_scale, hash_rate) for entry in entries]
+    scored.sort(key=lambda item: (-item["score"], item["estimatedSeconds"], item["slug"] or ""))
+    queue: List[Dict[str, Any]] = []
+    spent = 0.0
+    for item in scored:
+        if limit is not None and len(queue) >= limit:
+            break
+        if budget is not None and spent + item["estimatedSeconds"] > budget:
+            continue  # a cheaper, slightly less risky entry may still fit
+        spent += item["estimatedSeconds"]
+        queue.append({"rank": len(queue) + 1, **item})
+    return queue
+
+
+def parse_args(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Emit an NDJSON revalidation queue of the riskiest entries.")
+    parser.add_argument("aspects_path", type=Path, help="Path to ASPECTS.json.")
+    parser.add_argument("--limit", type=int, default=50, help="Maximum entries in the queue. Default: 50.")
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=None,
+        metavar="SECONDS",
+        help="Maximum estimated hashing time for the whole queue.",
+    )
+    parser.add_argument(
+        "--hash-rate",
+        type=float,
+        default=300.0,
+        metavar="MB_PER_S",
+        help="Hashing throughput used to estimate costs. Default: 300.",
+    )
+    parser.add_argument(
+        "--age-scale",
+        type=float,
+        default=180.0,
+        metavar="DAYS",
+        help="Age at which the age signal reaches 0.5. Default: 180.",
+    )
+    parser.add_argument("--today", default=None, metavar="YYYY-MM-DD", help="Reference date (default: today).")
+    parser.add_argument("--output", type=Path, default=None, help="Write the NDJSON queue here instead of stdout.")
+    return parser.parse_args(argv)
+
+
+def main(argv: List[str]) -> int:
+    args = parse_args(argv)
+    aspects_path = args.aspects_path.resolve()
+    try:
+        data = json.loads(aspects_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError) as exc:
+        print(f"error: unable to read {aspects_path}: {exc}", file=sys.stderr)
+        return 1
+    try:
+        today = dt.date.fromisoformat(args.today) if args.today else dt.date.today()
+    except ValueError:
+        print(f"error: invalid --today {args.today!r}", file=sys.stderr)
+        return 1
+    queue = build_queue(
+        data,
+        load_history(aspects_path),
+        source_root(aspects_path),
+        today,
+        limit=args.limit,
+        budget=args.budget,
+        age_scale=args.age_scale,
+        hash_rate=args.hash_rate * 1e6,
+    )
+    lines = "".join(json.dumps(item, ensure_ascii=False) + "\n" for item in queue)
+    if args.output:
+        args.output.write_text(lines, encoding="utf-8")
+    else:
+        sys.stdout.write(lines)
+    total = sum(item["estimatedSeconds"] for item in queue)
+    print(f"Queued {len(queue)} entries, estimated {total:.2f}s of hashing.", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""Propose how to split an overloaded section into k subsections.
+
+Each entry of the section becomes one unit vector: IDF-weighted tags and the
+TF-IDF terms of its name and description (IDF from ``TagSuggester``), mixed so
+that ``cosine = tag_weight * tag cosine + (1 - tag_weight) * text cosine``.
+Spherical k-means (k-means++ seeding, best of several restarts) clusters the
+vectors. Each cluster is named after the tags that are most over-represented in
+it compared with the rest of the section.
+
+The edges between the section's entries are computed once from ``ADIState``
+(tags and sources, as in the ``aspects_manager`` ADI impact report). Splitting
+keeps the global graph unchanged and only moves section boundaries. Every
+candidate subsection's ADI, ADIw and ``stats`` warnings are therefore sums
+over the pairs inside it, which keeps sweeping many values of k interactive.
+Isolation is global (degree 0), so it moves with the entries unchanged.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Iterable, Sequence
+
+from adi_state import ADIState
+from tag_suggester import tokenize
+
+Vector = dict[str, float]
+
+
+@dataclass(frozen=True)
+class Subsection:
+    slug: str
+    title: str
+    entries: tuple[str, ...]
+    tags: tuple[str, ...]  # dominant tags, most distinctive first
+    unique_tags: int
+    adi: float
+    weighted_adi: float
+    isolated: int  # global degree 0, as ADIState and ``stats`` count them
+    warnings: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SplitPlan:
+    k: int
+    cohesion: float  # mean cosine between entries and their cluster centroid
+    subsections: tuple[Subsection, ...]
+
+    @property
+    def warnings(self) -> int:
+        return sum(len(subsection.warnings) for subsection in self.subsections)
+
+    @property
+    def max_weighted_adi(self) -> float:
+        return max(subsection.weighted_adi for subsection in self.subsections)
+
+
+def _normalize(vector: Vector) -> Vector:
+    norm = math.sqrt(sum(value * value for value in vector.values()))
+    return {key: value / norm for key, value in vector.items()} if norm else {}
+
+
+def _dot(a: Vector, b: Vector) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(value * b.get(key, 0.0) for key, value in a.items())
+
+
+def _ratio(nodes: int, total_degree: float) -> float:
+    if nodes == 0 or total_degree <= 0:
+        return math.inf
+    return nodes / (total_degree / nodes)
+
+
+def slugify(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def humanize(tag: str) -> str:
+    words = re.split(r"[-_\s]+", tag)
+    return " ".join(word if word.isupper() else word[:1].upper() + word[1:] for word in words if word)
+
+
+class SectionSplitter:
+    def __init__(
+        self,
+        section: dict[str, Any],
+        state: ADIState,
+        idf: dict[str, float],
+        tag_weight: float = 0.6,
+        taken_slugs: Iterable[str] = (),
+    ) -> None:
+        self.section = section
+        self.entries = [entry for entry in section.get("entries", []) if entry.get("slug")]
+        self.slugs = [entry["slug"] for entry in self.entries]
+        self.tags = [tuple(dict.fromkeys(entry.get("tags", []))) for entry in self.entries]
+        self.taken_slugs = set(taken_slugs)
+        self.isolated = [state.degree.get(slug, 0) == 0 for slug in self.slugs]
+
+        total = max(len(state.section_of), 1)
+        fallback_idf = max(idf.values(), default=1.0)
+        self.vectors: list[Vector] = []
+        for entry, tags in zip(self.entries, self.tags):
+            tag_vector = _normalize(
+                {
+                    f"tag:{tag}": math.log((1 + total) / (1 + len(state.members.get(f"tag:{tag}", ())))) + 1.0
+                    for tag in tags
+                }
+            )
+            terms = Counter(tokenize(f"{entry.get('name', '')}\n{entry.get('description', '')}"))
+            text_vector = _normalize(
+                {
+                    f"term:{term}": (1.0 + math.log(count)) * idf.get(term, fallback_idf)
+                    for term, count in terms.items()
+                }
+            )
+            vector = {key: value * math.sqrt(tag_weight) for key, value in tag_vector.items()}
+            vector.update((key, value * math.sqrt(1.0 - tag_weight)) for key, value in text_vector.items())
+            self.vectors.append(vector)
+
+        # Spherical k-means only needs cosines between entries (kernel form), so the
+        # Gram matrix and the pairwise edges inside the section are computed once for every k.
+        self.gram = [[_dot(a, b) for b in self.vectors] for a in self.vectors]
+        count = len(self.slugs)
+        self.weights = [[0.0] * count for _ in range(count)]
+        for i in range(count):
+            for j in range(i + 1, count):
+                weight = state.link_weight(self.slugs[i], self.slugs[j])
+                self.weights[i][j] = self.weights[j][i] = weight
+
+    # Clustering ------------------------------------------------------------
+    def _similarities(self, labels: Sequence[int], k: int) -> list[list[float]]:
+        """Cosine of every entry to every normalised cluster centroid, from the Gram matrix."""
+        members = [[index for index, label in enumerate(labels) if label == cluster] for cluster in range(k)]
+        norms = [math.sqrt(sum(self.gram[j][l] for j in group for l in group)) or 1.0 for group in members]
+        return [
+            [sum(row[j] for j in group) / norm for group, norm in zip(members, norms)]
+            for row in self.gram
+        ]
+
+    def _seed(self, k: int, rng: random.Random) -> list[int]:
+        """k-means++ on cosine distance; returns the indices of the initial centroids."""
+        count = len(self.vectors)
+        chosen = [rng.randrange(count)]
+        distance = [1.0 - similarity for similarity in self.gram[chosen[0]]]
+        while len(chosen) < k:
+            total = sum(max(value, 0.0) for value in distance)
+            if total <= 0:
+                pick = rng.choice([index for index in range(count) if index not in chosen])
+            else:
+                target = rng.random() * total
+                pick = count - 1
+                for index, value in enumerate(distance):
+                    target -= max(value, 0.0)
+                    if target <= 0:
+                        pick = index
+                        break
+            chosen.append(pick)
+            distance = [min(old, 1.0 - similarity) for old, similarity in zip(distance, self.gram[pick])]
+        return chosen
+
+    def _kmeans(self, k: int, rng: random.Random, max_iterations: int = 50) -> tuple[list[int], float]:
+        seeds = self._seed(k, rng)
+        similarities = [[row[index] for index in seeds] for row in self.gram]
+        labels: list[int] = []
+        for _ in range(max_iterations):
+            new_labels = [max(range(k), key=row.__getitem__) for row in similarities]
+            # Refill empty clusters with the entry farthest from its centroid.
+            for cluster in set(range(k)) - set(new_labels):
+                sizes = Counter(new_labels)
+                candidates = [index for index, label in enumerate(new_labels) if sizes[label] > 1]
+                farthest = min(candidates, key=lambda index: similarities[index][new_labels[index]])
+                new_labels[farthest] = cluster
+            if new_labels == labels:
+                break
+            labels = new_labels
+            similarities = self._similarities(labels, k)
+        cohesion = sum(row[label] for row, label in zip(similarities, labels))
+        return labels, cohesion / len(labels)
+
+    def cluster(self, k: int, restarts: int = 10, seed: int = 0) -> tuple[list[int], float]:
+        """Best-of-``restarts`` labels for ``k`` clusters and their cohesion."""
+        rng = random.Random(seed * 1_000_003 + k)
+        return max((self._kmeans(k, rng) for _ in range(restarts)), key=lambda result: result[1])
+
+    # Naming and evaluation ---------------------------------------------------
+    def _dominant_tags(self, members: Sequence[int], section_tags: Counter[str]) -> list[str]:
+        inside = Counter(tag for index in members for tag in self.tags[index])
+        rest = len(self.entries) - len(members)
+
+        def lift(tag: str) -> float:
+            outside = (section_tags[tag] - inside[tag]) / rest if rest else 0.0
+            return inside[tag] / len(members) - outside
+
+        return sorted(inside, key=lambda tag: (-lift(tag), -inside[tag], tag))
+
+    def _name(self, dominant: Sequence[str], used: set[str]) -> tuple[str, str]:
+        base = slugify(self.section.get("slug", "section"))
+        title = " and ".join(humanize(tag) for tag in dominant[:2]) or self.section.get("title", base)
+        parts = [part for part in (slugify(tag) for tag in dominant) if part and part != base]
+        candidates = [
+            name if name.startswith(f"{base}-") else f"{base}-{name}"
+            for name in ("-".join(parts[:size]) for size in (1, 2) if len(parts) >= size)
+        ] or [f"{base}-part"]
+        for candidate in candidates:
+            if candidate not in used:
+                return candidate, title
+        suffix = 2
+        while f"{candidates[0]}-{suffix}" in used:
+            suffix += 1
+        return f"{candidates[0]}-{suffix}", title
+
+    def plan(
+        self,
+        k: int,
+        restarts: int = 10,
+        seed: int = 0,
+        warn_count: int = 25,
+        warn_unique_tags: int = 10,
+        adi_threshold: float = 5.0,
+    ) -> SplitPlan:
+        labels, cohesion = self.cluster(k, restarts, seed)
+        section_tags = Counter(tag for tags in self.tags for tag in tags)
+        used = set(self.taken_slugs)
+        clusters = [[index for index, label in enumerate(labels) if label == cluster] for cluster in range(k)]
+        clusters.sort(key=lambda members: (-len(members), members))
+        subsections = []
+        for members in clusters:
+            degree = 0
+            weighted = 0.0
+            for i in members:
+                row = self.weights[i]
+                degree += sum(1 for j in members if j != i and row[j] > 0)
+                weighted += sum(row[j] for j in members)
+            isolated = sum(self.isolated[index] for index in members)
+            unique_tags = len({tag for index in members for tag in self.tags[index]})
+            adi = _ratio(len(members), degree)
+            weighted_adi = _ratio(len(members), weighted)
+            warnings = []
+            if len(members) > warn_count:
+                warnings.append(f">entries({len(members)})")
+            if unique_tags > warn_unique_tags:
+                warnings.append(f">tags({unique_tags})")
+            if weighted_adi >= adi_threshold:
+                warnings.append(">ADIw")
+            dominant = self._dominant_tags(members, section_tags)
+            slug, title = self._name(dominant, used)
+            used.add(slug)
+            subsections.append(
+                Subsection(
+                    slug=slug,
+                    title=title,
+                    entries=tuple(self.slugs[index] for index in members),
+                    tags=tuple(dominant[:3]),
+                    unique_tags=unique_tags,
+                    adi=adi,
+                    weighted_adi=weighted_adi,
+                    isolated=isolated,
+                    warnings=tuple(warnings),
+                )
+            )
+        return SplitPlan(k=k, cohesion=cohesion, subsections=tuple(subsections))
+
+
+def recommend(plans: Sequence[SplitPlan]) -> SplitPlan:
+    """Fewest warnings, then the lowest worst-case ADIw, then the smallest k."""
+    return min(plans, key=lambda plan: (plan.warnings, plan.max_weighted_adi, plan.k))
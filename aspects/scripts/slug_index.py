@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Typo-tolerant slug/name lookup for ASPECTS.json entries.
+
+Slugs and names are indexed by character trigrams; each posting points at one
+string (``2 * entry + 0`` for the slug, ``+ 1`` for the name). A lookup gathers
+candidates from the postings of the query's trigrams, keeps the best overlaps and
+ranks only those by Levenshtein distance, so a handful of strings are compared
+even for very large files. The index is cached in ``.aspects-cache/`` per file fingerprint.
+"""
+
+from __future__ import annotations
+
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any
+
+from aspects_cache import cache_dir, cache_key, file_fingerprint, load_json_cache, store_json_cache
+
+INDEX_FILENAME = "slug-index.json"
+CANDIDATE_POOL = 20
+
+
+def trigrams(text: str) -> set[str]:
+    padded = f"  {text.lower()} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a: str, b: str) -> int:
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(
+                min(
+                    previous[j] + 1,
+                    current[j - 1] + 1,
+                    previous[j - 1] + (char_a != char_b),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class SlugIndex:
+    def __init__(self, items: list[list[str]], postings: dict[str, list[int]]) -> None:
+        self.items = items
+        self.postings = postings
+
+    @classmethod
+    def build(cls, data: dict[str, Any]) -> "SlugIndex":
+        items: list[list[str]] = []
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        for section in data.get("sections", []):
+            for entry in section.get("entries", []):
+                slug = entry.get("slug")
+                if not slug:
+                    continue
+                idx = len(items)
+                items.append([slug, entry.get("name", "")])
+                for gram in trigrams(slug):
+                    postings[gram].append(2 * idx)
+                for gram in trigrams(entry.get("name", "")):
+                    postings[gram].append(2 * idx + 1)
+        return cls(items, dict(postings))
+
+    @classmethod
+    def load(cls, aspects_path: Path, data: dict[str, Any] | None = None) -> "SlugIndex":
+        key = cache_key("slug-index", file_fingerprint(aspects_path))
+        cache_path = cache_dir(aspects_path) / INDEX_FILENAME
+        cached = load_json_cache(cache_path, key)
+        if cached is not None:
+            return cls(cached["items"], cached["postings"])
+        if data is None:
+            data = json.loads(aspects_path.read_text(encoding="utf-8"))
+        index = cls.build(data)
+        store_json_cache(cache_path, key, {"items": index.items, "postings": index.postings})
+        return index
+
+    def lookup(self, query: str, top_k: int = 5) -> list[tuple[str, str, int]]:
+        """Return up to ``top_k`` (slug, name, edit distance) tuples, closest first."""
+        overlap: Counter[int] = Counter()
+        for gram in trigrams(query):
+            overlap.update(self.postings.get(gram, ()))
+        lowered = query.lower()
+        best: dict[int, int] = {}
+        for posting, _ in overlap.most_common(max(CANDIDATE_POOL, 2 * top_k)):
+            idx, field = divmod(posting, 2)
+            distance = edit_distance(lowered, self.items[idx][field].lower())
+            if distance < best.get(idx, distance + 1):
+                best[idx] = distance
+        ranked = sorted((distance, *self.items[idx]) for idx, distance in best.items())
+        return [(slug, name, distance) for distance, slug, name in ranked[:top_k]]
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""Per-source check history recorded by ``hash_check.py``.
+
+Every hash_check run folds its observations into
+``.aspects-cache/source-history.json``: how often each cited path was checked,
+how often its on-disk sha256 differed from the previous observation (churn) and
+how often it failed verification (mismatch or missing). ``revalidation_queue.py``
+uses these counts to rank entries. Deleting the file only resets the statistics.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+from aspects_cache import cache_dir, cache_key, load_json_cache, store_json_cache
+
+HISTORY_FILENAME = "source-history.json"
+HISTORY_KEY = cache_key("source-history", 1)
+
+# path -> {"checks", "changes", "failures", "sha256", "lastChecked"}
+History = Dict[str, Dict[str, Any]]
+
+
+def history_path(aspects_path: Path) -> Path:
+    return cache_dir(aspects_path) / HISTORY_FILENAME
+
+
+def load_history(aspects_path: Path) -> History:
+    return load_json_cache(history_path(aspects_path), HISTORY_KEY) or {}
+
+
+def record_run(
+    aspects_path: Path,
+    observed: Mapping[str, Optional[str]],
+    failed: Iterable[str],
+    checked_at: Optional[str] = None,
+) -> History:
+    """Fold one run into the history: ``observed`` maps path -> on-disk sha256 (None if missing)."""
+    history = load_history(aspects_path)
+    checked_at = checked_at or dt.date.today().isoformat()
+    failed = set(failed)
+    for path, sha in observed.items():
+        record = history.setdefault(path, {"checks": 0, "changes": 0, "failures": 0, "sha256": None})
+        if record["checks"] and sha != record["sha256"]:
+            record["changes"] += 1
+        record["checks"] += 1
+        record["failures"] += path in failed
+        record["sha256"] = sha
+        record["lastChecked"] = checked_at
+    store_json_cache(history_path(aspects_path), HISTORY_KEY, history)
+    return history
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""Merkle manifest over the cited source files of a project.
+
+The sorted unique source paths form a directory tree: a leaf hashes the file's
+sha256 (or ``missing``), a directory hashes its children's names and hashes. Two
+trees are equal iff their roots are, and ``diff_trees`` only descends into
+subtrees whose hashes differ, so finding k changed files among n costs about
+O(k log n) node comparisons.
+
+``hash_check.py`` builds one tree from the hashes cited in ASPECTS.json and one
+from the files on disk; equal roots mean every citation is valid. The on-disk
+tree is saved as a small JSON manifest, which can be compared with the manifest
+of another machine or an earlier run.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from aspects_cache import write_atomic
+
+MANIFEST_FILENAME = "source-manifest.json"
+MANIFEST_FORMAT = 1
+
+Node = Dict[str, Any]
+Change = Tuple[str, Optional[str], Optional[str]]
+
+
+class _Leaf(dict):
+    """Marks finished leaves while the directory levels are still plain dicts."""
+
+
+def _leaf(sha256: Optional[str]) -> Node:
+    digest = hashlib.sha256(b"blob\0" + (sha256 or "missing").encode("ascii")).hexdigest()
+    return _Leaf(hash=digest, sha256=sha256)
+
+
+def _seal(children: Dict[str, Node]) -> Node:
+    digest = hashlib.sha256()
+    for name in sorted(children):
+        digest.update(f"{name}\0{children[name]['hash']}\n".encode("utf-8"))
+    return {"hash": digest.hexdigest(), "children": {name: children[name] for name in sorted(children)}}
+
+
+def build_tree(hashes: Mapping[str, Optional[str]]) -> Node:
+    """Return the Merkle tree of ``{posix path: sha256 or None}``."""
+    root: Dict[str, Any] = {}
+    for path, sha256 in hashes.items():
+        *parents, name = path.split("/")
+        node = root
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[name] = _leaf(sha256)
+
+    def seal(level: Dict[str, Any]) -> Node:
+        return _seal({name: child if isinstance(child, _Leaf) else seal(child) for name, child in level.items()})
+
+    return seal(root)
+
+
+def is_leaf(node: Node) -> bool:
+    return "children" not in node
+
+
+def subtree_roots(tree: Node, depth: int = 1) -> Dict[str, str]:
+    """Hashes of the subtrees ``depth`` levels below the root, by path."""
+    roots: Dict[str, str] = {}
+
+    def walk(node: Node, prefix: str, level: int) -> None:
+        for name, child in node.get("children", {}).items():
+            path = f"{prefix}{name}"
+            if level == depth or is_leaf(child):
+                roots[path] = child["hash"]
+            else:
+                walk(child, path + "/", level + 1)
+
+    walk(tree, "", 1)
+    return roots
+
+
+def _leaves(node: Node, prefix: str) -> List[Tuple[str, Optional[str]]]:
+    if is_leaf(node):
+        return [(prefix, node["sha256"])]
+    leaves: List[Tuple[str, Optional[str]]] = []
+    for name, child in node["children"].items():
+        leaves.extend(_leaves(child, f"{prefix}/{name}".lstrip("/")))
+    return leaves
+
+
+def leaves(tree: Node) -> Dict[str, Optional[str]]:
+    """Flatten a tree back to ``{path: sha256 or None}``."""
+    return dict(_leaves(tree, ""))
+
+
+def diff_trees(old: Optional[Node], new: Optional[Node], prefix: str = "") -> List[Change]:
+    """Return (path, old sha256, new sha256) for every leaf that differs; None means absent."""
+    if old is not None and new is not None and old["hash"] == new["hash"]:
+        return []
+    if old is None or new is None or is_leaf(old) or is_leaf(new):
+        before = dict(_leaves(old, prefix)) if old is not None else {}
+        after = dict(_leaves(new, prefix)) if new is not None else {}
+        return [
+            (path, before.get(path), after.get(path))
+            for path in sorted(before.keys() | after.keys())
+            if path not in before or path not in after or before[path] != after[path]
+        ]
+    changes: List[Change] = []
+    for name in sorted(old["children"].keys() | new["children"].keys()):
+        changes.extend(
+            diff_trees(old["children"].get(name), new["children"].get(name), f"{prefix}/{name}".lstrip("/"))
+        )
+    return changes
+
+
+def changed_directories(changes: List[Change]) -> List[str]:
+    """Distinct parent directories of the changed leaves ("." for the top level)."""
+    return sorted({path.rpartition("/")[0] or "." for path, _, _ in changes})
+
+
+def save_manifest(path: Path, tree: Node) -> None:
+    body = {"format": MANIFEST_FORMAT, "root": tree["hash"], "tree": tree}
+    write_atomic(path, json.dumps(body, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def load_manifest(path: Path) -> Node:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("format") != MANIFEST_FORMAT or "tree" not in data:
+        raise ValueError(f"{path} is not a source manifest (format {MANIFEST_FORMAT})")
+    return data["tree"]
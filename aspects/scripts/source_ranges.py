@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Line-range citations inside source files.
+
+A source may narrow its citation to a region of the file::
+
+    {"path": "...", "sha256": "<whole file>", "lines": [120, 180],
+     "linesSha256": "<sha256 of lines 120-180>", "linesRolling": "<hex>",
+     "anchor": "fn run_turn"}
+
+``lines`` is 1-based and inclusive; the region hash covers the raw bytes of those
+lines including their line endings. ``anchor`` is optional text expected in the
+first line of the region. When the whole-file hash no longer matches, the region
+is checked where it was; if it moved, windows of the same line count are tried
+nearest-first (anchor lines before the rest) until one hashes to
+``linesSha256``, so an edit elsewhere in the file does not stale the citation.
+
+``linesRolling`` (optional) is a polynomial hash over the CRC-32 of each cited
+line. Relocation hashes every line of the file once and rolls that value across
+the windows in O(1) each, so only windows that already match it are confirmed
+with sha256. Citations without it try sha256 on every window.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import zlib
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+RANGE_SPEC_RE = re.compile(r"^(?P<path>.+?):(?P<start>\d+)-(?P<end>\d+)$")
+ROLLING_BASE = 1_000_003
+ROLLING_MOD = (1 << 61) - 1
+
+
+def line_offsets(data: bytes) -> List[int]:
+    """Byte offset of every line start plus the end of the data."""
+    offsets = [0]
+    position = data.find(b"\n")
+    while position != -1:
+        offsets.append(position + 1)
+        position = data.find(b"\n", position + 1)
+    if offsets[-1] != len(data):
+        offsets.append(len(data))
+    return offsets
+
+
+def range_sha256(data: bytes, start: int, end: int, offsets: Optional[List[int]] = None) -> Optional[str]:
+    offsets = offsets if offsets is not None else line_offsets(data)
+    if not 1 <= start <= end <= len(offsets) - 1:
+        return None
+    return hashlib.sha256(data[offsets[start - 1] : offsets[end]]).hexdigest()
+
+
+def rolling_prefix(data: bytes, offsets: List[int]) -> List[int]:
+    """Prefix values P with P[i] the rolling hash of lines 1..i (CRC-32 per line)."""
+    prefix = [0]
+    value = 0
+    for start, end in zip(offsets, offsets[1:]):
+        value = (value * ROLLING_BASE + zlib.crc32(data[start:end]) + 1) % ROLLING_MOD
+        prefix.append(value)
+    return prefix
+
+
+def window_rolling(prefix: List[int], start: int, end: int, power: int) -> int:
+    """Rolling hash of lines start..end from ``rolling_prefix``; ``power`` is BASE ** line count."""
+    return (prefix[end] - prefix[start - 1] * power) % ROLLING_MOD
+
+
+def range_rolling(data: bytes, start: int, end: int, offsets: Optional[List[int]] = None) -> Optional[str]:
+    offsets = offsets if offsets is not None else line_offsets(data)
+    if not 1 <= start <= end <= len(offsets) - 1:
+        return None
+    prefix = rolling_prefix(data, offsets[start - 1 : end + 1])
+    return format(prefix[-1], "x")
+
+
+def line_anchor(data: bytes, line: int, limit: int = 80) -> Optional[str]:
+    """Stripped text of ``line`` (1-based) to store as ``anchor``; None when blank or not UTF-8."""
+    offsets = line_offsets(data)
+    if not 1 <= line <= len(offsets) - 1:
+        return None
+    try:
+        text = data[offsets[line - 1] : offsets[line]].decode("utf-8").strip()
+    except UnicodeDecodeError:
+        return None
+    return text[:limit] or None
+
+
+def make_range(data: bytes, start: int, end: int, anchor: Optional[str] = None) -> Dict[str, Any]:
+    """Return the ``lines``/``linesSha256`` (and ``anchor``) fields for a new citation."""
+    digest = range_sha256(data, start, end)
+    if digest is None:
+        raise ValueError(f"lines {start}-{end} are outside the file ({len(line_offsets(data)) - 1} lines)")
+    fields: Dict[str, Any] = {
+        "lines": [start, end],
+        "linesSha256": digest,
+        "linesRolling": range_rolling(data, start, end),
+    }
+    if anchor:
+        fields["anchor"] = anchor
+    return fields
+
+
+def parse_range_spec(raw: str) -> Tuple[str, Optional[Tuple[int, int]]]:
+    """Split ``path:START-END`` into the path and the line range (None for a whole file)."""
+    match = RANGE_SPEC_RE.match(raw)
+    if not match:
+        return raw, None
+    start, end = int(match["start"]), int(match["end"])
+    if not 1 <= start <= end:
+        raise ValueError(f"invalid line range {start}-{end}")
+    return match["path"], (start, end)
+
+
+def has_range(source: Dict[str, Any]) -> bool:
+    lines = source.get("lines")
+    return (
+        isinstance(lines, list)
+        and len(lines) == 2
+        and all(isinstance(value, int) for value in lines)
+        and isinstance(source.get("linesSha256"), str)
+    )
+
+
+def _candidate_starts(data: bytes, offsets: List[int], start: int, length: int, anchor: Optional[str]) -> Iterator[int]:
+    last = len(offsets) - 1 - length + 1
+    if last < 1:
+        return
+    seen = {start}
+    if anchor:
+        needle = anchor.encode("utf-8")
+        hits = []
+        position = data.find(needle)
+        while position != -1:
+            line = bisect_right(offsets, position)  # 1-based line containing position
+            hits.append(line)
+            position = data.find(needle, offsets[line])  # continue on the next line
+        for line in sorted(hits, key=lambda value: abs(value - start)):
+            if 1 <= line <= last and line not in seen:
+                seen.add(line)
+                yield line
+    for distance in range(1, max(start - 1, last - start) + 1):
+        for line in (start - distance, start + distance):
+            if 1 <= line <= last and line not in seen:
+                yield line
+
+
+def locate_range(data: bytes, source: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """Return the (start, end) lines whose bytes hash to ``linesSha256``, or None."""
+    start, end = source["lines"]
+    expected = source["linesSha256"]
+    length = end - start + 1
+    offsets = line_offsets(data)
+    if range_sha256(data, start, end, offsets) == expected:
+        return start, end
+    rolling: Optional[int] = None
+    if isinstance(source.get("linesRolling"), str):
+        try:
+            rolling = int(source["linesRolling"], 16)
+        except ValueError:
+            rolling = None
+    if rolling is not None:
+        prefix = rolling_prefix(data, offsets)
+        power = pow(ROLLING_BASE, length, ROLLING_MOD)
+    view = memoryview(data)
+    for candidate in _candidate_starts(data, offsets, start, length, source.get("anchor")):
+        if rolling is not None and window_rolling(prefix, candidate, candidate + length - 1, power) != rolling:
+            continue
+        window = view[offsets[candidate - 1] : offsets[candidate - 1 + length]]
+        if hashlib.sha256(window).hexdigest() == expected:
+            return candidate, candidate + length - 1
+    return None
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""Rank catalog tags for a draft aspect name and description.
+
+The model is a set of TF-IDF centroids, one per tag, built from the entries that
+already use the tag. Centroids are truncated to their strongest terms and stored
+as an inverted index (term -> [(tag, weight)]), so scoring a draft only touches
+the postings of its own terms. The model is cached in ``.aspects-cache/`` and
+rebuilt when ASPECTS.json or the tag catalog changes.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any
+
+from aspects_cache import cache_dir, cache_key, file_fingerprint, load_json_cache, store_json_cache
+
+TOKEN_RE = re.compile(r"[a-z0-9_]+")
+MODEL_FILENAME = "tag-model.json"
+CENTROID_TERMS = 64
+
+
+def tokenize(text: str) -> list[str]:
+    return [token for token in TOKEN_RE.findall(text.lower()) if len(token) > 1]
+
+
+def catalog_path_for(aspects_path: Path) -> Path:
+    return aspects_path.with_name("ASPECTS.tags.json")
+
+
+def load_catalog_tags(tags_path: Path) -> set[str] | None:
+    try:
+        data = json.loads(tags_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return {item["tag"] for item in data.get("tags", []) if isinstance(item, dict) and "tag" in item}
+
+
+class TagSuggester:
+    def __init__(self, idf: dict[str, float], postings: dict[str, list[list[Any]]], catalog: set[str] | None):
+        self.idf = idf
+        self.postings = postings
+        self.catalog = catalog
+
+    @classmethod
+    def build(cls, data: dict[str, Any], catalog: set[str] | None) -> "TagSuggester":
+        documents: list[tuple[Counter[str], list[str]]] = []
+        document_frequency: Counter[str] = Counter()
+        for section in data.get("sections", []):
+            for entry in section.get("entries", []):
+                terms = Counter(tokenize(f"{entry.get('name', '')}\n{entry.get('description', '')}"))
+                documents.append((terms, entry.get("tags", [])))
+                document_frequency.update(terms.keys())
+
+        total = len(documents)
+        idf = {term: math.log((1 + total) / (1 + df)) + 1.0 for term, df in document_frequency.items()}
+        sums: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        for terms, tags in documents:
+            vector = {term: (1.0 + math.log(count)) * idf[term] for term, count in terms.items()}
+            norm = math.sqrt(sum(value * value for value in vector.values())) or 1.0
+            for tag in tags:
+                if catalog is not None and tag not in catalog:
+                    continue
+                centroid = sums[tag]
+                for term, value in vector.items():
+                    centroid[term] += value / norm
+
+        postings: defaultdict[str, list[list[Any]]] = defaultdict(list)
+        for tag, centroid in sums.items():
+            top = centroid.most_common(CENTROID_TERMS)
+            norm = math.sqrt(sum(value * value for _, value in top)) or 1.0
+            for term, value in top:
+                postings[term].append([tag, round(value / norm, 6)])
+        return cls(idf, dict(postings), catalog)
+
+    @classmethod
+    def load(cls, aspects_path: Path, data: dict[str, Any] | None = None) -> "TagSuggester":
+        """Return the cached model for the current files, building it when stale."""
+        tags_path = catalog_path_for(aspects_path)
+        key = cache_key("tag-model", file_fingerprint(aspects_path), file_fingerprint(tags_path))
+        cache_path = cache_dir(aspects_path) / MODEL_FILENAME
+        cached = load_json_cache(cache_path, key)
+        catalog = load_catalog_tags(tags_path)
+        if cached is not None:
+            return cls(cached["idf"], cached["postings"], catalog)
+        if data is None:
+            data = json.loads(aspects_path.read_text(encoding="utf-8"))
+        model = cls.build(data, catalog)
+        store_json_cache(cache_path, key, {"idf": model.idf, "postings": model.postings})
+        return model
+
+    def suggest(self, text: str, top_k: int = 5, exclude: set[str] | None = None) -> list[tuple[str, float]]:
+        terms = Counter(tokenize(text))
+        query = {
+            term: (1.0 + math.log(count)) * self.idf[term]
+            for term, count in terms.items()
+            if term in self.idf
+        }
+        norm = math.sqrt(sum(value * value for value in query.values()))
+        if not norm:
+            return []
+        scores: defaultdict[str, float] = defaultdict(float)
+        for term, value in query.items():
+            for tag, weight in self.postings.get(term, ()):
+                scores[tag] += value / norm * weight
+        ranked = sorted(
+            ((tag, score) for tag, score in scores.items() if not exclude or tag not in exclude),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return ranked[:top_k]
+
+    def unknown_tags(self, tags: list[str]) -> list[str]:
+        if self.catalog is None:
+            return []
+        return [tag for tag in tags if tag not in self.catalog]
+
+
+def format_suggestions(suggestions: list[tuple[str, float]]) -> str:
+    return ", ".join(f"{tag} ({score:.2f})" for tag, score in suggestions)
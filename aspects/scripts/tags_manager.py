@@ -1,5 +1,12 @@
 #!/usr/bin/env python3
-"""Utilities for maintaining project tag catalogs (ASPECTS.tags.json)."""
+"""Utilities for maintaining project tag catalogs (ASPECTS.tags.json).
+
+``sync-all`` walks every project in one process. For each ASPECTS.json it computes
+tag reference counts and a sparse tag x tag co-occurrence matrix in the same pass,
+rewrites the catalog only when its serialized content changes, and stores the
+co-occurrence matrix in the project's ``.aspects-cache/``, where
+``adi.py --tag-pairs`` reads it.
+"""
 
 from __future__ import annotations
 
@@ -7,9 +14,15 @@ import argparse
 import json
 import sys
 from collections import Counter
+from itertools import combinations
 from pathlib import Path
 from typing import Any, Iterable
 
+from aspects_cache import cache_dir, cache_key, file_fingerprint, load_json_cache, store_json_cache
+
+COOCCURRENCE_FILENAME = "tag-cooccurrence.json"
+DEFAULT_PROJECTS_ROOT = Path(__file__).resolve().parent.parent / "projects"
+
 
 def load_json(path: Path) -> Any:
     return json.loads(path.read_text(encoding="utf-8"))
@@ -19,8 +32,7 @@ def dump_json(data: Any) -> str:
     return json.dumps(data, ensure_ascii=False, indent=2)
 
 
-def compute_reference_counts(aspects_path: Path) -> Counter[str]:
-    data = load_json(aspects_path)
+def count_tags(data: Any) -> Counter[str]:
     counter: Counter[str] = Counter()
     for section in data.get("sections", []):
         for entry in section.get("entries", []):
@@ -28,6 +40,56 @@ def compute_reference_counts(aspects_path: Path) -> Counter[str]:
     return counter
 
 
+def compute_reference_counts(aspects_path: Path) -> Counter[str]:
+    return count_tags(load_json(aspects_path))
+
+
+def compute_tag_statistics(data: Any) -> tuple[Counter[str], Counter[tuple[str, str]]]:
+    """Return tag reference counts and sparse pair co-occurrence counts in one pass."""
+    counter: Counter[str] = Counter()
+    pairs: Counter[tuple[str, str]] = Counter()
+    for section in data.get("sections", []):
+        for entry in section.get("entries", []):
+            tags = entry.get("tags", [])
+            counter.update(tags)
+            pairs.update(combinations(sorted(set(tags)), 2))
+    return counter, pairs
+
+
+def cooccurrence_cache(aspects_path: Path) -> tuple[Path, str]:
+    key = cache_key("tag-cooccurrence", file_fingerprint(aspects_path))
+    return cache_dir(aspects_path) / COOCCURRENCE_FILENAME, key
+
+
+def store_cooccurrence(
+    aspects_path: Path,
+    counts: Counter[str],
+    pairs: Counter[tuple[str, str]],
+) -> None:
+    """Cache the co-occurrence matrix (tag table + [i, j, count] triples)."""
+    tags = sorted(counts)
+    ids = {tag: idx for idx, tag in enumerate(tags)}
+    payload = {
+        "tags": tags,
+        "counts": [counts[tag] for tag in tags],
+        "pairs": sorted([ids[a], ids[b], count] for (a, b), count in pairs.items()),
+    }
+    path, key = cooccurrence_cache(aspects_path)
+    store_json_cache(path, key, payload)
+
+
+def load_cooccurrence(aspects_path: Path) -> tuple[Counter[str], Counter[tuple[str, str]]] | None:
+    """Return the cached matrix for the current ASPECTS.json content, or None when stale."""
+    path, key = cooccurrence_cache(aspects_path)
+    payload = load_json_cache(path, key)
+    if payload is None:
+        return None
+    tags = payload["tags"]
+    counts = Counter(dict(zip(tags, payload["counts"])))
+    pairs = Counter({(tags[a], tags[b]): count for a, b, count in payload["pairs"]})
+    return counts, pairs
+
+
 def ensure_sorted(tags_payload: dict[str, Any]) -> None:
     tags_payload["tags"] = sorted(
         tags_payload.get("tags", []), key=lambda item: item.get("tag", "")
@@ -40,8 +102,21 @@ def sync_counts(
     dry_run: bool,
     quiet: bool,
 ) -> int:
-    counts = compute_reference_counts(aspects_path)
-    tags_payload = load_json(tags_path)
+    counts, pairs = compute_tag_statistics(load_json(aspects_path))
+    if not dry_run:
+        store_cooccurrence(aspects_path, counts, pairs)
+    return sync_catalog(tags_path, aspects_path, counts, dry_run=dry_run, quiet=quiet)
+
+
+def sync_catalog(
+    tags_path: Path,
+    aspects_path: Path,
+    counts: Counter[str],
+    dry_run: bool,
+    quiet: bool,
+) -> int:
+    original = tags_path.read_text(encoding="utf-8")
+    tags_payload = json.loads(original)
     ensure_sorted(tags_payload)
 
     catalog_tags = {entry.get("tag") for entry in tags_payload.get("tags", [])}
@@ -58,10 +133,12 @@ def sync_counts(
             entry["number_of_references"] = value
             updated += 1
 
-    if updated and not dry_run:
-        tags_path.write_text(dump_json(tags_payload), encoding="utf-8")
-    elif updated and dry_run:
-        sys.stdout.write(dump_json(tags_payload))
+    rendered = dump_json(tags_payload)
+    changed = rendered != original.rstrip("\n")
+    if changed and not dry_run:
+        tags_path.write_text(rendered, encoding="utf-8")
+    elif changed and dry_run:
+        sys.stdout.write(rendered)
         sys.stdout.write("\n")
 
     if not quiet:
@@ -85,6 +162,29 @@ def sync_counts(
     return updated
 
 
+def sync_all(projects_root: Path, dry_run: bool, quiet: bool) -> int:
+    """Sync every project catalog under ``projects_root``; returns updated tag entries."""
+    total_updated = 0
+    projects = 0
+    for project_dir in sorted(path for path in projects_root.iterdir() if path.is_dir()):
+        aspects_path = project_dir / "ASPECTS.json"
+        tags_path = project_dir / "ASPECTS.tags.json"
+        if not aspects_path.exists():
+            continue
+        if not tags_path.exists():
+            if not quiet:
+                print(f"Skipping {project_dir.name}: no ASPECTS.tags.json", file=sys.stderr)
+            continue
+        counts, pairs = compute_tag_statistics(load_json(aspects_path))
+        if not dry_run:
+            store_cooccurrence(aspects_path, counts, pairs)
+        total_updated += sync_catalog(tags_path, aspects_path, counts, dry_run=dry_run, quiet=quiet)
+        projects += 1
+    if not quiet:
+        print(f"Synced {projects} projects, {total_updated} tag entries updated.")
+    return total_updated
+
+
 def print_counts(counter: Counter[str], as_json: bool, limit: int | None) -> None:
     items: Iterable[tuple[str, int]] = sorted(counter.items())
     if limit is not None:
@@ -146,6 +246,27 @@ def build_parser() -> argparse.ArgumentParser:
         help="Suppress informational output.",
     )
 
+    sync_all_parser = subparsers.add_parser(
+        "sync-all",
+        help="Sync number_of_references and tag co-occurrence for every project in one pass.",
+    )
+    sync_all_parser.add_argument(
+        "--projects-root",
+        type=Path,
+        default=DEFAULT_PROJECTS_ROOT,
+        help="Directory containing <project>/ASPECTS.json (default: aspects/projects).",
+    )
+    sync_all_parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print updated payloads instead of writing to disk.",
+    )
+    sync_all_parser.add_argument(
+        "--quiet",
+        action="store_true",
+        help="Suppress informational output.",
+    )
+
     return parser
 
 
@@ -193,6 +314,12 @@ def main(argv: list[str] | None = None) -> int:
         )
         return 0
 
+    if args.command == "sync-all":
+        if not args.projects_root.is_dir():
+            parser.error(f"Projects root not found: {args.projects_root}")
+        sync_all(args.projects_root, dry_run=args.dry_run, quiet=args.quiet)
+        return 0
+
     parser.error(f"Unhandled command: {args.command}")
     return 1
 